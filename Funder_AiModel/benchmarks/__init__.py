@@ -0,0 +1 @@
+"""Microbenchmarks for the Funder_AiModel package; run as `python -m benchmarks.<name>` from Funder_AiModel/."""
@@ -0,0 +1,109 @@
+"""
+AuditLogger benchmark: the previous pd.concat-per-entry logger versus the
+chunked columnar buffers, for per-call log(), batched log_many(), and
+log() with full chunks spilled to disk. The legacy logger is O(N^2), so it
+only runs for --legacy-entries entries; its per-entry cost keeps growing
+with N.
+
+Usage (from Funder_AiModel/):
+    python -m benchmarks.bench_audit_log --entries 1000000 --legacy-entries 10000
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.audit import AUDIT_COLUMNS, AuditLogger
+
+
+class LegacyAuditLogger:
+    """The pre-columnar AuditLogger, kept here only as the benchmark baseline."""
+
+    def __init__(self):
+        self.df = pd.DataFrame(columns=list(AUDIT_COLUMNS))
+
+    def log(self, user_id, decision_type, severity, trigger_reason,
+            model_confidence_score=None, affected_transaction_id=None,
+            affected_amount=None, affected_category=None, data_validation_status=None,
+            model_used=None):
+        audit_id = f"audit_{len(self.df):08d}_{int(time.time())}"
+        new_row = pd.DataFrame([{
+            'audit_id': audit_id,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'user_id': user_id,
+            'decision_type': decision_type,
+            'severity': severity,
+            'trigger_reason': trigger_reason,
+            'model_confidence_score': model_confidence_score,
+            'affected_transaction_id': affected_transaction_id,
+            'affected_amount': affected_amount,
+            'affected_category': affected_category,
+            'data_validation_status': data_validation_status,
+            'model_used': model_used,
+            'admin_action_taken': 'pending',
+            'resolution_notes': '',
+            'resolved': False
+        }])
+        self.df = pd.concat([self.df, new_row], ignore_index=True)
+        return audit_id
+
+
+def log_each(logger, n):
+    for i in range(n):
+        logger.log(i % 5000, 'fraud_alert', 'HIGH', 'Anomaly detected (score: 0.91)', 0.91,
+                   f'txn_{i}', 42.5, 'Shopping', 'SUFFICIENT_DATA', 'fraud_detector')
+
+
+def log_batches(logger, n, batch):
+    for start in range(0, n, batch):
+        size = min(batch, n - start)
+        ids = np.arange(start, start + size)
+        scores = np.full(size, 0.91)
+        logger.log_many(ids % 5000, 'fraud_alert', np.where(scores > 0.8, 'HIGH', 'MEDIUM'),
+                        'Anomaly detected', scores, ids, 42.5, 'Shopping', 'SUFFICIENT_DATA', 'fraud_detector')
+
+
+def timed(fn, logger):
+    start = time.perf_counter()
+    fn()
+    logged = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = len(logger.df)
+    return logged, time.perf_counter() - start, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--legacy-entries', type=int, default=10_000)
+    parser.add_argument('--batch', type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'logger':<26} {'entries':>9} {'log s':>8} {'us/entry':>9} {'.df s':>7}")
+
+    def report(label, n, result):
+        logged, view, rows = result
+        assert rows == n
+        print(f"{label:<26} {n:>9} {logged:>8.2f} {logged / n * 1e6:>9.2f} {view:>7.2f}")
+
+    for n in (args.legacy_entries // 4, args.legacy_entries):
+        legacy = LegacyAuditLogger()
+        report('legacy log()', n, timed(lambda: log_each(legacy, n), legacy))
+
+    columnar = AuditLogger()
+    report('columnar log()', args.entries, timed(lambda: log_each(columnar, args.entries), columnar))
+
+    batched = AuditLogger()
+    report(f'columnar log_many({args.batch})', args.entries,
+           timed(lambda: log_batches(batched, args.entries, args.batch), batched))
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        spilled = AuditLogger(spill_dir=spill_dir)
+        report('columnar log() + spill', args.entries, timed(lambda: log_each(spilled, args.entries), spilled))
+
+
+if __name__ == '__main__':
+    main()
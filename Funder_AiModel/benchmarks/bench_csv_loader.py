@@ -0,0 +1,86 @@
+"""
+Dataset loading benchmark: pd.read_csv + translate() (the previous
+FinanceAIEngine.load_data) versus load_transactions(), at once and in
+chunks, on final_train_dataset.csv repeated 10x and 100x.
+
+Each load runs in a fresh process so peak RSS is its own; peak is reported
+above the process's footprint after imports, next to the size of the
+resulting frame.
+
+Usage (from Funder_AiModel/):
+    python -m benchmarks.bench_csv_loader --scales 10 100 --chunk-rows 100000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+SOURCE = 'final_train_dataset.csv'
+
+
+def make_csv(path, scale):
+    with open(SOURCE) as src:
+        header = src.readline()
+        body = src.read()
+    if not body.endswith('\n'):
+        body += '\n'
+    with open(path, 'w') as out:
+        out.write(header)
+        for _ in range(scale):
+            out.write(body)
+
+
+def peak_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, path, chunk_rows, results):
+    import pandas as pd
+    from src.config import AppConfig
+    from src.preprocessing import load_transactions, translate
+
+    cfg = AppConfig()
+    before = peak_mb()
+    start = time.perf_counter()
+    if mode == 'read_csv + translate':
+        df = translate(pd.read_csv(path), cfg)
+    elif mode == 'load_transactions':
+        df = load_transactions(path, cfg)
+    else:
+        df = load_transactions(path, cfg, chunksize=chunk_rows)
+    elapsed = time.perf_counter() - start
+    results.put((elapsed, peak_mb() - before, df.memory_usage(deep=True).sum() / 2 ** 20, len(df)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    modes = ('read_csv + translate', 'load_transactions', f'chunked ({args.chunk_rows})')
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path = os.path.join(tmp, f'train_x{scale}.csv')
+            make_csv(path, scale)
+            print(f"{SOURCE} x{scale}: {os.path.getsize(path) / 2 ** 20:.1f} MB on disk")
+            print(f"  {'loader':<26} {'rows':>9} {'load s':>8} {'peak MB':>9} {'frame MB':>9}")
+            baseline = None
+            for mode in modes:
+                results = context.Queue()
+                process = context.Process(target=run, args=(mode, path, args.chunk_rows, results))
+                process.start()
+                elapsed, peak, frame, rows = results.get()
+                process.join()
+                baseline = baseline or (elapsed, peak)
+                print(f"  {mode:<26} {rows:>9} {elapsed:>8.2f} {peak:>9.1f} {frame:>9.1f}"
+                      f"   ({baseline[0] / elapsed:.1f}x faster, {baseline[1] / max(peak, 0.1):.1f}x less peak)")
+            print()
+
+
+if __name__ == '__main__':
+    main()
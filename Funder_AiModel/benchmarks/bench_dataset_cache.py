@@ -0,0 +1,69 @@
+"""
+Dataset cache benchmark: loading final_train_dataset.csv (repeated --scales
+times) through load_transactions() on every run, versus the DatasetCache
+cold (hash, parse, write the entry) and warm (hash, read the entry). The
+warm load's content hash is shown separately.
+
+Entries are Parquet read through a memory-mapped Arrow file when pyarrow is
+installed, pickle otherwise; the format used is printed.
+
+Usage (from Funder_AiModel/):
+    python -m benchmarks.bench_dataset_cache --scales 1 10 100 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_csv_loader import make_csv
+from src.config import AppConfig
+from src.dataset_cache import HAS_PYARROW, DatasetCache, file_digest
+from src.preprocessing import load_transactions
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"cache format: {'parquet (memory-mapped)' if HAS_PYARROW else 'pickle (pyarrow not installed)'}")
+    print(f"{'dataset':<10} {'rows':>8} {'csv load s':>11} {'cold s':>8} {'warm s':>8} {'hash s':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path = os.path.join(tmp, f'train_x{scale}.csv')
+            make_csv(path, scale)
+            cfg = AppConfig(dataset_cache_dir=os.path.join(tmp, f'cache_x{scale}'))
+
+            csv_s, expected = best_of(lambda: load_transactions(path, cfg), args.repeat)
+
+            def cold():
+                cache = DatasetCache(cfg.dataset_cache_dir)
+                for entry in cache.cache_dir.glob('*'):
+                    entry.unlink()
+                return cache.load(path, cfg)
+
+            cold_s, _ = best_of(cold, args.repeat)
+            cache = DatasetCache(cfg.dataset_cache_dir)
+            warm_s, warm = best_of(lambda: cache.load(path, cfg), args.repeat)
+            hash_s, _ = best_of(lambda: file_digest(path), args.repeat)
+            pd.testing.assert_frame_equal(warm, expected)
+            assert cache.hits == args.repeat
+
+            print(f"{f'x{scale}':<10} {len(expected):>8} {csv_s:>11.3f} {cold_s:>8.3f} {warm_s:>8.3f} "
+                  f"{hash_s:>8.3f} {csv_s / warm_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+FastCache microbenchmark at 2048 entries: the previous dict + min(timestamps)
+implementation versus the OrderedDict LRU, for inserts into a full cache, hits,
+and key generation for numpy/pandas arguments.
+
+Usage (from Funder_AiModel/):
+    python -m benchmarks.bench_fast_cache --entries 2048 --ops 20000
+"""
+import argparse
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.performance import FastCache
+
+
+class LegacyFastCache:
+    """The pre-OrderedDict FastCache, kept here only as the benchmark baseline."""
+
+    def __init__(self, max_size=1024, ttl_seconds=3600):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.cache = {}
+        self.timestamps = {}
+
+    def _key(self, func_name, *args, **kwargs):
+        key_data = f"{func_name}_{str(args)}_{str(sorted(kwargs.items()))}"
+        return hashlib.md5(key_data.encode()).hexdigest()
+
+    def get(self, key):
+        if key not in self.cache:
+            return None
+        if time.time() - self.timestamps.get(key, 0) > self.ttl:
+            del self.cache[key]
+            del self.timestamps[key]
+            return None
+        return self.cache[key]
+
+    def set(self, key, value):
+        if len(self.cache) >= self.max_size:
+            oldest = min(self.timestamps, key=self.timestamps.get)
+            del self.cache[oldest]
+            del self.timestamps[oldest]
+        self.cache[key] = value
+        self.timestamps[key] = time.time()
+
+
+def per_op_us(fn, ops):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def bench(cache, entries, ops):
+    keys = [f"key-{i}" for i in range(entries + ops)]
+    for key in keys[:entries]:
+        cache.set(key, 1)
+
+    def churn():
+        for key in keys[entries:]:
+            cache.set(key, 1)
+
+    def hits():
+        live = keys[-entries:]
+        for i in range(ops):
+            cache.get(live[i % entries])
+
+    return per_op_us(churn, ops), per_op_us(hits, ops)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=2048)
+    parser.add_argument('--ops', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'cache':<10} {'set (full) us':>14} {'get (hit) us':>13}")
+    for name, cache in (('legacy', LegacyFastCache(args.entries)), ('lru', FastCache(args.entries))):
+        set_us, get_us = bench(cache, args.entries, args.ops)
+        print(f"{name:<10} {set_us:>14.3f} {get_us:>13.3f}")
+
+    features = np.random.default_rng(0).normal(size=(2048, 19))
+    altered = features.copy()
+    altered[1024, 7] += 1.0
+    frame = pd.DataFrame(features)
+    legacy, lru = LegacyFastCache(), FastCache()
+
+    print()
+    print(f"{'key for':<22} {'legacy us':>10} {'lru us':>10} {'legacy collides':>16} {'lru collides':>13}")
+    for label, a, b in (('ndarray (2048, 19)', features, altered),
+                        ('DataFrame (2048, 19)', frame, pd.DataFrame(altered))):
+        legacy_us = per_op_us(lambda: [legacy._key('predict', a) for _ in range(200)], 200)
+        lru_us = per_op_us(lambda: [lru._key('predict', a) for _ in range(200)], 200)
+        print(f"{label:<22} {legacy_us:>10.1f} {lru_us:>10.1f} "
+              f"{str(legacy._key('predict', a) == legacy._key('predict', b)):>16} "
+              f"{str(lru._key('predict', a) == lru._key('predict', b)):>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+UserIndex benchmark: per-user lookups that scan the whole frame with
+data[data['user_id'] == user_id], versus the index built once at load time.
+
+For each --rows size, builds a synthetic translated frame (--users users,
+dates over the last year, signed transaction_amount) and times:
+  - building the UserIndex (sort by user and date, per-user and monthly sums)
+  - validate_user_data and predict_feasibility for --lookups users
+  - spending_exceeds_income_alert for the current month
+
+The legacy alert masks the month's rows once per user (O(U*N)), so it only
+runs for sizes up to --legacy-alert-rows; the groupby scan path is shown for
+every size.
+
+Usage (from Funder_AiModel/):
+    python -m benchmarks.bench_user_index --rows 10000 1000000 10000000 --users 10000
+"""
+import argparse
+import contextlib
+import io
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.audit import AuditLogger
+from src.config import AppConfig
+from src.feedback import FeedbackLog
+from src.intelligence import spending_exceeds_income_alert
+from src.models import GoalTrackingModel
+from src.user_index import UserIndex
+from src.validation import validate_user_data
+
+
+def legacy_alert(df, audit, cfg):
+    """The per-user loop of spending_exceeds_income_alert, kept here only as the baseline."""
+    now = datetime.now()
+    start = datetime(now.year, now.month, 1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    dates = df['_date_parsed']
+    df = df[(dates >= start) & (dates < next_month)]
+    amt_col = 'transaction_amount'
+    alert_count = 0
+    for uid in df['user_id'].unique().tolist():
+        sub = df[df['user_id'] == uid]
+        amounts = sub[amt_col].dropna()
+        total_income = float(amounts[amounts > 0].sum())
+        total_expenses = float(abs(amounts[amounts < 0].sum()))
+        if total_expenses > total_income and (total_income + total_expenses) > 0:
+            audit.log(
+                uid, 'budget_risk', 'HIGH',
+                f"Total spending has exceeded total income for this month | income=${total_income:.2f}, expenses=${total_expenses:.2f}",
+                None, None, None, None, 'SUFFICIENT_DATA', 'spending_vs_income_alert'
+            )
+            alert_count += 1
+    return alert_count
+
+
+def make_frame(rows, users, seed=0):
+    """A translated-like frame: user_id, _date_parsed over the last 365 days, signed amounts."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    offsets = rng.integers(0, 365 * 24 * 60, rows).astype('timedelta64[m]')
+    amounts = rng.gamma(2.0, 40.0, rows) * np.where(rng.random(rows) < 0.55, -1, 1)
+    return pd.DataFrame({
+        'transaction_id': np.arange(rows, dtype=np.int32),
+        'user_id': rng.integers(0, users, rows).astype(np.int32),
+        'transaction_amount': amounts.astype(np.float32),
+        '_date_parsed': today.to_datetime64() - offsets + np.timedelta64(1, 'D'),
+    })
+
+
+def seconds(fn):
+    start = time.perf_counter()
+    # predict_feasibility prints a Timer line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--lookups', type=int, default=200)
+    parser.add_argument('--legacy-alert-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    cfg = AppConfig()
+
+    print(f"{'rows':>10} {'step':<26} {'scan s':>9} {'index s':>9} {'speedup':>8}")
+    for rows in args.rows:
+        data = make_frame(rows, args.users)
+        build_s, index = seconds(lambda: UserIndex(data, cfg))
+        print(f"{rows:>10} {'build index':<26} {'':>9} {build_s:>9.3f}")
+        frame = index.frame
+        users = np.random.default_rng(1).choice(data['user_id'].unique(), args.lookups).tolist()
+        model = GoalTrackingModel(cfg, AuditLogger(), FeedbackLog())
+
+        scan_s, scanned = seconds(lambda: [validate_user_data(frame, u, cfg) for u in users])
+        index_s, indexed = seconds(lambda: [validate_user_data(frame, u, cfg, index=index) for u in users])
+        assert scanned == indexed
+        print(f"{rows:>10} {f'validate x{args.lookups}':<26} {scan_s:>9.3f} {index_s:>9.3f} {scan_s / index_s:>7.1f}x")
+
+        scan_s, scanned = seconds(lambda: [model.predict_feasibility(u, frame, 5000, 12) for u in users])
+        index_s, indexed = seconds(lambda: [model.predict_feasibility(u, frame, 5000, 12, index=index)
+                                            for u in users])
+        assert [r['status'] for r in scanned] == [r['status'] for r in indexed]
+        print(f"{rows:>10} {f'feasibility x{args.lookups}':<26} {scan_s:>9.3f} {index_s:>9.3f} {scan_s / index_s:>7.1f}x")
+
+        index_s, alerts = seconds(lambda: spending_exceeds_income_alert(frame, AuditLogger(), cfg, index=index))
+        scan_s, scanned = seconds(lambda: spending_exceeds_income_alert(frame, AuditLogger(), cfg))
+        assert scanned == alerts
+        print(f"{rows:>10} {'alert (groupby scan)':<26} {scan_s:>9.3f} {index_s:>9.3f} {scan_s / index_s:>7.1f}x")
+        if rows <= args.legacy_alert_rows:
+            legacy_s, legacy = seconds(lambda: legacy_alert(frame, AuditLogger(), cfg))
+            assert legacy == alerts
+            print(f"{rows:>10} {'alert (legacy per-user)':<26} {legacy_s:>9.3f} {index_s:>9.3f} "
+                  f"{legacy_s / index_s:>7.1f}x")
+        print(f"{'':>10} {alerts} alerts, {len(index)} users")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,68 @@
-import pandas as pd
 from datetime import datetime, timezone
+from typing import List, Optional
 import time
 
+from .columnar import ColumnarLog, batch_size
+
+AUDIT_COLUMNS = (
+    'audit_id','timestamp','user_id','decision_type','severity','trigger_reason',
+    'model_confidence_score','affected_transaction_id','affected_amount','affected_category',
+    'data_validation_status','model_used','admin_action_taken','resolution_notes','resolved'
+)
+
+
 class AuditLogger:
-    def __init__(self):
-        self.df = pd.DataFrame(columns=[
-            'audit_id','timestamp','user_id','decision_type','severity','trigger_reason',
-            'model_confidence_score','affected_transaction_id','affected_amount','affected_category',
-            'data_validation_status','model_used','admin_action_taken','resolution_notes','resolved'
-        ])
+    """
+    Audit trail of model decisions, kept in chunked columnar buffers.
+
+    log() and log_many() append in O(1) amortized time per entry; `df` is a
+    lazy DataFrame view of every retained entry. Pass spill_dir to write
+    full chunks to disk, keeping at most max_files of them.
+    """
+    def __init__(self, chunk_rows: int = 65536, spill_dir: Optional[str] = None, max_files: Optional[int] = None):
+        self._log = ColumnarLog(AUDIT_COLUMNS, chunk_rows, spill_dir, max_files, prefix='audit')
+
+    @property
+    def df(self):
+        return self._log.df
+
+    def __len__(self):
+        return len(self._log)
 
     def log(self, user_id, decision_type, severity, trigger_reason,
             model_confidence_score=None, affected_transaction_id=None,
             affected_amount=None, affected_category=None, data_validation_status=None,
             model_used=None):
-        audit_id = f"audit_{len(self.df):08d}_{int(time.time())}"
-        new_row = pd.DataFrame([{
-            'audit_id': audit_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+        audit_id = f"audit_{self._log.appended:08d}_{int(time.time())}"
+        self._log.append((
+            audit_id,
+            datetime.now(timezone.utc).isoformat(),
+            user_id,
+            decision_type,
+            severity,
+            trigger_reason,
+            model_confidence_score,
+            affected_transaction_id,
+            affected_amount,
+            affected_category,
+            data_validation_status,
+            model_used,
+            'pending',
+            '',
+            False,
+        ))
+        return audit_id
+
+    def log_many(self, user_id, decision_type, severity, trigger_reason,
+                 model_confidence_score=None, affected_transaction_id=None,
+                 affected_amount=None, affected_category=None, data_validation_status=None,
+                 model_used=None) -> List[str]:
+        """
+        Log a batch of decisions in one call. Each argument is either a
+        sequence (list, array, Series) with one value per entry or a scalar
+        shared by all of them. Returns the new audit ids in order.
+        """
+        columns = {
             'user_id': user_id,
             'decision_type': decision_type,
             'severity': severity,
@@ -28,9 +73,20 @@ class AuditLogger:
             'affected_category': affected_category,
             'data_validation_status': data_validation_status,
             'model_used': model_used,
+        }
+        n = batch_size(columns)
+        start, stamp = self._log.appended, int(time.time())
+        audit_ids = [f"audit_{i:08d}_{stamp}" for i in range(start, start + n)]
+        columns.update({
+            'audit_id': audit_ids,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'admin_action_taken': 'pending',
             'resolution_notes': '',
-            'resolved': False
-        }])
-        self.df = pd.concat([self.df, new_row], ignore_index=True)
-        return audit_id
+            'resolved': False,
+        })
+        self._log.extend(columns, n)
+        return audit_ids
+
+    def flush(self):
+        """Seal buffered entries into a chunk (written to spill_dir if set)."""
+        self._log.flush()
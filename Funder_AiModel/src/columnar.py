@@ -0,0 +1,176 @@
+"""
+Append-optimized columnar storage for the audit and feedback logs.
+
+Rows are appended to per-column lists, which is O(1) amortized, and sealed
+into DataFrame segments every `chunk_rows` rows. The `df` view concatenates
+the segments lazily and is cached until the next append. With `spill_dir`
+set, sealed segments are written to disk instead of kept in memory (Parquet
+when pyarrow is installed, pickle otherwise), and the oldest files beyond
+`max_files` are rotated out. With `keep_segments` as well, segments stay in
+memory and the directory is a persistent copy. Either way, segment files
+already in `spill_dir` are reopened, so a log survives process restarts up
+to its last sealed chunk.
+"""
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def _values(value, n: int) -> list:
+    """value as a list of n entries; scalars are repeated."""
+    if np.ndim(value) == 0:
+        return [value] * n
+    values = value.tolist() if hasattr(value, 'tolist') else list(value)
+    if len(values) != n:
+        raise ValueError(f"Expected {n} values, got {len(values)}")
+    return values
+
+
+def batch_size(columns: Dict[str, Any]) -> int:
+    """Rows in a batch of columns: the length of its sequences, 1 if all are scalars."""
+    lengths = {len(value) for value in columns.values() if np.ndim(value) != 0}
+    if len(lengths) > 1:
+        raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+    return lengths.pop() if lengths else 1
+
+
+class ColumnarLog:
+    """Chunked column buffers with a lazy DataFrame view and optional spill to disk."""
+
+    def __init__(self, columns: Sequence[str], chunk_rows: int = 65536,
+                 spill_dir: Optional[str] = None, max_files: Optional[int] = None, prefix: str = 'log',
+                 keep_segments: bool = False):
+        self.columns = tuple(columns)
+        self.chunk_rows = chunk_rows
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_files = max_files
+        self.prefix = prefix
+        self.keep_segments = keep_segments or self.spill_dir is None
+
+        self.appended = 0   # rows ever appended; never decreases, so usable for ids
+        self.rotated = 0    # rows dropped with rotated-out files
+        self._segments = []
+        self._files = deque()  # (path, rows)
+        self._file_seq = 0
+        self._view = None
+        self._reset_buffer()
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._reopen()
+
+    def _reopen(self) -> None:
+        """Register segment files left in spill_dir by an earlier process."""
+        found = sorted(
+            path for path in self.spill_dir.glob(f"{self.prefix}-*")
+            if path.suffix in ('.parquet', '.pkl') and path.stem[len(self.prefix) + 1:].isdigit()
+        )
+        for path in found:
+            frame = self._read(path)
+            self._files.append((path, len(frame)))
+            self.appended += len(frame)
+            if self.keep_segments:
+                self._segments.append(frame)
+            self._file_seq = max(self._file_seq, int(path.stem[len(self.prefix) + 1:]))
+
+    def _reset_buffer(self) -> None:
+        self._buffer = [[] for _ in self.columns]
+        self._buffered = 0
+
+    def __len__(self) -> int:
+        return self.appended - self.rotated
+
+    def append(self, values: Sequence) -> None:
+        """Append one row given in column order."""
+        for column, value in zip(self._buffer, values):
+            column.append(value)
+        self._buffered += 1
+        self.appended += 1
+        self._view = None
+        if self._buffered >= self.chunk_rows:
+            self._seal()
+
+    def extend(self, columns: Dict[str, Any], n: int) -> None:
+        """Append n rows given as {column: scalar or sequence of n values}; missing columns are None."""
+        if n >= self.chunk_rows:
+            # Large batches become a segment of their own
+            self._seal()
+            frame = pd.DataFrame({
+                name: _values(columns.get(name), n) for name in self.columns
+            }, columns=list(self.columns))
+            self._store(frame)
+        else:
+            for name, column in zip(self.columns, self._buffer):
+                column.extend(_values(columns.get(name), n))
+            self._buffered += n
+        self.appended += n
+        self._view = None
+        if self._buffered >= self.chunk_rows:
+            self._seal()
+
+    def _buffer_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(dict(zip(self.columns, self._buffer)), columns=list(self.columns))
+
+    def _seal(self) -> None:
+        if self._buffered:
+            frame = self._buffer_frame()
+            self._reset_buffer()
+            self._store(frame)
+
+    def _store(self, frame: pd.DataFrame) -> None:
+        if self.keep_segments:
+            self._segments.append(frame)
+        if self.spill_dir is None:
+            return
+        self._file_seq += 1
+        path = self.spill_dir / f"{self.prefix}-{self._file_seq:06d}"
+        if HAS_PYARROW:
+            try:
+                path = path.with_suffix('.parquet')
+                frame.to_parquet(path, index=False)
+            except Exception:
+                # Object columns mixing types (e.g. int and str ids) that Arrow can't encode
+                path = path.with_suffix('.pkl')
+                frame.to_pickle(path)
+        else:
+            path = path.with_suffix('.pkl')
+            frame.to_pickle(path)
+        self._files.append((path, len(frame)))
+        while self.max_files and len(self._files) > self.max_files:
+            oldest, rows = self._files.popleft()
+            os.remove(oldest)
+            self.rotated += rows
+            if self.keep_segments:
+                self._segments.pop(0)
+
+    @staticmethod
+    def _read(path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_pickle(path)
+
+    def flush(self) -> None:
+        """Seal buffered rows into a segment (written to disk when spilling)."""
+        self._seal()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """All retained rows as one DataFrame, rebuilt only after appends."""
+        if self._view is None:
+            parts = list(self._segments) if self.keep_segments else [self._read(path) for path, _ in self._files]
+            if self._buffered:
+                parts.append(self._buffer_frame())
+            if not parts:
+                self._view = pd.DataFrame(columns=list(self.columns))
+            elif len(parts) == 1:
+                self._view = parts[0]
+            else:
+                self._view = pd.concat(parts, ignore_index=True)
+        return self._view
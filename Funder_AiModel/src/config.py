@@ -13,3 +13,12 @@ class AppConfig:
     
     numeric_amount_columns: List[str] = ("amount", "transaction_amount", "value", "amt")
     possible_date_columns: List[str] = ("transaction_date", "date", "timestamp", "created_at")
+
+    # Day-first, as in the transaction datasets (e.g. 21/10/2024 18:00)
+    transaction_date_format: Optional[str] = "%d/%m/%Y %H:%M"
+    # Redundant columns translate() keeps; user_id backs the per-user index (src/user_index.py)
+    keep_columns: List[str] = ("user_id",)
+    # Read datasets in chunks of this many rows (files larger than memory); None reads at once
+    load_chunk_rows: Optional[int] = None
+    # Translated datasets are cached here by content hash (src/dataset_cache.py); None disables
+    dataset_cache_dir: Optional[str] = ".dataset_cache"
@@ -0,0 +1,140 @@
+"""
+Content-addressed cache of translated datasets.
+
+The first load of a CSV runs load_transactions() and writes the resulting
+frame (with _date_parsed and _amount) to the cache directory. The entry is
+keyed by a hash of the file's bytes and of the AppConfig it was loaded
+with. Later loads with the same file and config read the entry back
+instead of parsing the CSV: Parquet through a memory-mapped Arrow read
+when pyarrow is installed, pickle otherwise. Entry names also carry a
+short tag of the resolved source path and the config, so editing the CSV
+rebuilds its entry and removes the stale one, while other configs and
+same-named files in other directories keep their own entries.
+"""
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from .config import AppConfig
+from .preprocessing import load_transactions
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Bump when load_transactions() output changes for the same input
+CACHE_VERSION = 1
+# AppConfig fields that do not affect the loaded frame
+_UNKEYED_FIELDS = ('dataset_cache_dir',)
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _keyed_settings(cfg: AppConfig) -> str:
+    settings = {k: v for k, v in asdict(cfg).items() if k not in _UNKEYED_FIELDS}
+    return repr(sorted(settings.items()))
+
+
+def cache_key(path: str, cfg: AppConfig) -> str:
+    """Hash of the source file contents, the keyed AppConfig fields and the cache format."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_VERSION}:{pd.__version__}:{HAS_PYARROW}:".encode())
+    digest.update(file_digest(path).encode())
+    digest.update(_keyed_settings(cfg).encode())
+    return digest.hexdigest()
+
+
+def source_tag(path: str, cfg: AppConfig) -> str:
+    """Short hash of the resolved source path and the keyed AppConfig fields."""
+    digest = hashlib.blake2b(digest_size=4)
+    digest.update(str(Path(path).resolve()).encode())
+    digest.update(_keyed_settings(cfg).encode())
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Translated datasets stored by content hash under cache_dir."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _prefix(self, path: str, cfg: AppConfig) -> str:
+        return f"{Path(path).stem}-{source_tag(path, cfg)}-"
+
+    def _entry(self, path: str, cfg: AppConfig, key: str) -> Path:
+        suffix = '.parquet' if HAS_PYARROW else '.pkl'
+        return self.cache_dir / f"{self._prefix(path, cfg)}{key}{suffix}"
+
+    def load(self, path: str, cfg: AppConfig) -> pd.DataFrame:
+        """load_transactions(path, cfg), from the cache when the file and config are unchanged."""
+        key = cache_key(path, cfg)
+        entry = self._entry(path, cfg, key)
+        if entry.exists():
+            try:
+                df = self._read(entry)
+                self.hits += 1
+                return df
+            except Exception:
+                # Truncated or unreadable entry: rebuild it below
+                pass
+
+        self.misses += 1
+        df = load_transactions(path, cfg, chunksize=cfg.load_chunk_rows)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so readers never see a partial entry
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        if HAS_PYARROW:
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, entry)
+        self._remove_stale(self._prefix(path, cfg), entry)
+        return df
+
+    @staticmethod
+    def _read(entry: Path) -> pd.DataFrame:
+        if entry.suffix == '.parquet':
+            return pd.read_parquet(entry, memory_map=True)
+        return pd.read_pickle(entry)
+
+    def _remove_stale(self, prefix: str, current: Path) -> None:
+        """Drop entries of earlier contents of the same source path under the same config."""
+        for old in self.cache_dir.glob(f"{glob.escape(prefix)}*"):
+            key = old.stem[len(prefix):]
+            if old != current and old.suffix in ('.parquet', '.pkl') and len(key) == 32 and key.isalnum():
+                old.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = list(self.cache_dir.glob('*.parquet')) + list(self.cache_dir.glob('*.pkl')) \
+            if self.cache_dir.exists() else []
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(entry.stat().st_size for entry in entries),
+            'format': 'parquet' if HAS_PYARROW else 'pickle',
+        }
+
+
+def load_cached(path: str, cfg: AppConfig, cache: Optional[DatasetCache] = None) -> pd.DataFrame:
+    """Load through the cache in cfg.dataset_cache_dir, or directly when it is unset."""
+    if cache is None and cfg.dataset_cache_dir:
+        cache = DatasetCache(cfg.dataset_cache_dir)
+    if cache is None:
+        return load_transactions(path, cfg, chunksize=cfg.load_chunk_rows)
+    return cache.load(path, cfg)
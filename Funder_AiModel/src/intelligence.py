@@ -1,46 +1,62 @@
 import pandas as pd
 from datetime import datetime, timezone, timedelta
-import numpy as np
+from typing import Optional
 from .audit import AuditLogger
 from .config import AppConfig
+from .user_index import UserIndex, amount_column
 
-def spending_exceeds_income_alert(data_clean: pd.DataFrame, audit: AuditLogger, cfg: AppConfig) -> int:
+def spending_exceeds_income_alert(data_clean: pd.DataFrame, audit: AuditLogger, cfg: AppConfig,
+                                  index: Optional[UserIndex] = None) -> int:
     """
     Current month alert: Compare total income vs total expenses.
     Triggers CRITICAL alert if spending > income.
+    
+    With a UserIndex, the month's per-user totals are read from its
+    precomputed aggregates; otherwise they come from one groupby over the
+    month's rows.
     """
     now = datetime.now()
     start = datetime(now.year, now.month, 1)
     next_month = (start + timedelta(days=32)).replace(day=1)
     
-    df = data_clean.copy()
+    if index is not None and index.monthly is not None:
+        return _log_alerts(index.month_totals(start), audit)
+
+    df = data_clean
     date_col = next((c for c in cfg.possible_date_columns if c in df.columns), None)
-    if date_col:
-        df['_date_parsed'] = pd.to_datetime(df[date_col], errors='coerce')
-        df = df[(df['_date_parsed'] >= start) & (df['_date_parsed'] < next_month)]
-    
-    amt_col = next((c for c in cfg.numeric_amount_columns if c in df.columns), None)
-    if amt_col is None:
-        num = df.select_dtypes(include=[np.number]).columns
-        amt_col = num[0] if len(num) else None
+    # translate() already parsed the dates
+    if '_date_parsed' in df.columns:
+        dates = df['_date_parsed']
+    else:
+        dates = pd.to_datetime(df[date_col], errors='coerce') if date_col else None
+    if dates is not None:
+        df = df[(dates >= start) & (dates < next_month)]
     
+    amt_col = amount_column(df, cfg)
     if amt_col is None or len(df) == 0:
         return 0
     
-    alert_count = 0
-    users = df['user_id'].unique().tolist() if 'user_id' in df.columns else [None]
-    for uid in users:
-        sub = df if uid is None else df[df['user_id'] == uid]
-        amounts = sub[amt_col].dropna()
-        total_income = float(amounts[amounts > 0].sum())
-        total_expenses = float(abs(amounts[amounts < 0].sum()))
-        
-        if total_expenses > total_income and (total_income + total_expenses) > 0:
-            audit.log(
-                uid, 'budget_risk', 'HIGH',
-                f"Total spending has exceeded total income for this month | income=${total_income:.2f}, expenses=${total_expenses:.2f}",
-                None, None, None, None, 'SUFFICIENT_DATA', 'spending_vs_income_alert'
-            )
-            alert_count += 1
-    
-    return alert_count
+    amounts = df[amt_col].astype(float)
+    sides = pd.DataFrame({
+        'income': amounts.where(amounts > 0, 0.0),
+        'expenses': (-amounts).where(amounts < 0, 0.0),
+    })
+    if 'user_id' in df.columns:
+        totals = sides.groupby(df['user_id'], sort=False).sum()
+    else:
+        totals = pd.DataFrame([sides.sum()], index=[None])
+    return _log_alerts(totals, audit)
+
+
+def _log_alerts(totals: pd.DataFrame, audit: AuditLogger) -> int:
+    """Audit every user (index of totals) whose expenses exceed income."""
+    income, expenses = totals['income'], totals['expenses']
+    alerting = totals[(expenses > income) & ((income + expenses) > 0)]
+    if len(alerting):
+        audit.log_many(
+            list(alerting.index), 'budget_risk', 'HIGH',
+            [f"Total spending has exceeded total income for this month | income=${i:.2f}, expenses=${e:.2f}"
+             for i, e in zip(alerting['income'].tolist(), alerting['expenses'].tolist())],
+            data_validation_status='SUFFICIENT_DATA', model_used='spending_vs_income_alert'
+        )
+    return len(alerting)
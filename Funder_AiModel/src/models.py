@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from .config import AppConfig
 from .validation import validate_user_data
+from .user_index import UserIndex, amount_column
 from .audit import AuditLogger
 from .feedback import FeedbackLog
 from .performance import FastCache, Timer, PerformanceConfig, _global_cache
@@ -27,9 +28,9 @@ class BaseAIModel:
         self.is_trained = False
         self.predict_cache = FastCache(max_size=512, ttl_seconds=300)  # 5-min cache for predictions
 
-    def _validate_user(self, data: pd.DataFrame, user_id: int) -> Dict[str, Any]:
+    def _validate_user(self, data: pd.DataFrame, user_id: int, index: Optional[UserIndex] = None) -> Dict[str, Any]:
         """Defensive reliability: validate user has sufficient history before prediction."""
-        validation = validate_user_data(data, user_id, self.cfg)
+        validation = validate_user_data(data, user_id, self.cfg, index=index)
         if validation['status'] != 'OK':
             self.audit.log(
                 user_id=user_id,
@@ -92,14 +93,18 @@ class BaseAIModel:
             acc_gap = AccGapCallback(margin=acc_gap_margin, min_epoch=max(1, patience // 2))
 
             # Train with minimal logging
-            with Timer(f'{self.name} Training'):
-                self.history = self.model.fit(
-                    x_train, y_train,
-                    batch_size=batch_size, epochs=epochs,
-                    validation_split=validation_split,
-                    callbacks=[early_stop, acc_gap],
-                    verbose=PerformanceConfig.VERBOSE_TRAINING
-                )
+            try:
+                with Timer(f'{self.name} Training'):
+                    self.history = self.model.fit(
+                        x_train, y_train,
+                        batch_size=batch_size, epochs=epochs,
+                        validation_split=validation_split,
+                        callbacks=[early_stop, acc_gap],
+                        verbose=PerformanceConfig.VERBOSE_TRAINING
+                    )
+            finally:
+                # Weights changed (even if fit failed part-way); cached predictions are stale
+                self.predict_cache.clear()
 
             self.is_trained = True
             stopped_reason = self._determine_stop_reason()
@@ -194,13 +199,31 @@ class BaseAIModel:
             return {'ok': False, 'error': str(e)}
 
     def predict(self, x) -> Optional[np.ndarray]:
-        """Generate predictions on input data with caching and batch optimization."""
+        """
+        Generate predictions on input data with caching and batch optimization.
+
+        Each row of an (N, F) batch is looked up in predict_cache; only the
+        missing rows are sent to the model, in a single predict call, and the
+        outputs are reassembled in input order.
+        """
         if self.model is None or not self.is_trained:
             return None
 
         try:
             with Timer(f'{self.name} Prediction'):
-                return self.model.predict(x, verbose=PerformanceConfig.VERBOSE_INFERENCE)
+                x = x.to_numpy() if isinstance(x, pd.DataFrame) else np.asarray(x)
+                if not PerformanceConfig.CACHE_PREDICTIONS or x.ndim != 2:
+                    return self.model.predict(x, verbose=PerformanceConfig.VERBOSE_INFERENCE)
+
+                keys = self.predict_cache.row_keys(self.name, x)
+                rows, missing = self.predict_cache.get_many(keys)
+
+                if missing:
+                    fresh = self.model.predict(x[missing], verbose=PerformanceConfig.VERBOSE_INFERENCE)
+                    for i, row in zip(missing, fresh):
+                        rows[i] = row.copy()
+                        self.predict_cache.set(keys[i], rows[i])
+                return np.stack(rows)
         except Exception:
             return None
 
@@ -311,6 +334,34 @@ class FraudDetectionModel(BaseAIModel):
             'audit_logged': is_flagged
         }
 
+    def predict_fraud_batch(self, features: np.ndarray, transaction_ids=None, user_ids=None) -> Dict[str, Any]:
+        """Score a batch of transactions in one predict call and audit every flagged row at once."""
+        with Timer('Fraud Detection'):
+            pred = self.predict(features)
+        if pred is None:
+            return {'ok': False, 'error': 'Prediction failed'}
+
+        scores = np.asarray(pred, dtype=float).reshape(len(pred), -1)[:, 0]
+        flagged = np.flatnonzero(scores > 0.5)
+        if len(flagged):
+            flagged_scores = scores[flagged]
+            self.audit.log_many(
+                user_id=np.asarray(user_ids)[flagged] if user_ids is not None else -1,
+                decision_type='fraud_alert',
+                severity=np.where(flagged_scores > 0.8, 'HIGH', 'MEDIUM'),
+                trigger_reason=[f'Anomaly detected (score: {score:.2f})' for score in flagged_scores],
+                model_confidence_score=flagged_scores,
+                affected_transaction_id=np.asarray(transaction_ids)[flagged] if transaction_ids is not None else None,
+                model_used=self.name
+            )
+
+        return {
+            'ok': True,
+            'is_flagged': scores > 0.5,
+            'fraud_scores': scores,
+            'flagged_count': int(len(flagged))
+        }
+
 
 class GoalTrackingModel(BaseAIModel):
     """Child class: Goal feasibility and savings projection model."""
@@ -334,12 +385,13 @@ class GoalTrackingModel(BaseAIModel):
             self.audit.log(-1, 'goal_network_error', 'HIGH', str(e), model_used=self.name)
 
     def predict_feasibility(self, user_id: int, data: pd.DataFrame, target_amount: float,
-                            months_to_deadline: int) -> Dict[str, Any]:
+                            months_to_deadline: int, index: Optional[UserIndex] = None) -> Dict[str, Any]:
         """
         Unified feasibility prediction with validation check, soft-cap logic, and audit logging.
+        With a UserIndex, income and expenses come from its per-user totals.
         """
         with Timer('Goal Feasibility'):
-            validation = self._validate_user(data, user_id)
+            validation = self._validate_user(data, user_id, index)
             if validation['status'] != 'OK':
                 return {
                     'status': validation['status'],
@@ -348,18 +400,26 @@ class GoalTrackingModel(BaseAIModel):
                     'message': validation['reason']
                 }
 
-            # Extract user data (vectorized)
-            user_df = data[data['user_id'] == user_id] if 'user_id' in data.columns else data
-            if len(user_df) == 0:
-                return {'status': 'ERR_INVALID_USER', 'user_id': user_id, 'feasibility_score': None}
-
-            # Estimate income/expenses (fast vectorized operations)
-            nums = user_df.select_dtypes(include=[np.number]).columns
             income = expenses = 0.0
-            if len(nums):
-                amt = user_df[nums[0]].dropna()
-                income = float(amt[amt > 0].mean() * 10 if len(amt[amt > 0]) else 3500)
-                expenses = float(abs(amt[amt < 0].mean()) * 10 if len(amt[amt < 0]) else 2200)
+            if index is not None:
+                stats = index.user_stats(user_id)
+                if stats is None:
+                    return {'status': 'ERR_INVALID_USER', 'user_id': user_id, 'feasibility_score': None}
+                if index.amount_col is not None:
+                    income = float(stats['income'] / stats['income_count'] * 10 if stats['income_count'] else 3500)
+                    expenses = float(stats['expenses'] / stats['expense_count'] * 10 if stats['expense_count'] else 2200)
+            else:
+                # Extract user data (vectorized)
+                user_df = data[data['user_id'] == user_id] if 'user_id' in data.columns else data
+                if len(user_df) == 0:
+                    return {'status': 'ERR_INVALID_USER', 'user_id': user_id, 'feasibility_score': None}
+
+                # Estimate income/expenses (fast vectorized operations)
+                amt_col = amount_column(user_df, self.cfg)
+                if amt_col is not None:
+                    amt = user_df[amt_col].dropna()
+                    income = float(amt[amt > 0].mean() * 10 if len(amt[amt > 0]) else 3500)
+                    expenses = float(abs(amt[amt < 0].mean()) * 10 if len(amt[amt < 0]) else 2200)
 
             net = max(0.0, income - expenses)
             projected = net * months_to_deadline
@@ -1,62 +1,179 @@
+from collections import OrderedDict
 from functools import lru_cache, wraps
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, List, Tuple
+import threading
 import time
 import hashlib
 import pickle
 
+import numpy as np
+import pandas as pd
+
+# Returned by get() on a miss when callers need to tell a miss from a cached None
+_MISSING = object()
+
+
+def _feed_hash(digest, obj) -> None:
+    """
+    Feed a canonical byte encoding of obj into digest.
+
+    numpy arrays and pandas objects are hashed by content (dtype, shape and the
+    raw buffer) instead of their truncated repr, so two different feature
+    matrices never share a key.
+    """
+    if isinstance(obj, np.ndarray):
+        digest.update(f"nd:{obj.dtype.str}:{obj.shape}:".encode())
+        if obj.dtype.hasobject:
+            digest.update(pickle.dumps(obj.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            digest.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        kind = 'df' if isinstance(obj, pd.DataFrame) else 'sr'
+        columns = list(obj.columns) if kind == 'df' else [obj.name]
+        dtypes = list(map(str, obj.dtypes)) if kind == 'df' else [str(obj.dtype)]
+        digest.update(f"{kind}:{obj.shape}:{columns!r}:{dtypes!r}:".encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().data)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"{type(obj).__name__}:{len(obj)}:".encode())
+        for item in obj:
+            _feed_hash(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}:".encode())
+        for k in sorted(obj, key=repr):
+            _feed_hash(digest, k)
+            _feed_hash(digest, obj[k])
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+    else:
+        digest.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
 class FastCache:
     """
     High-speed LRU cache for predictions, validation, and expensive operations.
     Uses function signature + data hash for cache keys.
+
+    Entries live in an OrderedDict kept in recency order, so get, set and
+    eviction are all O(1). Safe to share between threads.
     """
     def __init__(self, max_size: int = 1024, ttl_seconds: int = 3600):
         self.max_size = max_size
         self.ttl = ttl_seconds
-        self.cache = {}
-        self.timestamps = {}
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
-    def _key(self, func_name: str, *args, **kwargs) -> str:
+    def _key(self, func_name: str, *args, **kwargs) -> Optional[str]:
         try:
-            # Hash arguments to create cache key
-            key_data = f"{func_name}_{str(args)}_{str(sorted(kwargs.items()))}"
-            return hashlib.md5(key_data.encode()).hexdigest()
+            # Hash argument contents to create cache key
+            digest = hashlib.blake2b(digest_size=16)
+            _feed_hash(digest, func_name)
+            _feed_hash(digest, args)
+            _feed_hash(digest, kwargs)
+            return digest.hexdigest()
         except Exception:
             return None
 
-    def get(self, key: str) -> Optional[Any]:
-        if key is None:
-            return None
-        if key not in self.cache:
-            return None
+    def _lookup(self, key: str, now: float) -> Any:
+        """Cached value or _MISSING, counting the hit or miss; caller holds the lock."""
+        entry = self.cache.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return _MISSING
         # Check TTL
-        if time.time() - self.timestamps.get(key, 0) > self.ttl:
+        stored_at, value = entry
+        if now - stored_at > self.ttl:
             del self.cache[key]
-            del self.timestamps[key]
-            return None
-        return self.cache[key]
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or default on a miss (use get_many to tell a cached None apart)."""
+        if key is None:
+            return default
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+        return default if value is _MISSING else value
+
+    def get_many(self, keys: List[str]) -> Tuple[List[Any], List[int]]:
+        """
+        Look up several keys under one lock. Returns the values in key order
+        (None at misses) and the positions of the misses.
+        """
+        values, missing = [None] * len(keys), []
+        with self._lock:
+            now = time.monotonic()
+            for i, key in enumerate(keys):
+                value = self._lookup(key, now)
+                if value is _MISSING:
+                    missing.append(i)
+                else:
+                    values[i] = value
+        return values, missing
 
     def set(self, key: str, value: Any) -> None:
         if key is None:
             return
-        if len(self.cache) >= self.max_size:
-            # Evict oldest entry
-            oldest = min(self.timestamps, key=self.timestamps.get)
-            del self.cache[oldest]
-            del self.timestamps[oldest]
-        self.cache[key] = value
-        self.timestamps[key] = time.time()
+        with self._lock:
+            self.cache[key] = (time.monotonic(), value)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                # Evict least recently used entry
+                self.cache.popitem(last=False)
+                self.evictions += 1
 
     def clear(self):
-        self.cache.clear()
-        self.timestamps.clear()
+        with self._lock:
+            self.cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def row_keys(self, namespace: str, x: np.ndarray) -> List[str]:
+        """
+        One key per row of a 2-D array, hashing only that row's bytes.
+
+        Object rows (e.g. DataFrame.to_numpy() of a mixed frame) hold
+        pointers, not values, so their elements are hashed like _feed_hash
+        does instead.
+        """
+        x = np.ascontiguousarray(x)
+        prefix = f"{namespace}:{x.dtype.str}:{x.shape[1]}:".encode()
+        if not x.dtype.hasobject:
+            return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).hexdigest() for row in x]
+        keys = []
+        for row in x:
+            digest = hashlib.blake2b(prefix, digest_size=16)
+            _feed_hash(digest, row.tolist())
+            keys.append(digest.hexdigest())
+        return keys
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.cache),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
 
     def cached(self, func: Callable) -> Callable:
         """Decorator to cache function results."""
         @wraps(func)
         def wrapper(*args, **kwargs):
             key = self._key(func.__name__, *args, **kwargs)
-            cached_val = self.get(key)
-            if cached_val is not None:
+            cached_val = self.get(key, _MISSING)
+            if cached_val is not _MISSING:
                 return cached_val
             result = func(*args, **kwargs)
             self.set(key, result)
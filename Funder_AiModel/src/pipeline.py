@@ -1,11 +1,12 @@
 import pandas as pd
 from typing import Any, Dict
 from .config import AppConfig
-from .preprocessing import translate
+from .dataset_cache import DatasetCache, load_cached
 from .audit import AuditLogger
 from .feedback import FeedbackLog
 from .models import CategorizeModel, FraudDetectionModel, GoalTrackingModel
 from .intelligence import spending_exceeds_income_alert
+from .user_index import build_user_index
 from .performance import Timer
 
 class FinanceAIEngine:
@@ -13,7 +14,9 @@ class FinanceAIEngine:
         self.cfg = cfg
         self.audit = AuditLogger()
         self.feedback = FeedbackLog()
+        self.dataset_cache = DatasetCache(cfg.dataset_cache_dir) if cfg.dataset_cache_dir else None
         self.data = None
+        self.user_index = None
 
         # Instantiate specialized models
         self.categorizer = CategorizeModel(cfg, self.audit, self.feedback)
@@ -22,19 +25,23 @@ class FinanceAIEngine:
 
     def load_data(self, path: str) -> pd.DataFrame:
         with Timer('Data Loading'):
-            df = pd.read_csv(path)
-            self.data = translate(df, self.cfg)
+            data = load_cached(path, self.cfg, self.dataset_cache)
+        with Timer('User Index'):
+            self.user_index = build_user_index(data, self.cfg)
+        # The index holds the frame sorted by user and date; keep only that copy
+        self.data = self.user_index.frame if self.user_index is not None else data
         return self.data
 
     def run_monthly_alerts(self) -> int:
         if self.data is None:
             return 0
         with Timer('Monthly Alerts'):
-            return spending_exceeds_income_alert(self.data, self.audit, self.cfg)
+            return spending_exceeds_income_alert(self.data, self.audit, self.cfg, index=self.user_index)
 
     def goal_feasibility(self, user_id: int, target_amount: float, months_to_deadline: int):
         """Unified goal feasibility check using GoalTrackingModel."""
-        return self.goal_tracker.predict_feasibility(user_id, self.data, target_amount, months_to_deadline)
+        return self.goal_tracker.predict_feasibility(user_id, self.data, target_amount, months_to_deadline,
+                                                 index=self.user_index)
 
     def category_retrain_ready(self):
         return self.feedback.prepare_category_training(self.cfg.category_retrain_min_feedback)
@@ -78,4 +85,4 @@ class FinanceAIEngine:
     def quick_goal_check(self, user_id: int, target: float, months: int) -> Dict[str, Any]:
         """Fast-track goal feasibility (< 100ms)."""
         with Timer('Quick Goal'):
-            return self.goal_tracker.predict_feasibility(user_id, self.data, target, months)
+            return self.goal_tracker.predict_feasibility(user_id, self.data, target, months, index=self.user_index)
@@ -1,7 +1,32 @@
 import pandas as pd
-from typing import Tuple, List
+from typing import Iterator, List, Optional, Sequence, Tuple
 from .config import AppConfig
 
+# Non-predictive columns translate() drops
+REDUNDANT_COLUMNS = [
+    'transaction_id', 'user_id', 'account_id',  # Database IDs
+    'merchant_name', 'transaction_date', 'notes'  # Metadata
+]
+
+# Schema of the transaction datasets (final_train_dataset.csv, final_test_dataset.csv).
+# transaction_date is read as a categorical so each distinct timestamp is parsed
+# once, with AppConfig.transaction_date_format
+TRANSACTION_DTYPES = {
+    'transaction_id': 'int32',
+    'user_id': 'int32',
+    'account_id': 'int32',
+    'amount': 'float32',
+    'transaction_type': 'category',
+    'category': 'category',
+    'merchant_name': 'category',
+    'transaction_date': 'category',
+    'payment_method': 'category',
+    'is_flagged': 'int8',
+    'monthly_budget': 'float32',
+    'spent_in_category_month': 'float32',
+    'over_budget_percentage': 'float32',
+}
+
 def detect_columns(df: pd.DataFrame, cfg: AppConfig) -> Tuple[str, str]:
     date_col = next((c for c in cfg.possible_date_columns if c in df.columns), None)
     amount_col = next((c for c in cfg.numeric_amount_columns if c in df.columns), None)
@@ -10,7 +35,7 @@ def detect_columns(df: pd.DataFrame, cfg: AppConfig) -> Tuple[str, str]:
         amount_col = num[0] if len(num) else None
     return date_col, amount_col
 
-def drop_redundant_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+def drop_redundant_columns(df: pd.DataFrame, keep: Sequence[str] = ()) -> Tuple[pd.DataFrame, List[str]]:
     """
     Drop non-predictive columns (IDs, metadata) that waste memory during model training.
     
@@ -20,17 +45,13 @@ def drop_redundant_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
     
     Args:
         df: Input DataFrame
+        keep: Redundant columns to keep anyway (e.g. user_id for the per-user index)
     
     Returns:
         Tuple of (cleaned DataFrame, list of dropped column names)
     """
-    redundant_cols = [
-        'transaction_id', 'user_id', 'account_id',  # Database IDs
-        'merchant_name', 'transaction_date', 'notes'  # Metadata
-    ]
-    
     # Only drop columns that actually exist in the dataframe
-    cols_to_drop = [c for c in redundant_cols if c in df.columns]
+    cols_to_drop = [c for c in REDUNDANT_COLUMNS if c in df.columns and c not in keep]
     
     if cols_to_drop:
         df_cleaned = df.drop(columns=cols_to_drop)
@@ -38,19 +59,101 @@ def drop_redundant_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
     
     return df, []
 
-def translate(df: pd.DataFrame, cfg: AppConfig) -> pd.DataFrame:
+def _parse_dates(column: pd.Series, date_format: Optional[str]) -> pd.Series:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Timestamps repeat heavily; parse each distinct string once
+        parsed = pd.DatetimeIndex(pd.to_datetime(column.cat.categories, format=date_format, errors='coerce'))
+        return pd.Series(parsed.take(column.cat.codes.to_numpy(), allow_fill=True, fill_value=pd.NaT),
+                         index=column.index)
+    return pd.to_datetime(column, format=date_format, errors='coerce')
+
+
+def translate(df: pd.DataFrame, cfg: AppConfig, date_format: Optional[str] = None, copy: bool = True) -> pd.DataFrame:
     # Normalize date and amount columns
     date_col, amount_col = detect_columns(df, cfg)
-    out = df.copy()
+    # Frames fresh from load_transactions() are not shared, so they can be modified in place
+    out = df.copy() if copy else df
     if date_col:
-        out['_date_parsed'] = pd.to_datetime(out[date_col], errors='coerce')
+        out['_date_parsed'] = _parse_dates(out[date_col], date_format)
     if amount_col:
         out['_amount'] = pd.to_numeric(out[amount_col], errors='coerce')
     # Lowercase transaction_type if present
     if 'transaction_type' in out.columns:
-        out['transaction_type'] = out['transaction_type'].astype(str).str.lower()
+        column = out['transaction_type']
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Lowercase the categories, not every row
+            out['transaction_type'] = column.cat.rename_categories(column.cat.categories.str.lower()) \
+                if column.cat.categories.str.lower().is_unique else column.astype(str).str.lower().astype('category')
+        else:
+            out['transaction_type'] = column.astype(str).str.lower()
     
     # Drop redundant columns to save memory
-    out, _ = drop_redundant_columns(out)
+    out, _ = drop_redundant_columns(out, keep=cfg.keep_columns)
     
     return out
+
+
+def _read_options(path: str, cfg: AppConfig, columns: Optional[Sequence[str]]) -> dict:
+    """usecols and dtype for read_csv: redundant columns pruned up front, schema dtypes applied."""
+    header = pd.read_csv(path, nrows=0).columns
+    date_col = next((c for c in cfg.possible_date_columns if c in header), None)
+    if columns is None:
+        # The date column is only read to derive _date_parsed, then dropped
+        columns = [c for c in header if c not in REDUNDANT_COLUMNS or c == date_col or c in cfg.keep_columns]
+    return {
+        'usecols': list(columns),
+        'dtype': {c: dtype for c, dtype in TRANSACTION_DTYPES.items() if c in columns},
+    }
+
+
+def iter_transaction_chunks(path: str, cfg: AppConfig, chunksize: int,
+                            columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a transaction CSV chunksize rows at a time, each chunk typed and translated.
+    
+    Only one raw chunk is held at once, so files larger than memory can be
+    streamed (e.g. aggregated per chunk).
+    """
+    options = _read_options(path, cfg, columns)
+    for chunk in pd.read_csv(path, chunksize=chunksize, **options):
+        yield translate(chunk, cfg, date_format=cfg.transaction_date_format, copy=False)
+
+
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed chunks, merging the categories of categorical columns."""
+    if len(chunks) == 1:
+        return chunks[0]
+    for column, dtype in chunks[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Plain concat turns categoricals with different categories into object
+            categories = chunks[0][column].cat.categories
+            for chunk in chunks[1:]:
+                categories = categories.union(chunk[column].cat.categories, sort=False)
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_transactions(path: str, cfg: AppConfig, chunksize: Optional[int] = None,
+                      columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Schema-aware load of a transaction CSV, equivalent to translate(pd.read_csv(path)).
+    
+    Redundant columns are never parsed, strings are categoricals, amounts
+    float32 and ids int32, and transaction_date is parsed with
+    cfg.transaction_date_format. With chunksize, the file is parsed in
+    chunks and only the typed chunks are kept.
+    
+    Args:
+        path: CSV file
+        cfg: AppConfig (date columns and format)
+        chunksize: Rows per chunk; None reads the file at once
+        columns: Columns to read instead of the pruned default
+    
+    Returns:
+        Translated DataFrame
+    """
+    if chunksize:
+        return concat_chunks(list(iter_transaction_chunks(path, cfg, chunksize, columns)))
+    df = pd.read_csv(path, **_read_options(path, cfg, columns))
+    return translate(df, cfg, date_format=cfg.transaction_date_format, copy=False)
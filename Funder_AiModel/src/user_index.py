@@ -0,0 +1,139 @@
+"""
+Per-user index over a translated transaction frame.
+
+Built once when FinanceAIEngine loads data: the frame is sorted by
+(user_id, _date_parsed) so each user's rows are one contiguous slice, and
+per-user and per-(month, user) income/expense aggregates are precomputed.
+validate_user_data, GoalTrackingModel.predict_feasibility and
+spending_exceeds_income_alert read those instead of scanning the frame with
+data[data['user_id'] == user_id] on every call (O(U*N) for the alert).
+
+Income and expenses follow the convention of those functions: positive
+amounts are income, negative amounts expenses.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import AppConfig
+
+
+def amount_column(data: pd.DataFrame, cfg: AppConfig, exclude=('user_id',)) -> Optional[str]:
+    """
+    The amount column: the first of cfg.numeric_amount_columns present, else
+    the first numeric column that is not an id (user_id is numeric once kept).
+    """
+    named = next((c for c in cfg.numeric_amount_columns if c in data.columns), None)
+    if named is not None:
+        return named
+    numeric = [c for c, dtype in data.dtypes.items()
+               if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) and c not in exclude]
+    return numeric[0] if numeric else None
+
+
+def _sort_order(users: np.ndarray, dates: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Row order by (user, date). User codes and date ticks (in units of their
+    common step, e.g. minutes) are packed into one int64 key so a single
+    argsort does it; lexsort is the fallback when they do not fit.
+    """
+    codes, uniques = pd.factorize(users, sort=True)
+    if dates is None:
+        return np.argsort(codes, kind='stable')
+    ticks = dates.view('i8')
+    valid = ~np.isnat(dates)
+    offsets = np.zeros(len(ticks), dtype=np.int64)
+    if valid.any():
+        offsets[valid] = ticks[valid] - ticks[valid].min()
+        step = int(np.gcd.reduce(offsets[valid]))
+        if step > 1:
+            offsets //= step
+        offsets[valid] += 1  # NaT first, as lexsort orders it
+    span = int(offsets.max()) + 1
+    if (len(uniques) + 1) * span >= 2 ** 63:
+        return np.lexsort((ticks, codes))
+    return np.argsort(codes.astype(np.int64) * span + offsets)
+
+
+class UserIndex:
+    """Row offsets sorted by user and date, with per-user and monthly aggregates."""
+
+    def __init__(self, data: pd.DataFrame, cfg: AppConfig, user_col: str = 'user_id'):
+        self.user_col = user_col
+        self.date_col = '_date_parsed' if '_date_parsed' in data.columns else None
+        self.amount_col = amount_column(data, cfg, exclude=(user_col,))
+
+        dates = data[self.date_col].to_numpy() if self.date_col else None
+        order = _sort_order(data[user_col].to_numpy(), dates)
+        # The sorted copy replaces the loaded frame in the engine, so there is one copy
+        self.frame = data.take(order).reset_index(drop=True)
+
+        # Each user's rows are one contiguous block of the sorted frame
+        sorted_users = self.frame[user_col].to_numpy()
+        starts = np.flatnonzero(np.r_[True, sorted_users[1:] != sorted_users[:-1]])
+        ends = np.r_[starts[1:], len(sorted_users)]
+        uniques = sorted_users[starts]
+        self._slices = dict(zip(uniques.tolist(), zip(starts.tolist(), ends.tolist())))
+
+        # Per-user totals are reductions over those blocks
+        totals = {'transactions': ends - starts}
+        columns = {user_col: sorted_users}
+        sums = []
+        if self.amount_col is not None:
+            amounts = self.frame[self.amount_col].to_numpy(dtype=np.float64)
+            columns['income'] = np.where(amounts > 0, amounts, 0.0)
+            columns['expenses'] = np.where(amounts < 0, -amounts, 0.0)
+            sums = ['income', 'expenses']
+            totals['income'] = np.add.reduceat(columns['income'], starts)
+            totals['income_count'] = np.add.reduceat((amounts > 0).astype(np.int64), starts)
+            totals['expenses'] = np.add.reduceat(columns['expenses'], starts)
+            totals['expense_count'] = np.add.reduceat((amounts < 0).astype(np.int64), starts)
+        if self.date_col:
+            sorted_dates = self.frame[self.date_col].to_numpy()
+            # NaT sorts first within a user, so the first valid date follows them
+            missing = np.add.reduceat(np.isnat(sorted_dates).astype(np.int64), starts)
+            first = np.minimum(starts + missing, ends - 1)
+            totals['first_date'] = np.where(missing < ends - starts, sorted_dates[first], np.datetime64('NaT'))
+            totals['last_date'] = sorted_dates[ends - 1]
+            columns['month'] = sorted_dates.astype('datetime64[M]')
+        # One row per user: lookups by user_id hit the index's hash table
+        self.totals = pd.DataFrame(totals, index=pd.Index(uniques, name=user_col))
+
+        self.monthly = None
+        if self.date_col and sums:
+            # Month first, so one month's users are a contiguous, sorted block
+            self.monthly = pd.DataFrame(columns).groupby(['month', user_col], sort=True)[sums].sum()
+            self._months = self.monthly.index.get_level_values('month').to_numpy()
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._slices
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def rows(self, user_id) -> pd.DataFrame:
+        """The user's rows in date order, as a slice of the sorted frame."""
+        start, end = self._slices.get(user_id, (0, 0))
+        return self.frame.iloc[start:end]
+
+    def user_stats(self, user_id) -> Optional[Dict[str, Any]]:
+        """transactions, income/expense sums and counts, first/last date; None for unknown users."""
+        if user_id not in self._slices:
+            return None
+        return self.totals.loc[user_id].to_dict()
+
+    def month_totals(self, month) -> pd.DataFrame:
+        """income and expenses per user (index) for the calendar month containing `month`."""
+        if self.monthly is None:
+            return pd.DataFrame(columns=['income', 'expenses'])
+        key = np.datetime64(pd.Timestamp(month).to_period('M').start_time)
+        start, end = np.searchsorted(self._months, key, 'left'), np.searchsorted(self._months, key, 'right')
+        return self.monthly.iloc[start:end].droplevel('month')
+
+
+def build_user_index(data: pd.DataFrame, cfg: AppConfig) -> Optional[UserIndex]:
+    """UserIndex for frames that carry user ids, else None."""
+    if data is None or 'user_id' not in data.columns or len(data) == 0:
+        return None
+    return UserIndex(data, cfg)
@@ -1,21 +1,24 @@
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional
 from .config import AppConfig
+from .user_index import UserIndex
 
-def validate_user_data(data_clean: pd.DataFrame, user_id, cfg: AppConfig) -> Dict:
+def validate_user_data(data_clean: pd.DataFrame, user_id, cfg: AppConfig, index: Optional[UserIndex] = None) -> Dict:
+    if index is not None:
+        return _validate_indexed(index, user_id, cfg)
     user_transactions = data_clean[data_clean['user_id'] == user_id] if 'user_id' in data_clean.columns else pd.DataFrame()
     if len(user_transactions) == 0:
-        return {
-            'status': 'ERR_INVALID_USER', 'user_id': user_id,
-            'months_available': 0, 'transaction_count': 0,
-            'is_valid': False, 'reason': 'User not found in transaction history'
-        }
+        return _invalid_user(user_id)
     date_col = None
     for col in cfg.possible_date_columns:
         if col in user_transactions.columns:
             date_col = col; break
     months_available = 1
-    if date_col:
+    if '_date_parsed' in user_transactions.columns:
+        # Parsed by translate()
+        dt = user_transactions['_date_parsed'].dropna()
+        months_available = max(1, int((dt.max() - dt.min()).days / 30)) if len(dt) else 1
+    elif date_col:
         try:
             dt = pd.to_datetime(user_transactions[date_col])
             months_available = max(1, int((dt.max() - dt.min()).days / 30))
@@ -23,7 +26,30 @@ def validate_user_data(data_clean: pd.DataFrame, user_id, cfg: AppConfig) -> Dic
             months_available = 1
     else:
         months_available = max(1, len(user_transactions) // 10)
-    txn_count = len(user_transactions)
+    return _validation_result(user_id, months_available, len(user_transactions), cfg)
+
+def _validate_indexed(index: UserIndex, user_id, cfg: AppConfig) -> Dict:
+    """validate_user_data from the index's per-user totals, without touching the rows."""
+    stats = index.user_stats(user_id)
+    if stats is None:
+        return _invalid_user(user_id)
+    first, last = stats.get('first_date'), stats.get('last_date')
+    if index.date_col is None:
+        months_available = max(1, stats['transactions'] // 10)
+    elif pd.isna(first) or pd.isna(last):
+        months_available = 1
+    else:
+        months_available = max(1, int((last - first).days / 30))
+    return _validation_result(user_id, months_available, int(stats['transactions']), cfg)
+
+def _invalid_user(user_id) -> Dict:
+    return {
+        'status': 'ERR_INVALID_USER', 'user_id': user_id,
+        'months_available': 0, 'transaction_count': 0,
+        'is_valid': False, 'reason': 'User not found in transaction history'
+    }
+
+def _validation_result(user_id, months_available: int, txn_count: int, cfg: AppConfig) -> Dict:
     if months_available >= cfg.min_months_history and txn_count >= cfg.min_months_history * 5:
         status, is_valid = 'OK', True
     elif months_available >= 1 and txn_count >= 5:
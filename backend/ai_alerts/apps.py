@@ -1,7 +1,27 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+def is_runserver_worker(argv=None):
+    """True in the runserver process that serves requests, not its autoreloader parent."""
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2 or argv[1] != 'runserver':
+        return False
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in argv
+
+
 class AiAlertsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_alerts'
 
+    def ready(self):
+        """Warm the prediction models in the background under runserver.
+
+        WSGI/ASGI workers start the warm-up from funder/wsgi.py and
+        funder/asgi.py; other manage.py commands and tests never do.
+        """
+        if is_runserver_worker():
+            from funder.warmup import start_on_boot
+            start_on_boot()
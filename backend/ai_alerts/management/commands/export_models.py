@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from funder.model_export import export_model_store
+from funder.model_registry import MODEL_DIR
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold BatchNorm into Linear and export the DNN/ResNet/Attention checkpoints "
+        "in model_store/ to TorchScript (and optionally ONNX) under model_store/compiled/. "
+        "Serve them by setting AI_INFERENCE_BACKEND to 'torchscript' or 'onnx'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--onnx', action='store_true', help='Also write .onnx graphs (requires the onnx package)')
+        parser.add_argument('--model-dir', default=str(MODEL_DIR), help='Directory holding the .pth checkpoints')
+
+    def handle(self, *args, **options):
+        written = export_model_store(Path(options['model_dir']), onnx=options['onnx'])
+        for path in written:
+            self.stdout.write(f"Wrote {path}")
+        self.stdout.write(self.style.SUCCESS(f"Exported {len(written)} model graph(s)"))
@@ -0,0 +1,99 @@
+"""
+Tests for ai_alerts app.
+"""
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from funder.ensemble import ensemble_vote
+
+from .views import (
+    predict_transaction_type,
+    predict_transaction_type_batch,
+)
+
+
+SAMPLE_TRANSACTIONS = [
+    {
+        'amount': 328.8, 'is_flagged': 0, 'monthly_budget': 828.49,
+        'spent_in_category_month': 123.24, 'over_budget_percentage': 0,
+        'category': 'Food', 'payment_method': 'cash'
+    },
+    {
+        'amount': 2400.0, 'is_flagged': 0, 'monthly_budget': 0,
+        'spent_in_category_month': 0, 'over_budget_percentage': 0,
+        'category': 'Salary', 'payment_method': 'bank_transfer'
+    },
+    {
+        'amount': 425.05, 'is_flagged': 1, 'monthly_budget': 2802.19,
+        'spent_in_category_month': 4284.54, 'over_budget_percentage': 52.9,
+        'category': 'Bills', 'payment_method': 'card'
+    },
+]
+
+
+class EnsembleVoteTestCase(SimpleTestCase):
+    """Test cases for the vectorized ensemble vote."""
+
+    def test_matches_counter_most_common(self):
+        """Test the vote agrees with Counter.most_common, including ties."""
+        rng = np.random.default_rng(0)
+        votes = rng.integers(0, 3, size=(4, 200))
+
+        winner, confidence = ensemble_vote(votes)
+
+        for n in range(votes.shape[1]):
+            expected, count = Counter(votes[:, n].tolist()).most_common(1)[0]
+            self.assertEqual(winner[n], expected)
+            self.assertAlmostEqual(confidence[n], count / votes.shape[0])
+
+    def test_tie_goes_to_earliest_model(self):
+        """Test a 2-2 split picks the class voted for by the first model."""
+        votes = np.array([[1], [0], [0], [1]])
+        winner, confidence = ensemble_vote(votes)
+        self.assertEqual(winner[0], 1)
+        self.assertEqual(confidence[0], 0.5)
+
+
+class TransactionBatchPredictionTestCase(SimpleTestCase):
+    """Test cases for the batched transaction prediction endpoint."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = SimpleNamespace(is_authenticated=True)
+
+    def _post(self, view, path, data):
+        request = self.factory.post(path, data, format='json')
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def test_batch_matches_single_predictions(self):
+        """Test every batch row equals the single-row endpoint response."""
+        response = self._post(
+            predict_transaction_type_batch,
+            '/api/ai-alerts/predict/transaction/batch/',
+            {'transactions': SAMPLE_TRANSACTIONS}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], len(SAMPLE_TRANSACTIONS))
+
+        for row, batch_result in zip(SAMPLE_TRANSACTIONS, response.data['predictions']):
+            single = self._post(predict_transaction_type, '/api/ai-alerts/predict/transaction/', row)
+            self.assertEqual(single.status_code, status.HTTP_200_OK)
+            self.assertEqual(batch_result['predicted_type'], single.data['predicted_type'])
+            self.assertEqual(batch_result['model_votes'], single.data['model_votes'])
+            self.assertAlmostEqual(batch_result['confidence'], single.data['confidence'])
+
+    def test_batch_rejects_empty_payload(self):
+        """Test an empty transaction list is a 400."""
+        response = self._post(
+            predict_transaction_type_batch,
+            '/api/ai-alerts/predict/transaction/batch/',
+            {'transactions': []}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['success'])
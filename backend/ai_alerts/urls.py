@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     AIAlertViewSet,
     predict_transaction_type,
+    predict_transaction_type_batch,
     predict_budget_risk,
     predict_goal_success,
     predict_flagged_transaction
@@ -16,6 +17,7 @@ urlpatterns = [
     
     # AI Model Prediction Endpoints
     path('predict/transaction/', predict_transaction_type, name='predict-transaction'),
+    path('predict/transaction/batch/', predict_transaction_type_batch, name='predict-transaction-batch'),
     path('predict/budget-risk/', predict_budget_risk, name='predict-budget-risk'),
     path('predict/goal-success/', predict_goal_success, name='predict-goal-success'),
     path('predict/flagged/', predict_flagged_transaction, name='predict-flagged'),
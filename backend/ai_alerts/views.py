@@ -5,185 +5,37 @@ from rest_framework.response import Response
 from django.conf import settings
 from .models import AIAlert
 from .serializers import AIAlertSerializer
+from funder.ensemble import ensemble_vote, run_transaction_ensemble
+from funder.model_registry import get_registry, load_model_once
+from funder.networks import DeepNeuralNetwork, ResidualNeuralNetwork, AttentionNeuralNetwork
+from funder.prediction_cache import get_prediction_cache
 import torch
-import torch.nn as nn
 import numpy as np
 import pandas as pd
-import pickle
-import os
-from pathlib import Path
-
-
-# ========== MODEL DEFINITIONS (Mirror from notebook) ==========
-
-class DeepNeuralNetwork(nn.Module):
-    """DNN architecture for transaction classification and flagged detection"""
-    def __init__(self, input_dim, num_classes):
-        super(DeepNeuralNetwork, self).__init__()
-        self.network = nn.Sequential(
-            nn.Linear(input_dim, 256), nn.BatchNorm1d(256), nn.ReLU(), nn.Dropout(0.4),
-            nn.Linear(256, 128), nn.BatchNorm1d(128), nn.ReLU(), nn.Dropout(0.4),
-            nn.Linear(128, 64), nn.BatchNorm1d(64), nn.ReLU(), nn.Dropout(0.3),
-            nn.Linear(64, num_classes)
-        )
-    
-    def forward(self, x):
-        return self.network(x)
-
-
-class ResidualBlock(nn.Module):
-    def __init__(self, input_dim, hidden_dim):
-        super(ResidualBlock, self).__init__()
-        self.fc1 = nn.Linear(input_dim, hidden_dim)
-        self.bn1 = nn.BatchNorm1d(hidden_dim)
-        self.fc2 = nn.Linear(hidden_dim, input_dim)
-        self.bn2 = nn.BatchNorm1d(input_dim)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.2)
-
-    def forward(self, x):
-        residual = x
-        out = self.fc1(x)
-        out = self.bn1(out)
-        out = self.relu(out)
-        out = self.dropout(out)
-        out = self.fc2(out)
-        out = self.bn2(out)
-        out += residual
-        out = self.relu(out)
-        return out
-
-
-class ResidualNeuralNetwork(nn.Module):
-    """ResNet architecture for transaction classification"""
-    def __init__(self, input_dim, num_classes):
-        super(ResidualNeuralNetwork, self).__init__()
-        self.input_layer = nn.Linear(input_dim, 256)
-        self.bn_input = nn.BatchNorm1d(256)
-        self.res_block1 = ResidualBlock(256, 512)
-        self.res_block2 = ResidualBlock(256, 512)
-        self.res_block3 = ResidualBlock(256, 512)
-        self.fc_out = nn.Sequential(
-            nn.Linear(256, 128),
-            nn.BatchNorm1d(128),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(128, num_classes)
-        )
-        self.relu = nn.ReLU()
-
-    def forward(self, x):
-        x = self.input_layer(x)
-        x = self.bn_input(x)
-        x = self.relu(x)
-        x = self.res_block1(x)
-        x = self.res_block2(x)
-        x = self.res_block3(x)
-        x = self.fc_out(x)
-        return x
-
-
-class AttentionLayer(nn.Module):
-    def __init__(self, hidden_dim):
-        super(AttentionLayer, self).__init__()
-        self.attention = nn.Linear(hidden_dim, 1)
-
-    def forward(self, x):
-        attention_weights = torch.softmax(self.attention(x), dim=1)
-        return x * attention_weights
-
-
-class AttentionNeuralNetwork(nn.Module):
-    """Attention-based neural network for transaction classification"""
-    def __init__(self, input_dim, num_classes):
-        super(AttentionNeuralNetwork, self).__init__()
-        self.fc1 = nn.Linear(input_dim, 256)
-        self.bn1 = nn.BatchNorm1d(256)
-        self.attention1 = AttentionLayer(256)
-        self.fc2 = nn.Linear(256, 128)
-        self.bn2 = nn.BatchNorm1d(128)
-        self.attention2 = AttentionLayer(128)
-        self.fc3 = nn.Linear(128, 64)
-        self.bn3 = nn.BatchNorm1d(64)
-        self.fc_out = nn.Linear(64, num_classes)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.3)
-
-    def forward(self, x):
-        x = self.fc1(x)
-        x = self.bn1(x)
-        x = self.relu(x)
-        x = self.attention1(x)
-        x = self.dropout(x)
-        x = self.fc2(x)
-        x = self.bn2(x)
-        x = self.relu(x)
-        x = self.attention2(x)
-        x = self.dropout(x)
-        x = self.fc3(x)
-        x = self.bn3(x)
-        x = self.relu(x)
-        x = self.dropout(x)
-        x = self.fc_out(x)
-        return x
 
 
 # ========== MODEL LOADER UTILITIES ==========
 
-MODEL_DIR = Path(settings.BASE_DIR) / "model_store"
-_loaded_models = {}
-
-
-def load_model_once(model_key, loader_func):
-    """Cache loaded models to avoid reloading on every request"""
-    if model_key not in _loaded_models:
-        _loaded_models[model_key] = loader_func()
-    return _loaded_models[model_key]
-
-
 def load_transaction_models():
     """Load all transaction classification models and preprocessing objects"""
     try:
-        device = torch.device('cpu')
-        
-        # Load preprocessing objects
-        with open(MODEL_DIR / "transaction_preprocessing.pkl", 'rb') as f:
-            preprocessing = pickle.load(f)
-        
-        # Load DNN model
-        dnn_checkpoint = torch.load(MODEL_DIR / "transaction_dnn_model.pth", map_location=device)
-        dnn_model = DeepNeuralNetwork(dnn_checkpoint['input_dim'], dnn_checkpoint['num_classes'])
-        dnn_model.load_state_dict(dnn_checkpoint['model_state_dict'])
-        dnn_model.eval()
-        
-        # Load ResNet model
-        resnet_checkpoint = torch.load(MODEL_DIR / "transaction_resnet_model.pth", map_location=device)
-        resnet_model = ResidualNeuralNetwork(resnet_checkpoint['input_dim'], resnet_checkpoint['num_classes'])
-        resnet_model.load_state_dict(resnet_checkpoint['model_state_dict'])
-        resnet_model.eval()
-        
-        # Load Attention model
-        attention_checkpoint = torch.load(MODEL_DIR / "transaction_attention_model.pth", map_location=device)
-        attention_model = AttentionNeuralNetwork(attention_checkpoint['input_dim'], attention_checkpoint['num_classes'])
-        attention_model.load_state_dict(attention_checkpoint['model_state_dict'])
-        attention_model.eval()
+        registry = get_registry()
         
         # Try to load TabNet if available
         tabnet_model = None
         try:
-            from pytorch_tabnet.tab_model import TabNetClassifier
-            tabnet_model = TabNetClassifier()
-            tabnet_model.load_model(str(MODEL_DIR / "transaction_tabnet_model.zip"))
+            tabnet_model = registry.load_tabnet("transaction_tabnet_model.zip")
         except:
             pass
         
         return {
-            'dnn': dnn_model,
-            'resnet': resnet_model,
-            'attention': attention_model,
+            'dnn': registry.load_torch("transaction_dnn_model.pth", DeepNeuralNetwork),
+            'resnet': registry.load_torch("transaction_resnet_model.pth", ResidualNeuralNetwork),
+            'attention': registry.load_torch("transaction_attention_model.pth", AttentionNeuralNetwork),
             'tabnet': tabnet_model,
-            'preprocessing': preprocessing,
-            'device': device
+            'preprocessing': registry.load_pickle("transaction_preprocessing.pkl"),
+            'pipeline': registry.load_feature_pipeline("transaction_preprocessing.pkl"),
+            'device': torch.device('cpu')
         }
     except Exception as e:
         raise Exception(f"Error loading transaction models: {str(e)}")
@@ -192,15 +44,11 @@ def load_transaction_models():
 def load_budget_model():
     """Load budget overrun prediction model"""
     try:
-        from pytorch_tabnet.tab_model import TabNetClassifier
-        
-        model = TabNetClassifier()
-        model.load_model(str(MODEL_DIR / "budget_overrun_tabnet_model.zip"))
-        
-        with open(MODEL_DIR / "budget_overrun_metadata.pkl", 'rb') as f:
-            metadata = pickle.load(f)
-        
-        return {'model': model, 'metadata': metadata}
+        registry = get_registry()
+        return {
+            'model': registry.load_tabnet("budget_overrun_tabnet_model.zip"),
+            'metadata': registry.load_pickle("budget_overrun_metadata.pkl")
+        }
     except Exception as e:
         raise Exception(f"Error loading budget model: {str(e)}")
 
@@ -208,15 +56,11 @@ def load_budget_model():
 def load_goal_model():
     """Load savings goal success prediction model"""
     try:
-        from pytorch_tabnet.tab_model import TabNetClassifier
-        
-        model = TabNetClassifier()
-        model.load_model(str(MODEL_DIR / "savings_goal_tabnet_model.zip"))
-        
-        with open(MODEL_DIR / "savings_goal_metadata.pkl", 'rb') as f:
-            metadata = pickle.load(f)
-        
-        return {'model': model, 'metadata': metadata}
+        registry = get_registry()
+        return {
+            'model': registry.load_tabnet("savings_goal_tabnet_model.zip"),
+            'metadata': registry.load_pickle("savings_goal_metadata.pkl")
+        }
     except Exception as e:
         raise Exception(f"Error loading goal model: {str(e)}")
 
@@ -224,23 +68,92 @@ def load_goal_model():
 def load_flagged_model():
     """Load flagged transaction detection model"""
     try:
-        device = torch.device('cpu')
-        
-        with open(MODEL_DIR / "flagged_transaction_preprocessing.pkl", 'rb') as f:
-            preprocessing = pickle.load(f)
-        
-        checkpoint = torch.load(MODEL_DIR / "flagged_transaction_dnn_model.pth", map_location=device)
-        model = DeepNeuralNetwork(checkpoint['input_dim'], checkpoint['num_classes'])
-        model.load_state_dict(checkpoint['model_state_dict'])
-        model.eval()
-        
-        return {'model': model, 'preprocessing': preprocessing, 'device': device}
+        registry = get_registry()
+        return {
+            'model': registry.load_torch("flagged_transaction_dnn_model.pth", DeepNeuralNetwork),
+            'preprocessing': registry.load_pickle("flagged_transaction_preprocessing.pkl"),
+            'pipeline': registry.load_feature_pipeline("flagged_transaction_preprocessing.pkl"),
+            'device': torch.device('cpu')
+        }
     except Exception as e:
         raise Exception(f"Error loading flagged model: {str(e)}")
 
 
 # ========== API ENDPOINTS ==========
 
+TRANSACTION_ARTIFACTS = [
+    "transaction_dnn_model.pth",
+    "transaction_resnet_model.pth",
+    "transaction_attention_model.pth",
+    "transaction_tabnet_model.zip",
+    "transaction_preprocessing.pkl",
+]
+FLAGGED_ARTIFACTS = ["flagged_transaction_dnn_model.pth", "flagged_transaction_preprocessing.pkl"]
+BUDGET_ARTIFACTS = ["budget_overrun_tabnet_model.zip", "budget_overrun_metadata.pkl"]
+GOAL_ARTIFACTS = ["savings_goal_tabnet_model.zip", "savings_goal_metadata.pkl"]
+
+
+def classify_transaction_matrix(models, X_final):
+    """Ensemble predictions for an (N, F) feature matrix, one result dict per row."""
+    label_encoder = models['preprocessing']['label_encoder']
+    names, votes = run_transaction_ensemble(models, X_final)
+    ensemble_pred, confidence = ensemble_vote(votes)
+
+    predicted_types = label_encoder.inverse_transform(ensemble_pred).tolist()
+    decoded_votes = {
+        name: label_encoder.inverse_transform(votes[i]).tolist()
+        for i, name in enumerate(names) if name in ('dnn', 'resnet', 'attention')
+    }
+
+    return [
+        {
+            'predicted_type': predicted_types[n],
+            'confidence': float(confidence[n]),
+            'model_votes': {name: decoded[n] for name, decoded in decoded_votes.items()}
+        }
+        for n in range(len(X_final))
+    ]
+
+
+def predict_transaction_rows(rows):
+    """
+    Predict transaction types for a list of payloads with one forward pass per model.
+
+    Rows whose preprocessed features were predicted recently are served from
+    the prediction cache; only the rest reach the models.
+    """
+    bundle = get_registry().bundle('transaction', load_transaction_models, TRANSACTION_ARTIFACTS)
+    models = bundle.obj
+    X_final = models['pipeline'].transform(rows)
+
+    cache = get_prediction_cache('transaction')
+    if cache is None:
+        return classify_transaction_matrix(models, X_final)
+    return cache.get_or_compute(
+        X_final, lambda X: classify_transaction_matrix(models, X), bundle.served_version
+    )
+
+
+def score_flagged_matrix(flagged_data, X_final):
+    """Flagged-transaction predictions for an (N, F) feature matrix, one result dict per row."""
+    X_tensor = torch.from_numpy(X_final).to(flagged_data['device'])
+
+    with torch.no_grad():
+        probabilities = torch.softmax(flagged_data['model'](X_tensor), dim=1).cpu().numpy()
+    predictions = probabilities.argmax(axis=1)
+
+    # Decode predictions
+    flagged = flagged_data['preprocessing']['label_encoder'].inverse_transform(predictions)
+    return [
+        {
+            'is_flagged': bool(flagged[n]),
+            'confidence': float(probabilities[n, predictions[n]]),
+            'risk_score': float(probabilities[n, 1]) if probabilities.shape[1] > 1 else 0.0
+        }
+        for n in range(len(X_final))
+    ]
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def predict_transaction_type(request):
@@ -257,71 +170,54 @@ def predict_transaction_type(request):
     }
     """
     try:
-        models = load_model_once('transaction', load_transaction_models)
-        
-        # Extract features from request
-        data = request.data
-        preprocessing = models['preprocessing']
-        
-        # Prepare feature vector
-        numeric_features = [data.get(f, 0) for f in preprocessing['numeric_features']]
-        
-        # Scale numeric features
-        X_numeric = np.array(numeric_features).reshape(1, -1)
-        X_scaled = preprocessing['scaler'].transform(X_numeric)
-        
-        # Encode categorical features if present
-        if preprocessing['cat_encoder'] is not None:
-            categorical_features = [data.get(f, 'missing') for f in preprocessing['categorical_features']]
-            X_cat = np.array(categorical_features).reshape(1, -1)
-            X_cat_encoded = preprocessing['cat_encoder'].transform(X_cat)
-            X_final = np.concatenate([X_scaled, X_cat_encoded], axis=1)
-        else:
-            X_final = X_scaled
-        
-        # Get predictions from all models
-        X_tensor = torch.FloatTensor(X_final).to(models['device'])
-        
-        predictions = []
-        with torch.no_grad():
-            # DNN prediction
-            dnn_output = models['dnn'](X_tensor)
-            dnn_pred = torch.argmax(dnn_output, dim=1).cpu().numpy()[0]
-            predictions.append(dnn_pred)
-            
-            # ResNet prediction
-            resnet_output = models['resnet'](X_tensor)
-            resnet_pred = torch.argmax(resnet_output, dim=1).cpu().numpy()[0]
-            predictions.append(resnet_pred)
-            
-            # Attention prediction
-            attention_output = models['attention'](X_tensor)
-            attention_pred = torch.argmax(attention_output, dim=1).cpu().numpy()[0]
-            predictions.append(attention_pred)
-            
-            # TabNet prediction if available
-            if models['tabnet'] is not None:
-                tabnet_pred = models['tabnet'].predict(X_final)[0]
-                predictions.append(tabnet_pred)
-        
-        # Ensemble voting
-        from collections import Counter
-        ensemble_pred = Counter(predictions).most_common(1)[0][0]
-        
-        # Decode prediction
-        predicted_type = preprocessing['label_encoder'].inverse_transform([ensemble_pred])[0]
+        result = predict_transaction_rows([request.data])[0]
+        return Response({'success': True, **result})
         
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def predict_transaction_type_batch(request):
+    """
+    Predict transaction types for many transactions in one request
+    
+    Request body:
+    {
+        "transactions": [
+            {"amount": 150.00, "category": "Food", "payment_method": "card", ...},
+            {"amount": 2400.00, "category": "Salary", "payment_method": "bank_transfer", ...}
+        ]
+    }
+    
+    Each entry in "predictions" matches the response of predict/transaction/.
+    """
+    rows = request.data.get('transactions') if isinstance(request.data, dict) else request.data
+    max_rows = getattr(settings, 'AI_BATCH_MAX_ROWS', 5000)
+
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        return Response({
+            'success': False,
+            'error': 'transactions must be a non-empty list of objects'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(rows) > max_rows:
+        return Response({
+            'success': False,
+            'error': f'At most {max_rows} transactions can be predicted per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        predictions = predict_transaction_rows(rows)
         return Response({
             'success': True,
-            'predicted_type': predicted_type,
-            'confidence': float(len([p for p in predictions if p == ensemble_pred]) / len(predictions)),
-            'model_votes': {
-                'dnn': preprocessing['label_encoder'].inverse_transform([predictions[0]])[0],
-                'resnet': preprocessing['label_encoder'].inverse_transform([predictions[1]])[0],
-                'attention': preprocessing['label_encoder'].inverse_transform([predictions[2]])[0]
-            }
+            'count': len(predictions),
+            'predictions': predictions
         })
-        
+
     except Exception as e:
         return Response({
             'success': False,
@@ -346,7 +242,7 @@ def predict_budget_risk(request):
     }
     """
     try:
-        budget_data = load_model_once('budget', load_budget_model)
+        budget_data = load_model_once('budget', load_budget_model, BUDGET_ARTIFACTS)
         model = budget_data['model']
         metadata = budget_data['metadata']
         
@@ -429,7 +325,7 @@ def predict_goal_success(request):
     }
     """
     try:
-        goal_data = load_model_once('goal', load_goal_model)
+        goal_data = load_model_once('goal', load_goal_model, GOAL_ARTIFACTS)
         model = goal_data['model']
         metadata = goal_data['metadata']
         
@@ -506,46 +402,22 @@ def predict_flagged_transaction(request):
     Request body: Same as predict_transaction_type
     """
     try:
-        flagged_data = load_model_once('flagged', load_flagged_model)
-        model = flagged_data['model']
-        preprocessing = flagged_data['preprocessing']
-        device = flagged_data['device']
+        bundle = get_registry().bundle('flagged', load_flagged_model, FLAGGED_ARTIFACTS)
+        flagged_data = bundle.obj
         
         # Extract features
-        data = request.data
-        numeric_features = [data.get(f, 0) for f in preprocessing['numeric_features']]
-        
-        # Scale numeric features
-        X_numeric = np.array(numeric_features).reshape(1, -1)
-        X_scaled = preprocessing['scaler'].transform(X_numeric)
+        X_final = flagged_data['pipeline'].transform([request.data])
         
-        # Encode categorical features if present
-        if preprocessing['cat_encoder'] is not None:
-            categorical_features = [data.get(f, 'missing') for f in preprocessing['categorical_features']]
-            X_cat = np.array(categorical_features).reshape(1, -1)
-            X_cat_encoded = preprocessing['cat_encoder'].transform(X_cat)
-            X_final = np.concatenate([X_scaled, X_cat_encoded], axis=1)
+        # Make prediction (or reuse a cached one for identical features)
+        cache = get_prediction_cache('flagged')
+        if cache is None:
+            result = score_flagged_matrix(flagged_data, X_final)[0]
         else:
-            X_final = X_scaled
-        
-        # Make prediction
-        X_tensor = torch.FloatTensor(X_final).to(device)
+            result = cache.get_or_compute(
+                X_final, lambda X: score_flagged_matrix(flagged_data, X), bundle.served_version
+            )[0]
         
-        with torch.no_grad():
-            output = model(X_tensor)
-            probabilities = torch.softmax(output, dim=1)
-            prediction = torch.argmax(output, dim=1).cpu().numpy()[0]
-            confidence = probabilities[0][prediction].item()
-        
-        # Decode prediction
-        is_flagged = bool(preprocessing['label_encoder'].inverse_transform([prediction])[0])
-        
-        return Response({
-            'success': True,
-            'is_flagged': is_flagged,
-            'confidence': float(confidence),
-            'risk_score': float(probabilities[0][1].item()) if len(probabilities[0]) > 1 else 0.0
-        })
+        return Response({'success': True, **result})
         
     except Exception as e:
         return Response({
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bank_accounts.scheduler import build_auto_sync_scheduler
+from utils.plaid_service import plaid_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep Plaid-linked bank accounts with auto_sync_enabled synced: every "
+        "account whose last_sync is older than its interval is synced on a bounded "
+        "thread pool, with per-institution limits and backoff on errors. "
+        "Set PLAID_HOST to run against a local fake Plaid server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Sync the accounts due now and exit')
+        parser.add_argument('--workers', type=int, help='Concurrent syncs (default PLAID_AUTO_SYNC_WORKERS)')
+        parser.add_argument('--per-institution', type=int,
+                            help='Concurrent syncs per institution (default PLAID_AUTO_SYNC_PER_INSTITUTION)')
+        parser.add_argument('--report-every', type=float, default=60, help='Seconds between stats lines')
+
+    def handle(self, *args, **options):
+        # Observers are subscribed when the app signal modules are imported
+        import utils.signals  # noqa: F401
+        import transactions.signals  # noqa: F401
+
+        overrides = {}
+        if options['workers']:
+            overrides['workers'] = options['workers']
+        if options['per_institution']:
+            overrides['per_institution'] = options['per_institution']
+        scheduler = build_auto_sync_scheduler(**overrides)
+
+        if options['once']:
+            attempted = scheduler.drain()
+            scheduler.stop()
+            self.stdout.write(self.style.SUCCESS(f"Attempted {attempted} account sync(s)"))
+            self.stdout.write(str({**scheduler.stats(), 'plaid': plaid_metrics()}))
+            return
+
+        scheduler.start()
+        self.stdout.write(
+            f"Auto-syncing with {scheduler.workers} worker(s), "
+            f"{scheduler.per_institution} per institution; Ctrl+C to stop"
+        )
+        try:
+            while True:
+                time.sleep(options['report_every'])
+                self.stdout.write(str({**scheduler.stats(), 'plaid': plaid_metrics()}))
+        except KeyboardInterrupt:
+            scheduler.stop(timeout=30)
@@ -19,6 +19,8 @@ class BankAccount(models.Model):
     plaid_cursor = models.TextField(blank=True, null=True)  # For incremental sync
     last_sync = models.DateTimeField(blank=True, null=True)
     auto_sync_enabled = models.BooleanField(default=True)
+    # Minutes between automatic syncs; null uses PLAID_AUTO_SYNC_INTERVAL_MINUTES
+    auto_sync_interval_minutes = models.PositiveIntegerField(blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
 
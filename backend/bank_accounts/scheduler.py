@@ -0,0 +1,282 @@
+"""
+Automatic Plaid sync for linked bank accounts.
+
+AutoSyncScheduler polls for accounts with auto_sync_enabled whose last_sync
+is older than their interval (auto_sync_interval_minutes, or the
+PLAID_AUTO_SYNC_INTERVAL_MINUTES default) and runs sync_bank_account() for
+them on a bounded thread pool, with at most `per_institution` syncs against
+one institution at a time. Due accounts of recently active users (latest
+manual transaction) go first, then the longest-waiting ones.
+
+A failed sync is retried after an exponential, jittered backoff that resets
+on the next success. Backoff state lives in the scheduler process, so run a
+single scheduler (`python manage.py run_auto_sync`).
+"""
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Lags kept for the stats() distribution
+LAG_SAMPLES = 1000
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AutoSyncScheduler:
+    """Bounded, institution-aware pool that keeps bank accounts synced."""
+
+    def __init__(self, workers=4, per_institution=2, interval_minutes=360, poll_interval=30.0,
+                 backoff_base=60.0, backoff_max=21600.0, sync=None):
+        """
+        Args:
+            workers: Accounts synced concurrently
+            per_institution: Concurrent syncs against one institution
+            interval_minutes: Default minutes between syncs of an account
+            poll_interval: Seconds between looks for due accounts
+            backoff_base: Seconds before the first retry of a failed account
+            backoff_max: Upper bound on the retry delay
+            sync: Callable syncing one BankAccount (default sync_bank_account)
+        """
+        if sync is None:
+            from bank_accounts.sync import sync_bank_account as sync
+        self.workers = workers
+        self.per_institution = per_institution
+        self.interval = timedelta(minutes=interval_minutes)
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sync = sync
+
+        self._executor = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._institutions = defaultdict(lambda: threading.BoundedSemaphore(per_institution))
+        self._in_flight = {}
+        self._backoff = {}
+
+        self.started_at = time.monotonic()
+        self.synced = 0
+        self.failed = 0
+        self._recent = deque()
+        self._lags = deque(maxlen=LAG_SAMPLES)
+
+    # ---- selection -------------------------------------------------------
+
+    def interval_for(self, account) -> timedelta:
+        if account.auto_sync_interval_minutes:
+            return timedelta(minutes=account.auto_sync_interval_minutes)
+        return self.interval
+
+    def due_accounts(self, now=None) -> List:
+        """
+        Accounts to sync now, highest priority first.
+
+        Skips accounts already syncing and accounts backing off after a
+        failure. Each account gets a due_at attribute (when it became due).
+        """
+        from bank_accounts.models import BankAccount
+        from transactions.models import Transaction
+
+        now = now or timezone.now()
+        last_active = Transaction.objects.filter(
+            user_id=OuterRef('user_id'), source='MANUAL'
+        ).order_by('-date', '-created_at').values('date')[:1]
+        candidates = BankAccount.objects.filter(
+            auto_sync_enabled=True, plaid_access_token__isnull=False
+        ).filter(
+            # Custom intervals are checked below; the rest can be filtered here
+            Q(last_sync__isnull=True) | Q(auto_sync_interval_minutes__isnull=False)
+            | Q(last_sync__lte=now - self.interval)
+        ).select_related('user').annotate(
+            last_active=Subquery(last_active)
+        ).order_by(F('last_active').desc(nulls_last=True), F('last_sync').asc(nulls_first=True))
+
+        with self._lock:
+            busy = set(self._in_flight)
+            backing_off = {pk for pk, (_, retry_at) in self._backoff.items() if retry_at > now}
+
+        due = []
+        for account in candidates:
+            if account.id in busy or account.id in backing_off:
+                continue
+            account.due_at = account.last_sync + self.interval_for(account) if account.last_sync else account.created_at
+            if account.due_at <= now:
+                due.append(account)
+        return due
+
+    # ---- dispatching -----------------------------------------------------
+
+    def tick(self, now=None) -> List:
+        """Start syncs for the due accounts that fit in the free slots; returns those started."""
+        return self._start(self.due_accounts(now))
+
+    def _start(self, accounts) -> List:
+        """Submit accounts in order while worker and institution slots are free."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='auto-sync')
+        started = []
+        for account in accounts:
+            if not self._slots.acquire(blocking=False):
+                break
+            with self._lock:
+                institution = self._institutions[account.institution_name or '']
+            if not institution.acquire(blocking=False):
+                # Institution saturated; later accounts may use other institutions
+                self._slots.release()
+                continue
+            with self._lock:
+                self._in_flight[account.id] = account
+            self._executor.submit(self._run_sync, account, institution)
+            started.append(account)
+        return started
+
+    def _run_sync(self, account, institution) -> bool:
+        lag = (timezone.now() - account.due_at).total_seconds()
+        try:
+            self.sync(account)
+        except Exception as e:
+            delay = self._record_failure(account, lag)
+            logger.warning(f"Auto-sync of bank account {account.id} failed, retrying in {delay:.0f}s: {e}")
+            return False
+        else:
+            self._record_success(account, lag)
+            return True
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._in_flight.pop(account.id, None)
+            institution.release()
+            self._slots.release()
+            # A slot is free: look for more due accounts now
+            self._wake.set()
+
+    def backoff_delay(self, failures: int) -> float:
+        """Seconds to wait after the nth consecutive failure (equal jitter)."""
+        capped = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+        return capped / 2 + random.uniform(0, capped / 2)
+
+    def _record_failure(self, account, lag) -> float:
+        with self._lock:
+            failures = self._backoff.get(account.id, (0, None))[0] + 1
+            delay = self.backoff_delay(failures)
+            self._backoff[account.id] = (failures, timezone.now() + timedelta(seconds=delay))
+            self.failed += 1
+            self._lags.append(lag)
+        return delay
+
+    def _record_success(self, account, lag) -> None:
+        with self._lock:
+            self._backoff.pop(account.id, None)
+            self.synced += 1
+            self._recent.append(time.monotonic())
+            self._lags.append(lag)
+
+    def drain(self) -> int:
+        """
+        Sync the accounts due now, each once, and wait for them.
+
+        Used by run_auto_sync --once and tests; returns the number attempted.
+        """
+        pending = self.due_accounts()
+        attempted = len(pending)
+        while True:
+            started = {account.id for account in self._start(pending)}
+            pending = [account for account in pending if account.id not in started]
+            with self._lock:
+                busy = bool(self._in_flight)
+            if not pending and not busy:
+                return attempted
+            # Until a running sync frees a slot
+            self._wake.wait(0.05)
+            self._wake.clear()
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self) -> None:
+        """Poll for due accounts in a background thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='auto-sync-scheduler', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Auto-sync scheduler error: {e}")
+            finally:
+                close_old_connections()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def stop(self, timeout=None) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ---- metrics ---------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Throughput over the last minute, sync lag percentiles and failure rate."""
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0] < now - 60:
+                self._recent.popleft()
+            window = min(60.0, max(now - self.started_at, 1e-9))
+            lags = sorted(self._lags)
+            attempts = self.synced + self.failed
+            return {
+                'in_flight': len(self._in_flight),
+                'backing_off': len(self._backoff),
+                'synced': self.synced,
+                'failed': self.failed,
+                'failure_rate': round(self.failed / attempts, 4) if attempts else 0.0,
+                'synced_per_minute': round(len(self._recent) * 60 / window, 1),
+                'lag_seconds': {
+                    'p50': round(_percentile(lags, 0.50), 1),
+                    'p90': round(_percentile(lags, 0.90), 1),
+                    'p99': round(_percentile(lags, 0.99), 1),
+                    'max': round(lags[-1], 1) if lags else 0.0,
+                },
+            }
+
+
+def build_auto_sync_scheduler(**overrides) -> AutoSyncScheduler:
+    """AutoSyncScheduler configured from the PLAID_AUTO_SYNC_* settings."""
+    options = {
+        'workers': getattr(settings, 'PLAID_AUTO_SYNC_WORKERS', 4),
+        'per_institution': getattr(settings, 'PLAID_AUTO_SYNC_PER_INSTITUTION', 2),
+        'interval_minutes': getattr(settings, 'PLAID_AUTO_SYNC_INTERVAL_MINUTES', 360),
+        'poll_interval': getattr(settings, 'PLAID_AUTO_SYNC_POLL_SECONDS', 30.0),
+        'backoff_base': getattr(settings, 'PLAID_AUTO_SYNC_BACKOFF_SECONDS', 60.0),
+        'backoff_max': getattr(settings, 'PLAID_AUTO_SYNC_BACKOFF_MAX_SECONDS', 21600.0),
+    }
+    options.update(overrides)
+    return AutoSyncScheduler(**options)
@@ -0,0 +1,290 @@
+"""
+Set-based Plaid transaction sync.
+
+One /transactions/sync response is applied with a fixed number of queries
+per PLAID_SYNC_CHUNK_SIZE rows instead of several per transaction:
+
+- categories named by the added rows are looked up in one query and the
+  missing ones created with one bulk_create;
+- added and modified rows are matched to stored transactions by
+  plaid_transaction_id with one IN query per chunk, then written with
+  bulk_create (new) and bulk_update (known);
+- removed ids are deleted with one IN delete per chunk.
+
+bulk_create and bulk_update do not send post_save, so the spending
+aggregates and the fraud velocity counters are updated here, and one
+transactions_synced event per page replaces the per-row transaction_created
+events.
+sync_bank_account() follows has_more through every page, committing each
+page together with the cursor after it, so a failed sync resumes from the
+last committed page.
+"""
+import queue
+import threading
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from budgets.aggregates import apply_spending_deltas, batch_spending_changes, spending_deltas, spending_state
+from categories.models import Category
+from transactions.models import Transaction
+from utils.plaid_service import iter_sync_pages
+from utils.velocity import get_velocity_tracker
+
+SYNCED_EVENT = 'transactions_synced'
+# Plaid error code asking to restart pagination from the update's first cursor
+MUTATION_DURING_PAGINATION = 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION'
+
+# Fields an "added" row sets on a transaction Plaid already sent us, and the
+# narrower set a "modified" row may change
+ADDED_FIELDS = ('user', 'bank_account', 'amount', 'type', 'description', 'date', 'category')
+MODIFIED_FIELDS = ('amount', 'description', 'date')
+
+
+@dataclass
+class SyncResult:
+    """Ids of the transactions a sync created, updated and removed."""
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def synced_count(self) -> int:
+        return len(self.created) + len(self.updated)
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _by_plaid_id(rows) -> Dict[str, Dict[str, Any]]:
+    """Rows keyed by plaid_transaction_id; a later duplicate replaces an earlier one."""
+    return {row['plaid_transaction_id']: row for row in rows or [] if row.get('plaid_transaction_id')}
+
+
+def resolve_categories(user, rows: Iterable[Dict[str, Any]]) -> Dict[str, bytes]:
+    """
+    Map the category names used by rows to the user's category ids, creating
+    the missing categories (typed after the first row naming them).
+    """
+    wanted = {}
+    for row in rows:
+        if row.get('category'):
+            wanted.setdefault(row['category'], row['type'])
+    if not wanted:
+        return {}
+
+    def lookup(names):
+        found = {}
+        for category_id, name, category_type in Category.objects.filter(
+            user=user, name__in=names
+        ).values_list('id', 'name', 'type'):
+            # Prefer the category of the row's type when the user has both
+            if name not in found or category_type == wanted.get(name):
+                found[name] = bytes(category_id)
+        return found
+
+    categories = lookup(list(wanted))
+    missing = [name for name in wanted if name not in categories]
+    if missing:
+        # ignore_conflicts: a concurrent sync may have created some of them
+        Category.objects.bulk_create([
+            Category(id=uuid.uuid4().bytes, user=user, name=name, type=wanted[name])
+            for name in missing
+        ], ignore_conflicts=True)
+        categories.update(lookup(missing))
+    return categories
+
+
+def _row_values(row, bank_account, categories) -> Dict[str, Any]:
+    """Model field values for an added row."""
+    return {
+        'user_id': bank_account.user_id,
+        'bank_account_id': bank_account.id,
+        'amount': Decimal(str(row['amount'])),
+        'type': row['type'],
+        'description': row['description'],
+        'date': Transaction._meta.get_field('date').to_python(row['date']),
+        'category_id': categories.get(row['category']) if row.get('category') else None,
+    }
+
+
+def _stored(plaid_ids) -> Dict[str, Transaction]:
+    return {tx.plaid_transaction_id: tx for tx in Transaction.objects.filter(plaid_transaction_id__in=plaid_ids)}
+
+
+def apply_sync(bank_account, sync_data: Dict[str, Any], chunk_size: int = None, dispatcher=None) -> SyncResult:
+    """
+    Write one sync_transactions() response for bank_account.
+
+    Raises one transactions_synced event carrying the created, updated and
+    removed transaction ids when anything changed.
+    """
+    if dispatcher is None:
+        from utils.signals import dispatcher
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'PLAID_SYNC_CHUNK_SIZE', 1000)
+
+    added = _by_plaid_id(sync_data.get('added'))
+    modified = _by_plaid_id(sync_data.get('modified'))
+    removed = [plaid_id for plaid_id in sync_data.get('removed') or [] if plaid_id]
+    result = SyncResult(next_cursor=sync_data.get('next_cursor'))
+    created, updated = [], []
+    old_states, new_states = [], []
+
+    with db_transaction.atomic():
+        categories = resolve_categories(bank_account.user, added.values())
+
+        for chunk in _chunks(list(added.values()), chunk_size):
+            stored = _stored([row['plaid_transaction_id'] for row in chunk])
+            new_rows, known_rows = [], []
+            for row in chunk:
+                values = _row_values(row, bank_account, categories)
+                tx = stored.get(row['plaid_transaction_id'])
+                if tx is None:
+                    new_rows.append(Transaction(id=uuid.uuid4(), plaid_transaction_id=row['plaid_transaction_id'], **values))
+                    continue
+                old_states.append(spending_state(tx))
+                for name, value in values.items():
+                    setattr(tx, name, value)
+                new_states.append(spending_state(tx))
+                known_rows.append(tx)
+            Transaction.objects.bulk_create(new_rows)
+            Transaction.objects.bulk_update(known_rows, ADDED_FIELDS)
+            created.extend(new_rows)
+            new_states.extend(spending_state(tx) for tx in new_rows)
+            updated.extend(str(tx.id) for tx in known_rows)
+
+        # After the added rows, so an id added and modified in one response
+        # is found; ids we never stored are ignored
+        for chunk in _chunks(list(modified.values()), chunk_size):
+            stored = _stored([row['plaid_transaction_id'] for row in chunk])
+            known_rows = []
+            for row in chunk:
+                tx = stored.get(row['plaid_transaction_id'])
+                if tx is None:
+                    continue
+                old_states.append(spending_state(tx))
+                tx.amount = Decimal(str(row['amount']))
+                tx.description = row['description']
+                tx.date = Transaction._meta.get_field('date').to_python(row['date'])
+                new_states.append(spending_state(tx))
+                known_rows.append(tx)
+            Transaction.objects.bulk_update(known_rows, MODIFIED_FIELDS)
+            updated.extend(str(tx.id) for tx in known_rows)
+
+        # bulk_create/bulk_update skip post_save, so update spending_aggregate
+        # and the velocity counters here
+        apply_spending_deltas(spending_deltas(old_states, new_states))
+        get_velocity_tracker().record(created)
+
+        # QuerySet.delete() still sends post_delete per row; batch the
+        # spending changes those receivers record
+        with batch_spending_changes():
+            for chunk in _chunks(removed, chunk_size):
+                doomed = Transaction.objects.filter(plaid_transaction_id__in=chunk)
+                result.removed.extend(str(pk) for pk in doomed.values_list('id', flat=True))
+                doomed.delete()
+
+        gone = set(result.removed)
+        result.created = [str(tx.id) for tx in created if str(tx.id) not in gone]
+        result.updated = [pk for pk in dict.fromkeys(updated) if pk not in gone and pk not in result.created]
+        if result.created or result.updated or result.removed:
+            dispatcher.dispatch(SYNCED_EVENT, {
+                'user_ids': [str(bank_account.user_id)],
+                'bank_account_id': str(bank_account.id),
+                'transaction_ids': result.created,
+                'updated_ids': result.updated,
+                'removed_ids': result.removed,
+            })
+    return result
+
+
+def prefetch(items: Iterable, depth: int) -> Iterator:
+    """
+    Iterate items from a background thread, buffering at most depth of them.
+
+    Lets the next Plaid page download while the current one is written. The
+    producer only does network I/O; database work stays on the caller's
+    thread and connection. Errors raised by items are re-raised to the
+    caller, and the producer stops when the caller stops iterating.
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((True, item)):
+                    return
+        except BaseException as e:
+            put((False, e))
+            return
+        put((False, None))
+
+    producer = threading.Thread(target=produce, name='plaid-sync-prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            ok, item = buffer.get()
+            if not ok:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def sync_bank_account(bank_account) -> SyncResult:
+    """
+    Fetch every page of the account's changes since its cursor and apply them.
+
+    Pages are downloaded ahead of the writer through a PLAID_SYNC_PREFETCH_PAGES
+    deep buffer. Each page and the cursor that follows it commit together, so
+    a sync that fails part way keeps the pages already written and the next
+    sync resumes after them.
+    """
+    access_token = bank_account.decrypt_plaid_token()
+    if not access_token:
+        raise Exception('No Plaid access token found')
+
+    start_cursor = bank_account.plaid_cursor
+    total = SyncResult(next_cursor=start_cursor)
+    pages = iter_sync_pages(access_token, cursor=start_cursor)
+    try:
+        for page in prefetch(pages, getattr(settings, 'PLAID_SYNC_PREFETCH_PAGES', 2)):
+            with db_transaction.atomic():
+                result = apply_sync(bank_account, page)
+                bank_account.plaid_cursor = result.next_cursor
+                bank_account.last_sync = timezone.now()
+                bank_account.save(update_fields=['plaid_cursor', 'last_sync'])
+            total.created.extend(result.created)
+            total.updated.extend(result.updated)
+            total.removed.extend(result.removed)
+            total.next_cursor = result.next_cursor
+    except Exception as e:
+        if MUTATION_DURING_PAGINATION in str(e):
+            # Plaid wants the whole update fetched again; replaying the pages
+            # already written is harmless since rows are upserted by Plaid id
+            bank_account.plaid_cursor = start_cursor
+            bank_account.save(update_fields=['plaid_cursor'])
+        raise
+    return total
@@ -2,16 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.utils import timezone
 from datetime import timedelta
 from .models import BankAccount
 from .serializers import BankAccountSerializer
-from transactions.models import Transaction
-from categories.models import Category
+from .sync import sync_bank_account
 from utils.plaid_service import (
     create_link_token,
     exchange_public_token,
-    sync_transactions,
     get_account_info
 )
 import logging
@@ -131,55 +128,4 @@ class BankAccountViewSet(viewsets.ModelViewSet):
 
     def perform_transaction_sync(self, bank_account):
         """Internal method to perform transaction sync for a bank account."""
-        access_token = bank_account.decrypt_plaid_token()
-        if not access_token:
-            raise Exception('No Plaid access token found')
-        
-        sync_data = sync_transactions(access_token, cursor=bank_account.plaid_cursor)
-        synced_count = 0
-        
-        for txn_data in sync_data['added']:
-            category = None
-            if txn_data.get('category'):
-                category, _ = Category.objects.get_or_create(
-                    user=bank_account.user,
-                    name=txn_data['category'],
-                    defaults={'type': txn_data['type']}
-                )
-            
-            Transaction.objects.update_or_create(
-                plaid_transaction_id=txn_data['plaid_transaction_id'],
-                defaults={
-                    'user': bank_account.user,
-                    'bank_account': bank_account,
-                    'amount': txn_data['amount'],
-                    'type': txn_data['type'],
-                    'description': txn_data['description'],
-                    'date': txn_data['date'],
-                    'category': category,
-                }
-            )
-            synced_count += 1
-        
-        for txn_data in sync_data['modified']:
-            try:
-                transaction = Transaction.objects.get(
-                    plaid_transaction_id=txn_data['plaid_transaction_id']
-                )
-                transaction.amount = txn_data['amount']
-                transaction.description = txn_data['description']
-                transaction.date = txn_data['date']
-                transaction.save()
-                synced_count += 1
-            except Transaction.DoesNotExist:
-                pass
-        
-        for txn_id in sync_data['removed']:
-            Transaction.objects.filter(plaid_transaction_id=txn_id).delete()
-        
-        bank_account.plaid_cursor = sync_data['next_cursor']
-        bank_account.last_sync = timezone.now()
-        bank_account.save()
-        
-        return synced_count
-
+        return sync_bank_account(bank_account).synced_count
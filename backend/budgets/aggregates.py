@@ -0,0 +1,258 @@
+"""
+Incremental spending totals for budget checks.
+
+Every EXPENSE transaction with a category contributes its amount to one
+SpendingAggregate row per period type: the week (starting Monday) and the
+month containing its date. Inserts, updates and deletes apply the difference
+between the old and new contributions with F() updates in the caller's
+database transaction, so a budget check is a single-row lookup.
+
+The totals cover the whole period, including transactions dated later in the
+period than today. find_spending_drift() compares the table against a
+GROUP BY over transactions; reconcile_spending_aggregates() repairs it (see
+`python manage.py reconcile_spending_aggregates`).
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+PERIOD_TYPES = ('WEEKLY', 'MONTHLY')
+ZERO = Decimal('0.00')
+
+_batch = threading.local()
+
+
+def period_start(day, period_type):
+    """First day of the WEEKLY (Monday-based) or MONTHLY period containing day."""
+    if period_type == 'MONTHLY':
+        return date(day.year, day.month, 1)
+    return day - timedelta(days=day.weekday())
+
+
+def spending_state(tx):
+    """
+    (user_id, category_id, date, amount) a transaction contributes, or None.
+
+    Accepts a Transaction or a dict of its field values; values assigned but
+    not yet normalised (e.g. a date string from Plaid) are converted the way
+    the model fields would convert them.
+    """
+    from transactions.models import Transaction
+
+    get = tx.get if isinstance(tx, dict) else lambda name: getattr(tx, name)
+    if get('type') != 'EXPENSE' or not get('category_id'):
+        return None
+    fields = Transaction._meta
+    return (
+        get('user_id'),
+        bytes(get('category_id')),
+        fields.get_field('date').to_python(get('date')),
+        fields.get_field('amount').to_python(get('amount')),
+    )
+
+
+def spending_deltas(old_states=(), new_states=()):
+    """Per-aggregate (total, count) changes for replacing old_states with new_states."""
+    deltas = defaultdict(lambda: [ZERO, 0])
+    for sign, states in ((-1, old_states), (1, new_states)):
+        for state in states:
+            if state is None:
+                continue
+            user_id, category_id, day, amount = state
+            for period_type in PERIOD_TYPES:
+                delta = deltas[(user_id, category_id, period_type, period_start(day, period_type))]
+                delta[0] += sign * amount
+                delta[1] += sign
+    return {key: tuple(delta) for key, delta in deltas.items() if delta[0] or delta[1]}
+
+
+def _aggregate_filter(key):
+    user_id, category_id, period_type, start = key
+    return {'user_id': user_id, 'category_id': category_id, 'period_type': period_type, 'period_start': start}
+
+
+def apply_spending_deltas(deltas):
+    """Add deltas to their aggregate rows, creating the rows that new spending needs."""
+    from budgets.models import SpendingAggregate
+
+    if not deltas:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        for key, (amount, count) in deltas.items():
+            lookup = _aggregate_filter(key)
+            increment = {
+                'total': F('total') + amount,
+                'transaction_count': F('transaction_count') + count,
+                'updated_at': now,
+            }
+            if SpendingAggregate.objects.filter(**lookup).update(**increment):
+                continue
+            if count <= 0:
+                # Nothing to subtract from: the row went with a cascading
+                # user/category delete, or already drifted (reconcile fixes it)
+                continue
+            try:
+                with transaction.atomic():
+                    SpendingAggregate.objects.create(**lookup, total=amount, transaction_count=count)
+            except IntegrityError:
+                # Another writer created the row between our UPDATE and INSERT
+                SpendingAggregate.objects.filter(**lookup).update(**increment)
+
+
+def record_transaction_change(old_state, new_state):
+    """Apply one transaction's insert (old None), update, or delete (new None)."""
+    if old_state == new_state:
+        return
+    pending = getattr(_batch, 'changes', None)
+    if pending is not None:
+        pending[0].append(old_state)
+        pending[1].append(new_state)
+        return
+    apply_spending_deltas(spending_deltas([old_state], [new_state]))
+
+
+@contextmanager
+def batch_spending_changes():
+    """
+    Collect the changes recorded in this thread inside the block and apply
+    them on exit with one update per affected aggregate.
+
+    For bulk operations that still send per-row signals, such as
+    QuerySet.delete(). Nested blocks join the outermost one.
+    """
+    if getattr(_batch, 'changes', None) is not None:
+        yield
+        return
+    _batch.changes = ([], [])
+    try:
+        yield
+        old_states, new_states = _batch.changes
+    finally:
+        _batch.changes = None
+    apply_spending_deltas(spending_deltas(old_states, new_states))
+
+
+def spent_amounts(pairs, period_type, day=None):
+    """{(user_id, category_id): spent} for the period containing day, in one query."""
+    from budgets.models import SpendingAggregate
+
+    pairs = {(user_id, bytes(category_id)) for user_id, category_id in pairs}
+    if not pairs:
+        return {}
+    start = period_start(day or date.today(), period_type)
+    rows = SpendingAggregate.objects.filter(
+        user_id__in={user_id for user_id, _ in pairs},
+        category_id__in={category_id for _, category_id in pairs},
+        period_type=period_type,
+        period_start=start,
+    ).values_list('user_id', 'category_id', 'total')
+    spent = {pair: ZERO for pair in pairs}
+    for user_id, category_id, total in rows:
+        pair = (user_id, bytes(category_id))
+        if pair in spent:
+            spent[pair] = abs(total)
+    return spent
+
+
+def spent_amount(user_id, category_id, period_type, day=None):
+    """Spending of one user and category in the period containing day."""
+    return spent_amounts({(user_id, category_id)}, period_type, day).get((user_id, bytes(category_id)), ZERO)
+
+
+def expected_aggregates(user_id=None):
+    """Aggregate values recomputed from the transactions table: {key: (total, count)}."""
+    from transactions.models import Transaction
+
+    expenses = Transaction.objects.filter(type='EXPENSE', category__isnull=False)
+    if user_id is not None:
+        expenses = expenses.filter(user_id=user_id)
+    expected = {}
+    for period_type, trunc in (('WEEKLY', TruncWeek('date')), ('MONTHLY', TruncMonth('date'))):
+        rows = expenses.annotate(start=trunc).values('user_id', 'category_id', 'start').annotate(
+            total=Sum('amount'), count=Count('id')
+        ).order_by()
+        for row in rows:
+            key = (row['user_id'], bytes(row['category_id']), period_type, row['start'])
+            expected[key] = (row['total'], row['count'])
+    return expected
+
+
+def _stored_aggregates(user_id=None):
+    from budgets.models import SpendingAggregate
+
+    stored = SpendingAggregate.objects.all()
+    if user_id is not None:
+        stored = stored.filter(user_id=user_id)
+    return {
+        (row[0], bytes(row[1]), row[2], row[3]): (row[4], row[5])
+        for row in stored.values_list(
+            'user_id', 'category_id', 'period_type', 'period_start', 'total', 'transaction_count'
+        )
+    }
+
+
+def find_spending_drift(user_id=None):
+    """
+    Aggregates whose stored values differ from the transactions table.
+
+    Returns dicts with the key fields plus stored_total/expected_total and
+    stored_count/expected_count; a missing row counts as zero.
+    """
+    expected = expected_aggregates(user_id)
+    stored = _stored_aggregates(user_id)
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: (str(k[0]), k[1], k[2], k[3])):
+        expected_total, expected_count = expected.get(key, (ZERO, 0))
+        stored_total, stored_count = stored.get(key, (ZERO, 0))
+        if expected_total != stored_total or expected_count != stored_count:
+            drift.append({
+                **_aggregate_filter(key),
+                'stored_total': stored_total,
+                'expected_total': expected_total,
+                'stored_count': stored_count,
+                'expected_count': expected_count,
+            })
+    return drift
+
+
+def reconcile_spending_aggregates(user_id=None, rebuild=False):
+    """
+    Make spending_aggregate match the transactions table; returns rows written.
+
+    By default only drifted rows are rewritten. With rebuild the table (or the
+    user's part of it) is emptied and recomputed from scratch.
+    """
+    from budgets.models import SpendingAggregate
+
+    with transaction.atomic():
+        if rebuild:
+            stored = SpendingAggregate.objects.all()
+            if user_id is not None:
+                stored = stored.filter(user_id=user_id)
+            stored.delete()
+            rows = [
+                SpendingAggregate(**_aggregate_filter(key), total=total, transaction_count=count)
+                for key, (total, count) in expected_aggregates(user_id).items()
+            ]
+            SpendingAggregate.objects.bulk_create(rows, batch_size=1000)
+            return len(rows)
+
+        drift = find_spending_drift(user_id)
+        for row in drift:
+            lookup = {name: row[name] for name in ('user_id', 'category_id', 'period_type', 'period_start')}
+            if not row['expected_count']:
+                SpendingAggregate.objects.filter(**lookup).delete()
+                continue
+            SpendingAggregate.objects.update_or_create(**lookup, defaults={
+                'total': row['expected_total'],
+                'transaction_count': row['expected_count'],
+            })
+        return len(drift)
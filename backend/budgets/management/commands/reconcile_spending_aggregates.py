@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from budgets.aggregates import find_spending_drift, reconcile_spending_aggregates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the spending_aggregate table with the transactions it summarises "
+        "and repair drifted rows. Use --check to only report drift (exits non-zero "
+        "if any is found) and --rebuild to recompute the whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Report drift without writing')
+        parser.add_argument('--rebuild', action='store_true', help='Delete and recompute every aggregate')
+        parser.add_argument('--user', help='Limit to one user id')
+
+    def handle(self, *args, **options):
+        user_id = options['user']
+
+        if options['rebuild']:
+            written = reconcile_spending_aggregates(user_id, rebuild=True)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} spending aggregate(s)"))
+            return
+
+        drift = find_spending_drift(user_id)
+        for row in drift[:50]:
+            self.stdout.write(
+                f"{row['user_id']} {row['category_id'].hex()} {row['period_type']} {row['period_start']}: "
+                f"stored {row['stored_total']} ({row['stored_count']}) "
+                f"expected {row['expected_total']} ({row['expected_count']})"
+            )
+        if len(drift) > 50:
+            self.stdout.write(f"... and {len(drift) - 50} more")
+
+        if options['check']:
+            if drift:
+                raise CommandError(f"{len(drift)} spending aggregate(s) drifted")
+            self.stdout.write(self.style.SUCCESS("Spending aggregates are consistent"))
+            return
+
+        fixed = reconcile_spending_aggregates(user_id)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} spending aggregate(s)"))
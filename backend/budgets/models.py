@@ -2,7 +2,6 @@ from django.db import models
 import uuid
 from accounts.models import User
 from decimal import Decimal
-from datetime import timedelta
 
 
 class Budget(models.Model):
@@ -73,29 +72,13 @@ class Budget(models.Model):
     
     def get_spending_status(self) -> dict:
         """Get current spending status for this budget."""
-        from transactions.models import Transaction
-        from django.db.models import Sum
+        from budgets.aggregates import spent_amount
         from datetime import date
         
         today = date.today()
         
-        # Determine date range based on period
-        if self.period == 'MONTHLY':
-            start_date = date(today.year, today.month, 1)
-        else:  # WEEKLY
-            # Get start of current week (Monday)
-            start_date = today - timedelta(days=today.weekday())
-        
-        # Calculate total spending
-        total_spent = Transaction.objects.filter(
-            user=self.user,
-            category=self.category,
-            type='EXPENSE',
-            date__gte=start_date,
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-        
-        total_spent = abs(total_spent)
+        # Current period total from the spending_aggregate table
+        total_spent = spent_amount(self.user_id, self.category_id, self.period, today)
         remaining = self.amount - total_spent
         percentage = (total_spent / self.amount * 100) if self.amount > 0 else Decimal('0.00')
         
@@ -111,3 +94,35 @@ class Budget(models.Model):
     def __str__(self):
         return f"{self.category.name}: ${self.amount} ({self.period})"
 
+
+class SpendingAggregate(models.Model):
+    """
+    Running EXPENSE total per (user, category, period).
+
+    Kept up to date in the same database transaction as every transaction
+    insert, update and delete (see budgets.aggregates), so a budget check reads
+    one row instead of summing the period's transactions.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id')
+    category = models.ForeignKey('categories.Category', on_delete=models.CASCADE,
+                                 db_column='category_id')
+    period_type = models.CharField(
+        max_length=10,
+        choices=[('WEEKLY', 'Weekly'), ('MONTHLY', 'Monthly')]
+    )
+    period_start = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    transaction_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'spending_aggregate'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'category', 'period_type', 'period_start'],
+                name='spending_aggregate_period_uniq'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.period_type} {self.period_start}: ${self.total} ({self.transaction_count} txns)"
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from utils.event_queue import build_worker_pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued EventDispatcher events from the event_outbox table. "
+        "Run this as a dedicated worker process when EVENT_DISPATCH_ASYNC is on "
+        "and EVENT_RUN_WORKERS_IN_PROCESS is off."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the ready events and exit')
+        parser.add_argument('--workers', type=int, help='Worker threads (default EVENT_WORKERS)')
+
+    def handle(self, *args, **options):
+        # Observers are subscribed when the app signal modules are imported
+        import utils.signals  # noqa: F401
+        import transactions.signals  # noqa: F401
+
+        overrides = {'workers': options['workers']} if options['workers'] else {}
+        pool = build_worker_pool(**overrides)
+
+        if options['once']:
+            processed = pool.drain()
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} event(s)"))
+            self.stdout.write(str(pool.stats()))
+            return
+
+        pool.start()
+        self.stdout.write(f"Delivering events with {pool.workers} worker(s); Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(60)
+                self.stdout.write(str(pool.stats()))
+        except KeyboardInterrupt:
+            pool.stop(timeout=10)
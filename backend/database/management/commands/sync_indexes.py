@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the Meta.indexes of models whose tables are managed outside Django "
+        "migrations (schema.sql) when they are missing from the database, e.g. the "
+        "transactions list and aggregation indexes. The apps' migrations are out of "
+        "date and only faked (migrate --fake-initial), so run this on existing MySQL "
+        "databases after upgrading. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_labels', nargs='*', help='Limit to these apps (default: all)')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the missing indexes')
+
+    def handle(self, *args, **options):
+        labels = options['app_labels']
+        models = [
+            model for model in apps.get_models()
+            if model._meta.managed and model._meta.indexes
+            and (not labels or model._meta.app_label in labels)
+        ]
+        tables = set(connection.introspection.table_names())
+
+        created = 0
+        for model in models:
+            table = model._meta.db_table
+            if table not in tables:
+                self.stdout.write(f"Skipping {table}: table does not exist")
+                continue
+            with connection.cursor() as cursor:
+                existing = set(connection.introspection.get_constraints(cursor, table))
+            for index in model._meta.indexes:
+                if index.name in existing:
+                    continue
+                self.stdout.write(f"{table}: {index.name} ({', '.join(index.fields)})")
+                if not options['dry_run']:
+                    with connection.schema_editor() as editor:
+                        editor.add_index(model, index)
+                created += 1
+
+        verb = 'Missing' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {created} index(es)"))
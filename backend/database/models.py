@@ -1 +1,58 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
 
+
+class OutboxEvent(models.Model):
+    """
+    An EventDispatcher event waiting to be delivered by the event workers.
+
+    Rows are written in the same database transaction as the change that
+    raised the event and deleted once every subscribed observer has
+    handled it. `delivered_to` records the observers that already succeeded,
+    so a retry only re-runs the ones that failed.
+    """
+    PENDING = 'PENDING'
+    PROCESSING = 'PROCESSING'
+
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=20,
+        choices=[(PENDING, 'Pending'), (PROCESSING, 'Processing')],
+        default=PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    delivered_to = models.JSONField(default=list)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'event_outbox'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='event_outbox_ready_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.status}, attempt {self.attempts})"
+
+
+class DeadLetterEvent(models.Model):
+    """An event whose observers kept failing after EVENT_MAX_ATTEMPTS deliveries."""
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    attempts = models.PositiveIntegerField()
+    delivered_to = models.JSONField(default=list)
+    last_error = models.TextField(blank=True, null=True)
+    enqueued_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'event_dead_letters'
+        ordering = ['-failed_at']
+
+    def __str__(self):
+        return f"{self.event_type} failed after {self.attempts} attempts"
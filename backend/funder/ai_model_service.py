@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import numpy as np
 import joblib
@@ -49,18 +49,31 @@ class AIModelService:
         return features
 
     def predict_transaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
-        f = self.preprocess_transaction(tx)
-        x = np.array([[f['amount'], f['over_budget_percentage']]], dtype=float)
-        anomaly_flag = 0
-        anomaly_score = 0.0
+        return self.predict_transactions([tx])[0]
+
+    def predict_transactions(self, txs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score many transactions with one IsolationForest call; same results as predict_transaction per row."""
+        if not txs:
+            return []
+        features = [self.preprocess_transaction(tx) for tx in txs]
+        x = np.array([[f['amount'], f['over_budget_percentage']] for f in features], dtype=float)
+        anomaly_flags = np.zeros(len(features), dtype=int)
+        anomaly_scores = np.zeros(len(features), dtype=float)
         try:
             if self.iso_forest is not None:
                 preds = self.iso_forest.predict(x)
                 scores = self.iso_forest.score_samples(x)
-                anomaly_flag = int(preds[0] == -1)
-                anomaly_score = float(scores[0])
+                anomaly_flags = (preds == -1).astype(int)
+                anomaly_scores = np.asarray(scores, dtype=float)
         except Exception:
             pass
+        return [
+            self._build_result(f, int(flag), float(score))
+            for f, flag, score in zip(features, anomaly_flags, anomaly_scores)
+        ]
+
+    @staticmethod
+    def _build_result(f: Dict[str, Any], anomaly_flag: int, anomaly_score: float) -> Dict[str, Any]:
         reason_parts = []
         if anomaly_flag:
             reason_parts.append(f"Behavioral Anomaly (score: {anomaly_score:.3f})")
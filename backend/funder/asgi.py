@@ -15,3 +15,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
 
 application = get_asgi_application()
 
+# Load and warm the prediction models in the background (AI_WARMUP_ON_BOOT)
+from funder.warmup import start_on_boot  # noqa: E402
+
+start_on_boot()
+
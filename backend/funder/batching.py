@@ -0,0 +1,157 @@
+"""
+In-process request coalescing for model inference.
+
+Concurrent requests each hand a single feature row to a MicroBatcher. A
+background worker collects pending rows for up to ``window_ms`` (or until
+``max_batch_size`` rows are waiting), runs one forward pass over the stacked
+batch and resolves each caller's future with its own output row.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesce single-row predictions into batched forward passes."""
+
+    def __init__(self, predict_fn, window_ms=2.0, max_batch_size=64, name='micro-batcher'):
+        """
+        Args:
+            predict_fn: Callable taking an (N, F) tensor and returning an (N, ...) tensor
+            window_ms: Longest time the first row of a batch waits for company
+            max_batch_size: Batch is dispatched immediately once this many rows are pending
+            name: Worker thread name (also used in logs)
+        """
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        self._batch_histogram = {}
+        self._batches = 0
+        self._rows = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=2048)
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        """Queue one (1, F) feature row and return a Future for its (1, ...) output."""
+        future = Future()
+        self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    def predict(self, row, timeout=None):
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(row).result(timeout=timeout)
+
+    def shutdown(self):
+        """Stop the worker after it drains the rows already queued."""
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = first[2] + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Once the window has passed, still sweep up rows that queued
+                # behind a slow batch instead of serving them one by one
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                if self._stopped.is_set() and self._queue.empty():
+                    return
+                continue
+
+            started = time.perf_counter()
+            rows = [row for row, _, _ in batch]
+            sizes = [row.shape[0] for row in rows]
+            try:
+                with torch.no_grad():
+                    output = self.predict_fn(torch.cat(rows, dim=0))
+                offset = 0
+                for (_, future, _), size in zip(batch, sizes):
+                    future.set_result(output[offset:offset + size])
+                    offset += size
+            except Exception as e:
+                logger.error(f"{self.name}: batched prediction failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+
+            self._record(len(batch), [started - enqueued for _, _, enqueued in batch])
+
+            if self._stopped.is_set() and self._queue.empty():
+                return
+
+    def _record(self, batch_size, waits):
+        with self._lock:
+            self._batches += 1
+            self._rows += batch_size
+            bucket = 1
+            while bucket < batch_size:
+                bucket *= 2
+            self._batch_histogram[bucket] = self._batch_histogram.get(bucket, 0) + 1
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, max(waits))
+            self._recent_waits.extend(waits)
+
+    def metrics(self):
+        """Snapshot of queue depth, batch-size histogram and queue wait times (ms)."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+
+            def percentile(p):
+                if not waits:
+                    return 0.0
+                return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000
+
+            return {
+                'queue_depth': self._queue.qsize(),
+                'window_ms': self.window * 1000,
+                'max_batch_size': self.max_batch_size,
+                'batches': self._batches,
+                'rows': self._rows,
+                'avg_batch_size': self._rows / self._batches if self._batches else 0.0,
+                'batch_size_histogram': {
+                    f'<={bucket}': count for bucket, count in sorted(self._batch_histogram.items())
+                },
+                'wait_ms': {
+                    'avg': self._wait_total / self._rows * 1000 if self._rows else 0.0,
+                    'p50': percentile(0.50),
+                    'p99': percentile(0.99),
+                    'max': self._wait_max * 1000,
+                },
+            }
@@ -0,0 +1,51 @@
+"""
+Majority-vote ensemble over the transaction-type models.
+
+Shared by the prediction endpoints (ai_alerts.views) and the int8
+quantization gate (funder.quantization), so both vote the same way.
+"""
+import numpy as np
+import torch
+
+
+def run_transaction_ensemble(models, X_final):
+    """
+    Run every transaction model once over the (N, F) matrix.
+
+    Returns (model_names, votes) where votes is an (M, N) array of class indices.
+    """
+    X_tensor = torch.FloatTensor(X_final).to(models['device'])
+
+    names = []
+    votes = []
+    with torch.no_grad():
+        for name in ('dnn', 'resnet', 'attention'):
+            output = models[name](X_tensor)
+            names.append(name)
+            votes.append(torch.argmax(output, dim=1).cpu().numpy())
+
+        if models['tabnet'] is not None:
+            names.append('tabnet')
+            votes.append(np.asarray(models['tabnet'].predict(X_final)))
+
+    return names, np.stack(votes).astype(np.int64)
+
+
+def ensemble_vote(votes):
+    """
+    Majority vote over an (M, N) array of class indices.
+
+    Ties go to the class voted for by the earliest model, matching
+    ``Counter.most_common`` on the per-row vote list. Returns the winning
+    class and its vote share for every row.
+    """
+    num_models, num_rows = votes.shape
+    num_classes = int(votes.max()) + 1
+    counts = np.zeros((num_rows, num_classes), dtype=np.int64)
+    np.add.at(counts, (np.tile(np.arange(num_rows), num_models), votes.ravel()), 1)
+
+    best = counts.max(axis=1)
+    row_votes = votes.T
+    is_winner = np.take_along_axis(counts, row_votes, axis=1) == best[:, None]
+    winner = row_votes[np.arange(num_rows), is_winner.argmax(axis=1)]
+    return winner, best / num_models
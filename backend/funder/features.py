@@ -0,0 +1,125 @@
+"""
+Feature pipeline compiled from the pickled preprocessing dicts.
+
+The training notebooks save a StandardScaler and a OneHotEncoder
+(handle_unknown='ignore') together with the ordered feature names. Running
+them through sklearn for every request means building 2-D numpy arrays of
+Python objects, input validation and a concatenate. FeaturePipeline extracts
+the scaler's mean/scale vectors and a {category: column} index per encoder
+column once, then writes rows straight into a preallocated float32 matrix.
+"""
+import numpy as np
+import pandas as pd
+
+
+class FeaturePipeline:
+    """Standard-scale numeric columns and one-hot encode categorical ones into (N, F) float32."""
+
+    def __init__(self, numeric_features, mean, scale, categorical_features=(), category_index=(),
+                 numeric_default=0, categorical_default='missing'):
+        self.numeric_features = list(numeric_features)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.categorical_features = list(categorical_features)
+        self.numeric_default = numeric_default
+        self.categorical_default = categorical_default
+
+        # One absolute output column per (feature, category); unknown values map to nothing
+        self.category_index = []
+        offset = len(self.numeric_features)
+        for categories in category_index:
+            self.category_index.append({value: offset + i for i, value in enumerate(categories)})
+            offset += len(categories)
+        self.n_features = offset
+
+    @classmethod
+    def from_preprocessing(cls, preprocessing):
+        """Compile a preprocessing dict saved as {'scaler', 'cat_encoder', 'numeric_features', 'categorical_features'}."""
+        scaler = preprocessing['scaler']
+        n_numeric = len(preprocessing['numeric_features'])
+        mean = scaler.mean_ if getattr(scaler, 'with_mean', True) else np.zeros(n_numeric)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_numeric)
+
+        encoder = preprocessing.get('cat_encoder')
+        if encoder is None:
+            return cls(preprocessing['numeric_features'], mean, scale)
+        if getattr(encoder, 'drop_idx_', None) is not None or encoder.handle_unknown != 'ignore':
+            raise ValueError("FeaturePipeline only supports OneHotEncoder(drop=None, handle_unknown='ignore')")
+        return cls(
+            preprocessing['numeric_features'], mean, scale,
+            preprocessing['categorical_features'],
+            [list(categories) for categories in encoder.categories_],
+        )
+
+    def transform(self, rows):
+        """
+        Encode a list of dicts or a DataFrame.
+
+        Missing keys (or NaN cells of a DataFrame) fall back to 0 / 'missing';
+        unknown categories encode as all zeros, as with handle_unknown='ignore'.
+        """
+        if isinstance(rows, pd.DataFrame):
+            return self._transform_frame(rows)
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        n_rows = len(rows)
+        n_numeric = len(self.numeric_features)
+        out = np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+        numeric = np.fromiter(
+            (row.get(f, self.numeric_default) for row in rows for f in self.numeric_features),
+            dtype=np.float64, count=n_rows * n_numeric,
+        ).reshape(n_rows, n_numeric)
+        out[:, :n_numeric] = (numeric - self.mean) / self.scale
+
+        for feature, index in zip(self.categorical_features, self.category_index):
+            default = self.categorical_default
+            for i, row in enumerate(rows):
+                column = index.get(row.get(feature, default))
+                if column is not None:
+                    out[i, column] = 1.0
+        return out
+
+    def _transform_frame(self, df):
+        n_rows = len(df)
+        n_numeric = len(self.numeric_features)
+        out = np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+        # Missing keys surface as NaN once dicts become a frame; treat them like absent keys
+        numeric = df.reindex(columns=self.numeric_features).fillna(self.numeric_default)
+        out[:, :n_numeric] = (numeric.to_numpy(dtype=np.float64) - self.mean) / self.scale
+
+        row_ids = np.arange(n_rows)
+        for feature, index in zip(self.categorical_features, self.category_index):
+            if feature in df.columns:
+                values = df[feature].fillna(self.categorical_default)
+                columns = values.map(index).to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                columns = np.full(n_rows, index.get(self.categorical_default, np.nan))
+            known = ~np.isnan(columns)
+            out[row_ids[known], columns[known].astype(np.int64)] = 1.0
+        return out
+
+
+def sklearn_transform(rows, preprocessing):
+    """
+    Reference path through the pickled sklearn objects.
+
+    Kept for parity tests and benchmarks; serving code uses FeaturePipeline.
+    """
+    X_numeric = np.array(
+        [[row.get(f, 0) for f in preprocessing['numeric_features']] for row in rows],
+        dtype=np.float64
+    ).reshape(len(rows), -1)
+    X_scaled = preprocessing['scaler'].transform(X_numeric)
+
+    if preprocessing['cat_encoder'] is None:
+        return X_scaled
+
+    X_cat = np.array(
+        [[row.get(f, 'missing') for f in preprocessing['categorical_features']] for row in rows],
+        dtype=object
+    ).reshape(len(rows), -1)
+    X_cat_encoded = preprocessing['cat_encoder'].transform(X_cat)
+    return np.concatenate([X_scaled, X_cat_encoded], axis=1)
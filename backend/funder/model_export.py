@@ -0,0 +1,199 @@
+"""
+Export the eager transaction networks to frozen TorchScript / ONNX graphs.
+
+Every Linear -> BatchNorm1d pair is folded into a single Linear and Dropout is
+removed (both are no-ops in eval mode), then the result is traced. The
+ModelRegistry serves these graphs instead of the eager modules when
+AI_INFERENCE_BACKEND is 'torchscript' or 'onnx'.
+
+Each export records the SHA-256 of the checkpoint it was built from
+(source_sha256). The registry refuses a graph whose checkpoint has since
+changed and serves the eager model until export_models is rerun.
+"""
+import json
+import logging
+from pathlib import Path
+
+import torch
+import torch.fx
+import torch.nn as nn
+from torch.nn.utils.fusion import fuse_linear_bn_eval
+
+from .networks import DeepNeuralNetwork, ResidualNeuralNetwork, AttentionNeuralNetwork
+
+logger = logging.getLogger(__name__)
+
+COMPILED_DIR_NAME = 'compiled'
+
+# model_store/ checkpoint -> architecture
+EXPORTABLE_MODELS = {
+    'transaction_dnn_model.pth': DeepNeuralNetwork,
+    'transaction_resnet_model.pth': ResidualNeuralNetwork,
+    'transaction_attention_model.pth': AttentionNeuralNetwork,
+    'flagged_transaction_dnn_model.pth': DeepNeuralNetwork,
+}
+
+
+class StaleExportError(Exception):
+    """A compiled graph was exported from a different checkpoint than the one on disk."""
+
+
+def torchscript_path(model_dir: Path, filename: str) -> Path:
+    return Path(model_dir) / COMPILED_DIR_NAME / f"{Path(filename).stem}.ts"
+
+
+def onnx_path(model_dir: Path, filename: str) -> Path:
+    return Path(model_dir) / COMPILED_DIR_NAME / f"{Path(filename).stem}.onnx"
+
+
+def _module_for(graph_module, node):
+    if node.op != 'call_module':
+        return None
+    return graph_module.get_submodule(node.target)
+
+
+def fold_batchnorm(model: nn.Module) -> torch.fx.GraphModule:
+    """
+    Return an eval-mode copy of model with BatchNorm folded into the preceding
+    Linear and Dropout removed.
+
+    Uses torch.fx so it works for any of the architectures in
+    funder.networks, including the residual and attention blocks.
+    """
+    model = model.eval()
+    graph_module = torch.fx.symbolic_trace(model)
+    graph = graph_module.graph
+
+    for node in list(graph.nodes):
+        module = _module_for(graph_module, node)
+
+        if isinstance(module, nn.Dropout):
+            node.replace_all_uses_with(node.args[0])
+            graph.erase_node(node)
+            continue
+
+        if not isinstance(module, nn.BatchNorm1d):
+            continue
+        linear_node = node.args[0]
+        linear = _module_for(graph_module, linear_node) if isinstance(linear_node, torch.fx.Node) else None
+        if not isinstance(linear, nn.Linear) or len(linear_node.users) != 1:
+            continue
+
+        fused = fuse_linear_bn_eval(linear, module)
+        parent_name, _, attr = linear_node.target.rpartition('.')
+        parent = graph_module.get_submodule(parent_name) if parent_name else graph_module
+        setattr(parent, attr, fused)
+
+        node.replace_all_uses_with(linear_node)
+        graph.erase_node(node)
+
+    graph.lint()
+    graph_module.delete_all_unused_submodules()
+    graph_module.recompile()
+    graph_module.eval()
+    graph_module.requires_grad_(False)
+    return graph_module
+
+
+def load_checkpoint(path: Path, model_class):
+    checkpoint = torch.load(path, map_location=torch.device('cpu'))
+    model = model_class(checkpoint['input_dim'], checkpoint['num_classes'])
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    meta = {'input_dim': checkpoint['input_dim'], 'num_classes': checkpoint['num_classes']}
+    return model, meta
+
+
+def export_torchscript(model: nn.Module, meta: dict, path: Path) -> Path:
+    """Fold, trace and freeze model; checkpoint dimensions are stored in meta.json."""
+    folded = fold_batchnorm(model)
+    example = torch.zeros(2, meta['input_dim'])
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(folded, example))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.jit.save(traced, str(path), _extra_files={'meta.json': json.dumps(meta)})
+    return path
+
+
+def export_onnx(model: nn.Module, meta: dict, path: Path) -> Path:
+    """
+    Fold and export to ONNX with a dynamic batch dimension (requires the onnx
+    package); meta is stored in the model's metadata_props.
+    """
+    import onnx
+
+    folded = fold_batchnorm(model)
+    example = torch.zeros(2, meta['input_dim'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        folded, (example,), str(path),
+        input_names=['features'], output_names=['logits'],
+        dynamic_axes={'features': {0: 'batch'}, 'logits': {0: 'batch'}},
+        dynamo=False,
+    )
+    proto = onnx.load(str(path))
+    for key, value in meta.items():
+        entry = proto.metadata_props.add()
+        entry.key, entry.value = key, str(value)
+    onnx.save(proto, str(path))
+    return path
+
+
+def load_torchscript(path: Path):
+    """Load a frozen graph written by export_torchscript; returns (module, meta)."""
+    extra_files = {'meta.json': ''}
+    module = torch.jit.load(str(path), map_location=torch.device('cpu'), _extra_files=extra_files)
+    module.eval()
+    return module, json.loads(extra_files['meta.json'])
+
+
+def verify_export(meta: dict, source_sha256: str, path: Path) -> None:
+    """Raise StaleExportError unless meta records source_sha256 as the exported checkpoint."""
+    exported_from = meta.get('source_sha256')
+    if exported_from != source_sha256:
+        raise StaleExportError(
+            f"{Path(path).name} was exported from checkpoint {(exported_from or 'unknown')[:12]}, "
+            f"not the current {source_sha256[:12]}; rerun `manage.py export_models`"
+        )
+
+
+class OnnxModel:
+    """Callable wrapper that lets an onnxruntime session stand in for an nn.Module."""
+
+    def __init__(self, path: Path):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.meta = {
+            **self.session.get_modelmeta().custom_metadata_map,
+            'input_dim': self.session.get_inputs()[0].shape[1],
+            'num_classes': self.session.get_outputs()[0].shape[1],
+        }
+
+    def __call__(self, x):
+        outputs = self.session.run(None, {self.input_name: x.detach().cpu().numpy().astype('float32')})
+        return torch.from_numpy(outputs[0])
+
+    def eval(self):
+        return self
+
+
+def export_model_store(model_dir: Path, onnx: bool = False):
+    """Export every EXPORTABLE_MODELS checkpoint found in model_dir; returns written paths."""
+    from .model_registry import file_sha256
+
+    written = []
+    for filename, model_class in EXPORTABLE_MODELS.items():
+        source = Path(model_dir) / filename
+        if not source.exists():
+            logger.warning(f"Skipping {filename}: not found in {model_dir}")
+            continue
+        model, meta = load_checkpoint(source, model_class)
+        meta['source_sha256'] = file_sha256(source)
+        written.append(export_torchscript(model, meta, torchscript_path(model_dir, filename)))
+        if onnx:
+            written.append(export_onnx(model, meta, onnx_path(model_dir, filename)))
+    return written
@@ -0,0 +1,345 @@
+"""
+Process-wide registry for the model artifacts in model_store/.
+
+Every artifact is deserialized at most once per process and keyed by the
+SHA-256 of its file contents, so the ai_alerts and funder views share the same
+in-memory model objects instead of each loading their own copy. Handles are
+shared between threads and requests: torch modules are put in eval mode with
+gradients disabled, and callers must not mutate them.
+"""
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+from django.conf import settings
+
+from . import model_export, quantization
+from .features import FeaturePipeline
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(settings.BASE_DIR) / "model_store"
+
+
+@dataclass
+class ModelHandle:
+    """A loaded artifact plus the bookkeeping reported by ModelRegistry.stats()."""
+    name: str
+    kind: str
+    sha256: str
+    obj: Any
+    load_seconds: float
+    nbytes: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Bundle:
+    """A named group of loaded artifacts and the versions it was built from."""
+    obj: Any
+    # On-disk contents of its artifacts when built; a change triggers a rebuild
+    artifact_version: Optional[str] = None
+    # Registry handles actually serving those artifacts (backend and variant included)
+    served_version: Optional[str] = None
+
+
+def file_sha256(path: Path) -> str:
+    """Stream a file through SHA-256."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def estimate_nbytes(obj, _seen=None) -> int:
+    """
+    Approximate resident size of a loaded model.
+
+    Counts torch parameters/buffers and numpy arrays reachable through
+    containers and instance attributes (sklearn estimators, TabNet wrappers).
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, nn.Module):
+        # Dynamically quantized Linear layers keep packed int8 weights outside parameters()
+        if any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in obj.modules()):
+            return quantization.serialized_nbytes(obj)
+        return sum(t.numel() * t.element_size() for t in list(obj.parameters()) + list(obj.buffers()))
+    if isinstance(obj, torch.Tensor):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(estimate_nbytes(v, _seen) for v in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sum(estimate_nbytes(v, _seen) for v in obj)
+    if hasattr(obj, '__dict__'):
+        return estimate_nbytes(vars(obj), _seen)
+    return 0
+
+
+class ModelRegistry:
+    """Thread-safe, load-once cache of model_store/ artifacts."""
+
+    def __init__(self, model_dir: Path = MODEL_DIR):
+        self.model_dir = Path(model_dir)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._path_hashes: Dict[Path, tuple] = {}
+        self._handles: Dict[str, ModelHandle] = {}
+        self._served: Dict[str, str] = {}
+        self._bundles: Dict[str, Bundle] = {}
+        self._quantization_gate = None
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _artifact_hash(self, path: Path) -> str:
+        """SHA-256 of path, recomputed only when its size or mtime changes."""
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._path_hashes.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, file_sha256(path))
+            self._path_hashes[path] = cached
+        return cached[1]
+
+    def artifact_version(self, filenames) -> str:
+        """Short digest identifying the on-disk contents of a set of model_store/ files."""
+        digest = hashlib.sha256()
+        for filename in sorted(filenames):
+            path = self.model_dir / filename
+            digest.update(self._artifact_hash(path).encode() if path.exists() else b'missing')
+        return digest.hexdigest()[:16]
+
+    def _load(self, filename: str, kind: str, loader: Callable[[Path], Any], served_as: str = None,
+              variant: str = '') -> Any:
+        """
+        loader returns (object, meta); meta is kept on the handle for checkpoint_info().
+
+        variant distinguishes several objects built from the same file (e.g. the
+        float32 and int8 versions of one checkpoint).
+        """
+        path = self.model_dir / filename
+        digest = self._artifact_hash(path)
+        key = f"{digest}:{variant}" if variant else digest
+        handle = self._handles.get(key)
+
+        if handle is None:
+            with self._key_lock(key):
+                handle = self._handles.get(key)
+                if handle is None:
+                    started = time.perf_counter()
+                    obj, meta = loader(path)
+                    handle = ModelHandle(
+                        name=filename,
+                        kind=kind,
+                        sha256=digest,
+                        obj=obj,
+                        load_seconds=time.perf_counter() - started,
+                        # Frozen graphs keep weights as constants; fall back to file size
+                        nbytes=estimate_nbytes(obj) or path.stat().st_size,
+                        meta=meta,
+                    )
+                    self._handles[key] = handle
+                    logger.info(f"Loaded {filename} ({kind}) in {handle.load_seconds:.2f}s")
+
+        self._served[served_as or filename] = key
+        return handle.obj
+
+    def load_torch(self, filename: str, model_class) -> nn.Module:
+        """
+        Load a checkpoint saved as {'input_dim', 'num_classes', 'model_state_dict'}.
+
+        With AI_INFERENCE_BACKEND set to 'torchscript' or 'onnx' the frozen
+        graph written by `manage.py export_models` is served instead, falling
+        back to the eager module if it has not been exported.
+
+        With AI_QUANTIZE_INT8 the eager transaction models are served as
+        dynamic int8 modules, provided the quantization gate passes.
+        """
+        backend = getattr(settings, 'AI_INFERENCE_BACKEND', 'eager')
+        if backend in ('torchscript', 'onnx'):
+            model = self._load_compiled(filename, backend)
+            if model is not None:
+                return model
+
+        if filename in quantization.QUANTIZABLE_FILES and self.quantization_gate().enabled:
+            def int8_loader(path):
+                model, meta = model_export.load_checkpoint(path, model_class)
+                return quantization.quantize_int8(model), meta
+            return self._load(filename, 'torch-int8', int8_loader, variant='int8')
+
+        def loader(path):
+            model, meta = model_export.load_checkpoint(path, model_class)
+            model.requires_grad_(False)
+            return model, meta
+        return self._load(filename, 'torch', loader)
+
+    def _load_compiled(self, filename: str, backend: str):
+        """
+        The exported graph for a checkpoint, or None when it has not been
+        exported or was exported from a different version of the checkpoint.
+        """
+        if backend == 'torchscript':
+            compiled = model_export.torchscript_path(self.model_dir, filename)
+            load = model_export.load_torchscript
+        else:
+            compiled = model_export.onnx_path(self.model_dir, filename)
+
+            def load(path):
+                model = model_export.OnnxModel(path)
+                return model, model.meta
+        if not compiled.exists():
+            logger.warning(f"No {backend} export for {filename}; serving the eager model")
+            return None
+
+        source_sha256 = self._artifact_hash(self.model_dir / filename)
+
+        def loader(path):
+            model, meta = load(path)
+            model_export.verify_export(meta, source_sha256, path)
+            return model, meta
+        try:
+            # Keyed on the checkpoint as well, so retraining it invalidates the cached graph
+            return self._load(
+                str(compiled.relative_to(self.model_dir)), backend, loader,
+                served_as=filename, variant=source_sha256[:16]
+            )
+        except model_export.StaleExportError as e:
+            logger.warning(f"{e}; serving the eager model")
+            return None
+
+    def quantization_gate(self) -> quantization.QuantizationGate:
+        """Run the int8 accuracy gate once per process (only if AI_QUANTIZE_INT8 is on)."""
+        max_drop = float(getattr(settings, 'AI_QUANTIZE_MAX_ACCURACY_DROP', 0.005))
+        if not getattr(settings, 'AI_QUANTIZE_INT8', False):
+            return quantization.QuantizationGate(False, 'AI_QUANTIZE_INT8 is off', max_drop)
+
+        if self._quantization_gate is None:
+            with self._key_lock('quantization_gate'):
+                if self._quantization_gate is None:
+                    try:
+                        self._quantization_gate = quantization.evaluate_quantization_gate(self, max_drop)
+                    except Exception as e:
+                        logger.error(f"int8 quantization gate failed: {e}")
+                        self._quantization_gate = quantization.QuantizationGate(
+                            False, f"gate failed: {e}", max_drop
+                        )
+        return self._quantization_gate
+
+    def checkpoint_info(self, filename: str) -> Dict[str, Any]:
+        """input_dim/num_classes of the model served for a checkpoint already loaded with load_torch."""
+        return self._handles[self._served[filename]].meta
+
+    def load_pickle(self, filename: str) -> Any:
+        """Load a pickled preprocessing/metadata object."""
+        def loader(path):
+            with open(path, 'rb') as f:
+                return pickle.load(f), {}
+        return self._load(filename, 'pickle', loader)
+
+    def load_feature_pipeline(self, filename: str) -> FeaturePipeline:
+        """Compile a preprocessing pickle into a FeaturePipeline (shares the unpickled dict)."""
+        def loader(path):
+            return FeaturePipeline.from_preprocessing(self.load_pickle(filename)), {}
+        return self._load(filename, 'pipeline', loader, served_as=f"{filename}:pipeline", variant='pipeline')
+
+    def load_tabnet(self, filename: str):
+        """Load a saved TabNetClassifier zip (requires pytorch-tabnet)."""
+        def loader(path):
+            from pytorch_tabnet.tab_model import TabNetClassifier
+            model = TabNetClassifier()
+            model.load_model(str(path))
+            model.network.eval()
+            model.network.requires_grad_(False)
+            return model, {}
+        return self._load(filename, 'tabnet', loader)
+
+    def served_version(self, filenames) -> str:
+        """Short digest of the handles currently serving a set of model_store/ files."""
+        digest = hashlib.sha256()
+        for filename in sorted(filenames):
+            digest.update(f"{filename}={self._served.get(filename, 'missing')};".encode())
+        return digest.hexdigest()[:16]
+
+    def bundle(self, key: str, factory: Callable[[], Any], artifacts: Sequence[str] = None) -> Bundle:
+        """
+        Build a named bundle of artifacts (e.g. the transaction ensemble) once.
+
+        Bundles only hold references to registry handles, so two bundles built
+        from the same files share the same model objects. With artifacts, the
+        bundle is rebuilt as soon as one of those files changes on disk, and
+        its served_version identifies the handles it was built from.
+        """
+        version = self.artifact_version(artifacts) if artifacts else None
+        bundle = self._bundles.get(key)
+        if bundle is not None and bundle.artifact_version == version:
+            return bundle
+        with self._key_lock(f'bundle:{key}'):
+            bundle = self._bundles.get(key)
+            if bundle is None or bundle.artifact_version != version:
+                if bundle is not None:
+                    logger.info(f"Reloading {key} models: artifacts changed on disk")
+                obj = factory()
+                bundle = Bundle(obj, version, self.served_version(artifacts) if artifacts else None)
+                self._bundles[key] = bundle
+        return bundle
+
+    def get_or_create(self, key: str, factory: Callable[[], Any], artifacts: Sequence[str] = None) -> Any:
+        """The object of bundle(key, factory, artifacts)."""
+        return self.bundle(key, factory, artifacts).obj
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-artifact load time and approximate resident memory."""
+        handles = sorted(self._handles.values(), key=lambda h: h.name)
+        return {
+            'artifacts': [
+                {
+                    'name': h.name,
+                    'kind': h.kind,
+                    'sha256': h.sha256[:12],
+                    'load_seconds': round(h.load_seconds, 4),
+                    'resident_mb': round(h.nbytes / (1024 * 1024), 3),
+                }
+                for h in handles
+            ],
+            'bundles': sorted(self._bundles),
+            'quantization': self._quantization_gate.as_dict() if self._quantization_gate else None,
+            'total_resident_mb': round(sum(h.nbytes for h in handles) / (1024 * 1024), 3),
+        }
+
+    def clear(self) -> None:
+        """Drop every loaded artifact and bundle (used by tests)."""
+        with self._lock:
+            self._path_hashes.clear()
+            self._handles.clear()
+            self._served.clear()
+            self._bundles.clear()
+            self._quantization_gate = None
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def load_model_once(model_key, loader_func, artifacts=None):
+    """Cache loaded models to avoid reloading on every request (reloaded when artifacts change)"""
+    return _registry.get_or_create(model_key, loader_func, artifacts)
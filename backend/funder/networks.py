@@ -0,0 +1,120 @@
+"""
+Network architectures for the transaction models in model_store/.
+
+These mirror the classes in AI_DL_MODEL.ipynb so the saved state dicts load
+into them unchanged.
+"""
+import torch
+import torch.nn as nn
+
+
+class DeepNeuralNetwork(nn.Module):
+    """DNN architecture for transaction classification and flagged detection"""
+    def __init__(self, input_dim, num_classes):
+        super(DeepNeuralNetwork, self).__init__()
+        self.network = nn.Sequential(
+            nn.Linear(input_dim, 256), nn.BatchNorm1d(256), nn.ReLU(), nn.Dropout(0.4),
+            nn.Linear(256, 128), nn.BatchNorm1d(128), nn.ReLU(), nn.Dropout(0.4),
+            nn.Linear(128, 64), nn.BatchNorm1d(64), nn.ReLU(), nn.Dropout(0.3),
+            nn.Linear(64, num_classes)
+        )
+    
+    def forward(self, x):
+        return self.network(x)
+
+
+class ResidualBlock(nn.Module):
+    def __init__(self, input_dim, hidden_dim):
+        super(ResidualBlock, self).__init__()
+        self.fc1 = nn.Linear(input_dim, hidden_dim)
+        self.bn1 = nn.BatchNorm1d(hidden_dim)
+        self.fc2 = nn.Linear(hidden_dim, input_dim)
+        self.bn2 = nn.BatchNorm1d(input_dim)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.2)
+
+    def forward(self, x):
+        residual = x
+        out = self.fc1(x)
+        out = self.bn1(out)
+        out = self.relu(out)
+        out = self.dropout(out)
+        out = self.fc2(out)
+        out = self.bn2(out)
+        out += residual
+        out = self.relu(out)
+        return out
+
+
+class ResidualNeuralNetwork(nn.Module):
+    """ResNet architecture for transaction classification"""
+    def __init__(self, input_dim, num_classes):
+        super(ResidualNeuralNetwork, self).__init__()
+        self.input_layer = nn.Linear(input_dim, 256)
+        self.bn_input = nn.BatchNorm1d(256)
+        self.res_block1 = ResidualBlock(256, 512)
+        self.res_block2 = ResidualBlock(256, 512)
+        self.res_block3 = ResidualBlock(256, 512)
+        self.fc_out = nn.Sequential(
+            nn.Linear(256, 128),
+            nn.BatchNorm1d(128),
+            nn.ReLU(),
+            nn.Dropout(0.3),
+            nn.Linear(128, num_classes)
+        )
+        self.relu = nn.ReLU()
+
+    def forward(self, x):
+        x = self.input_layer(x)
+        x = self.bn_input(x)
+        x = self.relu(x)
+        x = self.res_block1(x)
+        x = self.res_block2(x)
+        x = self.res_block3(x)
+        x = self.fc_out(x)
+        return x
+
+
+class AttentionLayer(nn.Module):
+    def __init__(self, hidden_dim):
+        super(AttentionLayer, self).__init__()
+        self.attention = nn.Linear(hidden_dim, 1)
+
+    def forward(self, x):
+        attention_weights = torch.softmax(self.attention(x), dim=1)
+        return x * attention_weights
+
+
+class AttentionNeuralNetwork(nn.Module):
+    """Attention-based neural network for transaction classification"""
+    def __init__(self, input_dim, num_classes):
+        super(AttentionNeuralNetwork, self).__init__()
+        self.fc1 = nn.Linear(input_dim, 256)
+        self.bn1 = nn.BatchNorm1d(256)
+        self.attention1 = AttentionLayer(256)
+        self.fc2 = nn.Linear(256, 128)
+        self.bn2 = nn.BatchNorm1d(128)
+        self.attention2 = AttentionLayer(128)
+        self.fc3 = nn.Linear(128, 64)
+        self.bn3 = nn.BatchNorm1d(64)
+        self.fc_out = nn.Linear(64, num_classes)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.3)
+
+    def forward(self, x):
+        x = self.fc1(x)
+        x = self.bn1(x)
+        x = self.relu(x)
+        x = self.attention1(x)
+        x = self.dropout(x)
+        x = self.fc2(x)
+        x = self.bn2(x)
+        x = self.relu(x)
+        x = self.attention2(x)
+        x = self.dropout(x)
+        x = self.fc3(x)
+        x = self.bn3(x)
+        x = self.relu(x)
+        x = self.dropout(x)
+        x = self.fc_out(x)
+        return x
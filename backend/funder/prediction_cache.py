@@ -0,0 +1,209 @@
+"""
+Prediction result cache for repeated feature payloads.
+
+Health checks, chatbot calls and UI refreshes keep resubmitting identical
+transactions. Each preprocessed feature row is hashed together with the
+served_version of the ModelRegistry bundle that computes the prediction (a
+digest of the handles actually serving it), and the prediction for that row
+is cached under the combined key. Replacing a model file makes the registry
+rebuild the bundle with new handles, which changes the version, so
+predictions of the old model are never served under the new one; the
+in-process backend also drops its entries as soon as the change is noticed.
+
+Two backends are available via AI_PREDICTION_CACHE_BACKEND: 'local' (bounded
+in-process LRU with TTL) and 'django' (the configured Django cache, shared
+between workers). Cached values are shared between requests and must not be
+mutated by callers.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    name = 'local'
+
+    def __init__(self, max_entries=10000, ttl_seconds=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_many(self, keys):
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key, _MISSING)
+                if entry is _MISSING:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, items):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class DjangoCacheBackend:
+    """Store predictions in a Django cache alias so hits are shared across workers."""
+
+    name = 'django'
+
+    def __init__(self, alias='default', ttl_seconds=300.0):
+        self.alias = alias
+        self.ttl = ttl_seconds
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def set_many(self, items):
+        self.cache.set_many(items, timeout=self.ttl)
+
+    def clear(self):
+        # Keys embed the artifact version, so entries of old models are simply never read again
+        pass
+
+    def stats(self):
+        # Size and evictions are owned by the cache server
+        return {'alias': self.alias, 'size': None, 'evictions': None}
+
+
+class PredictionCache:
+    """Row-level cache of predictions keyed by preprocessed features + serving model version."""
+
+    def __init__(self, name, backend):
+        """
+        Args:
+            name: Key prefix, one per prediction endpoint
+            backend: LocalLRUCache or DjangoCacheBackend
+        """
+        self.name = name
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _observe(self, version):
+        """Drop local entries the first time a new model version is seen."""
+        if version == self._version:
+            return
+        with self._lock:
+            if self._version is not None and version != self._version:
+                logger.info(f"{self.name} prediction cache invalidated: serving models changed")
+                self.backend.clear()
+                self.invalidations += 1
+            self._version = version
+
+    def keys(self, X, version):
+        """One key per row of an (N, F) feature matrix."""
+        X = np.ascontiguousarray(X, dtype=np.float32) + np.float32(0.0)  # folds -0.0 into 0.0
+        prefix = f"prediction:{self.name}:{version}:"
+        return [prefix + hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in X]
+
+    def get_or_compute(self, X, compute_fn, version):
+        """
+        Return one prediction per row of X, calling compute_fn(X[missing])
+        only for the rows that are not cached.
+
+        version must identify the models compute_fn runs, e.g. the
+        served_version of the registry bundle they were taken from.
+        """
+        self._observe(version)
+        keys = self.keys(X, version)
+        found = self.backend.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in found]
+
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            computed = compute_fn(X[missing])
+            fresh = {keys[i]: value for i, value in zip(missing, computed)}
+            self.backend.set_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'version': self._version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            'invalidations': self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def build_backend():
+    """Backend selected by AI_PREDICTION_CACHE_BACKEND."""
+    ttl = float(getattr(settings, 'AI_PREDICTION_CACHE_TTL_SECONDS', 300))
+    if getattr(settings, 'AI_PREDICTION_CACHE_BACKEND', 'local') == 'django':
+        return DjangoCacheBackend(getattr(settings, 'AI_PREDICTION_CACHE_ALIAS', 'default'), ttl)
+    return LocalLRUCache(int(getattr(settings, 'AI_PREDICTION_CACHE_MAX_ENTRIES', 10000)), ttl)
+
+
+def get_prediction_cache(name):
+    """Shared PredictionCache for an endpoint, or None when AI_PREDICTION_CACHE_ENABLED is off."""
+    if not getattr(settings, 'AI_PREDICTION_CACHE_ENABLED', True):
+        return None
+    if name not in _caches:
+        with _caches_lock:
+            if name not in _caches:
+                _caches[name] = PredictionCache(name, build_backend())
+    return _caches[name]
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in _caches.items()}
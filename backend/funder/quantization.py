@@ -0,0 +1,124 @@
+"""
+Opt-in dynamic int8 quantization of the transaction ensemble.
+
+With AI_QUANTIZE_INT8 enabled the ModelRegistry folds BatchNorm into the
+preceding Linear layers and swaps every nn.Linear of the DNN/ResNet/Attention
+models for a dynamically quantized int8 Linear at load time. Before serving
+anything quantized it runs an accuracy gate on final_test_dataset.csv: if the
+ensemble's accuracy drops by more than AI_QUANTIZE_MAX_ACCURACY_DROP the
+float32 models are served instead.
+"""
+import io
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import torch
+import torch.nn as nn
+from django.conf import settings
+
+from . import model_export
+from .ensemble import ensemble_vote, run_transaction_ensemble
+from .features import FeaturePipeline
+from .networks import DeepNeuralNetwork, ResidualNeuralNetwork, AttentionNeuralNetwork
+
+logger = logging.getLogger(__name__)
+
+GATE_DATASET = Path(settings.BASE_DIR) / 'final_test_dataset.csv'
+
+QUANTIZABLE_MODELS = {
+    'dnn': ('transaction_dnn_model.pth', DeepNeuralNetwork),
+    'resnet': ('transaction_resnet_model.pth', ResidualNeuralNetwork),
+    'attention': ('transaction_attention_model.pth', AttentionNeuralNetwork),
+}
+QUANTIZABLE_FILES = {filename for filename, _ in QUANTIZABLE_MODELS.values()}
+
+
+@dataclass
+class QuantizationGate:
+    """Outcome of the accuracy-regression check run before quantized models are served."""
+    enabled: bool
+    reason: str
+    max_drop: float
+    baseline_accuracy: Optional[float] = None
+    quantized_accuracy: Optional[float] = None
+    rows: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """Fold BatchNorm/Dropout, then quantize every nn.Linear to dynamic int8."""
+    folded = model_export.fold_batchnorm(model)
+    quantized = torch.ao.quantization.quantize_dynamic(folded, {nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def serialized_nbytes(model: nn.Module) -> int:
+    """Size of the model's state dict; counts packed int8 weights, unlike parameters()."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def ensemble_accuracy(models, X_final, y_true) -> float:
+    """Majority-vote accuracy of a transaction model dict, voting as the prediction endpoint does."""
+    _, votes = run_transaction_ensemble(models, X_final)
+    predicted, _ = ensemble_vote(votes)
+    return float((predicted == y_true).mean())
+
+
+def load_gate_dataset(preprocessing, dataset: Path = GATE_DATASET):
+    """Feature matrix and encoded labels of the held-out test set."""
+    df = pd.read_csv(dataset)
+    X_final = FeaturePipeline.from_preprocessing(preprocessing).transform(df)
+    y_true = preprocessing['label_encoder'].transform(df['transaction_type'])
+    return X_final, y_true
+
+
+def evaluate_quantization_gate(registry, max_drop: float, dataset: Path = GATE_DATASET) -> QuantizationGate:
+    """
+    Compare float32 and int8 ensemble accuracy on dataset.
+
+    The eager checkpoints are loaded outside the registry so the comparison
+    never depends on which backend is currently being served.
+    """
+    if not dataset.exists():
+        return QuantizationGate(False, f"gate dataset {dataset.name} not found", max_drop)
+
+    preprocessing = registry.load_pickle('transaction_preprocessing.pkl')
+    try:
+        tabnet = registry.load_tabnet('transaction_tabnet_model.zip')
+    except Exception:
+        tabnet = None
+
+    baseline = {'tabnet': tabnet, 'device': torch.device('cpu')}
+    quantized = dict(baseline)
+    for name, (filename, model_class) in QUANTIZABLE_MODELS.items():
+        model, _ = model_export.load_checkpoint(registry.model_dir / filename, model_class)
+        baseline[name] = model
+        quantized[name] = quantize_int8(model)
+
+    X_final, y_true = load_gate_dataset(preprocessing, dataset)
+    baseline_accuracy = ensemble_accuracy(baseline, X_final, y_true)
+    quantized_accuracy = ensemble_accuracy(quantized, X_final, y_true)
+    drop = baseline_accuracy - quantized_accuracy
+
+    gate = QuantizationGate(
+        enabled=drop <= max_drop,
+        reason=(
+            f"accuracy drop {drop:.4f} {'within' if drop <= max_drop else 'exceeds'} "
+            f"allowed {max_drop:.4f}"
+        ),
+        max_drop=max_drop,
+        baseline_accuracy=round(baseline_accuracy, 4),
+        quantized_accuracy=round(quantized_accuracy, 4),
+        rows=len(y_true),
+    )
+    log = logger.info if gate.enabled else logger.warning
+    log(f"int8 quantization gate: {gate.reason}; {'serving int8' if gate.enabled else 'serving float32'}")
+    return gate
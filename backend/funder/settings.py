@@ -2,7 +2,9 @@
 Django settings for funder project.
 """
 
+import json
 import os
+from decimal import Decimal
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -243,6 +245,125 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'no-reply@example.com')
 PLAID_CLIENT_ID = os.getenv('PLAID_CLIENT_ID', '')
 PLAID_SECRET = os.getenv('PLAID_SECRET', '')
 PLAID_ENV = os.getenv('PLAID_ENV', 'sandbox')  # sandbox, development, or production
+# Overrides the PLAID_ENV host, e.g. a local fake Plaid server in development
+PLAID_HOST = os.getenv('PLAID_HOST', '')
+# One Plaid client is shared by the process (utils.plaid_service). It keeps up
+# to PLAID_POOL_MAXSIZE keep-alive connections open to the Plaid host; size it
+# to the threads calling Plaid at once (PLAID_AUTO_SYNC_WORKERS plus web
+# workers). Requests fail after the connect/read timeouts instead of hanging.
+PLAID_POOL_MAXSIZE = int(os.getenv('PLAID_POOL_MAXSIZE', '10'))
+PLAID_CONNECT_TIMEOUT_SECONDS = float(os.getenv('PLAID_CONNECT_TIMEOUT_SECONDS', '5'))
+PLAID_READ_TIMEOUT_SECONDS = float(os.getenv('PLAID_READ_TIMEOUT_SECONDS', '30'))
+# fetch_transactions backfills: transactions per /transactions/get request
+# (max 500) and requests in flight once the first page gives the total
+# (keep it within PLAID_POOL_MAXSIZE so connections are reused)
+PLAID_FETCH_PAGE_SIZE = int(os.getenv('PLAID_FETCH_PAGE_SIZE', '500'))
+PLAID_FETCH_PARALLELISM = int(os.getenv('PLAID_FETCH_PARALLELISM', '4'))
+
+# Rows per IN lookup, bulk_create/bulk_update and delete when applying a
+# /transactions/sync response (bank_accounts.sync)
+PLAID_SYNC_CHUNK_SIZE = int(os.getenv('PLAID_SYNC_CHUNK_SIZE', '1000'))
+# Sync pages downloaded ahead of the database writer
+PLAID_SYNC_PREFETCH_PAGES = int(os.getenv('PLAID_SYNC_PREFETCH_PAGES', '2'))
+
+# `python manage.py run_auto_sync` syncs accounts with auto_sync_enabled once
+# their last_sync is older than auto_sync_interval_minutes (or the default
+# below), PLAID_AUTO_SYNC_WORKERS at a time and at most
+# PLAID_AUTO_SYNC_PER_INSTITUTION per institution. A failing account waits
+# PLAID_AUTO_SYNC_BACKOFF_SECONDS * 2 ** (failures - 1), jittered and capped
+# at PLAID_AUTO_SYNC_BACKOFF_MAX_SECONDS, before it is retried.
+PLAID_AUTO_SYNC_INTERVAL_MINUTES = int(os.getenv('PLAID_AUTO_SYNC_INTERVAL_MINUTES', '360'))
+PLAID_AUTO_SYNC_WORKERS = int(os.getenv('PLAID_AUTO_SYNC_WORKERS', '4'))
+PLAID_AUTO_SYNC_PER_INSTITUTION = int(os.getenv('PLAID_AUTO_SYNC_PER_INSTITUTION', '2'))
+PLAID_AUTO_SYNC_POLL_SECONDS = float(os.getenv('PLAID_AUTO_SYNC_POLL_SECONDS', '30'))
+PLAID_AUTO_SYNC_BACKOFF_SECONDS = float(os.getenv('PLAID_AUTO_SYNC_BACKOFF_SECONDS', '60'))
+PLAID_AUTO_SYNC_BACKOFF_MAX_SECONDS = float(os.getenv('PLAID_AUTO_SYNC_BACKOFF_MAX_SECONDS', '21600'))
+
+# ============================================
+# AI MODEL SERVING
+# ============================================
+# Coalesce concurrent single-row transaction predictions into one forward pass.
+# A batch is dispatched after AI_MICROBATCH_WINDOW_MS or once it holds
+# AI_MICROBATCH_MAX_BATCH_SIZE rows, whichever comes first.
+AI_MICROBATCH_ENABLED = os.getenv('AI_MICROBATCH_ENABLED', 'True') == 'True'
+AI_MICROBATCH_WINDOW_MS = float(os.getenv('AI_MICROBATCH_WINDOW_MS', '2'))
+AI_MICROBATCH_MAX_BATCH_SIZE = int(os.getenv('AI_MICROBATCH_MAX_BATCH_SIZE', '64'))
+
+# Load and warm every model in a thread pool when a serving worker (WSGI/ASGI,
+# runserver) boots; /ready/ returns 503 until that has finished
+AI_WARMUP_ON_BOOT = os.getenv('AI_WARMUP_ON_BOOT', 'True') == 'True'
+AI_WARMUP_WORKERS = int(os.getenv('AI_WARMUP_WORKERS', '4'))
+
+# Which graph serves the DNN/ResNet/Attention models: 'eager' (nn.Module),
+# 'torchscript' or 'onnx'. Compiled graphs are written by
+# `python manage.py export_models [--onnx]` to model_store/compiled/.
+AI_INFERENCE_BACKEND = os.getenv('AI_INFERENCE_BACKEND', 'eager')
+
+# Serve the DNN/ResNet/Attention models with dynamic int8 Linear layers (eager
+# backend only). Refused at load time if ensemble accuracy on
+# final_test_dataset.csv drops by more than AI_QUANTIZE_MAX_ACCURACY_DROP.
+AI_QUANTIZE_INT8 = os.getenv('AI_QUANTIZE_INT8', 'False') == 'True'
+AI_QUANTIZE_MAX_ACCURACY_DROP = float(os.getenv('AI_QUANTIZE_MAX_ACCURACY_DROP', '0.005'))
+
+# Cache predictions of the transaction-type and flagged endpoints per
+# preprocessed feature row. 'local' is an in-process LRU; 'django' uses the
+# AI_PREDICTION_CACHE_ALIAS Django cache so workers share hits. Entries are
+# keyed by the model_store/ file contents, so replaced models never serve
+# stale predictions.
+AI_PREDICTION_CACHE_ENABLED = os.getenv('AI_PREDICTION_CACHE_ENABLED', 'True') == 'True'
+AI_PREDICTION_CACHE_BACKEND = os.getenv('AI_PREDICTION_CACHE_BACKEND', 'local')
+AI_PREDICTION_CACHE_ALIAS = os.getenv('AI_PREDICTION_CACHE_ALIAS', 'default')
+AI_PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv('AI_PREDICTION_CACHE_MAX_ENTRIES', '10000'))
+AI_PREDICTION_CACHE_TTL_SECONDS = float(os.getenv('AI_PREDICTION_CACHE_TTL_SECONDS', '300'))
+
+# Upper bound on rows accepted by /api/ai-alerts/predict/transaction/batch/
+AI_BATCH_MAX_ROWS = int(os.getenv('AI_BATCH_MAX_ROWS', '5000'))
+
+# ============================================
+# ASYNC EVENT DELIVERY
+# ============================================
+# With EVENT_DISPATCH_ASYNC, EventDispatcher events (transaction_created,
+# budget_*, potential_fraud, ...) are written to the event_outbox table in the
+# request's transaction and delivered by worker threads after commit, with
+# retries and an event_dead_letters table. Set EVENT_RUN_WORKERS_IN_PROCESS to
+# False to deliver only from `python manage.py process_events` instead.
+EVENT_DISPATCH_ASYNC = os.getenv('EVENT_DISPATCH_ASYNC', 'False') == 'True'
+EVENT_RUN_WORKERS_IN_PROCESS = os.getenv('EVENT_RUN_WORKERS_IN_PROCESS', 'True') == 'True'
+EVENT_WORKERS = int(os.getenv('EVENT_WORKERS', '2'))
+EVENT_BATCH_SIZE = int(os.getenv('EVENT_BATCH_SIZE', '20'))
+EVENT_POLL_INTERVAL_SECONDS = float(os.getenv('EVENT_POLL_INTERVAL_SECONDS', '1'))
+EVENT_MAX_ATTEMPTS = int(os.getenv('EVENT_MAX_ATTEMPTS', '5'))
+EVENT_RETRY_BACKOFF_SECONDS = float(os.getenv('EVENT_RETRY_BACKOFF_SECONDS', '2'))
+EVENT_VISIBILITY_TIMEOUT_SECONDS = float(os.getenv('EVENT_VISIBILITY_TIMEOUT_SECONDS', '300'))
+
+# ============================================
+# FRAUD VELOCITY RULES
+# ============================================
+# A single expense above FRAUD_LARGE_TRANSACTION_AMOUNT is flagged on its own.
+# Each velocity rule flags an expense above min_amount when the user already
+# had max_count such expenses in the last window_seconds; counts are kept in
+# `buckets` time buckets in the FRAUD_VELOCITY_CACHE_ALIAS cache (use a shared
+# cache in production). Override the rules with a JSON list in the
+# FRAUD_VELOCITY_RULES environment variable.
+FRAUD_LARGE_TRANSACTION_AMOUNT = Decimal(os.getenv('FRAUD_LARGE_TRANSACTION_AMOUNT', '5000'))
+FRAUD_VELOCITY_RULES = json.loads(os.getenv('FRAUD_VELOCITY_RULES', 'null')) or [
+    {'name': 'large_1h', 'window_seconds': 3600, 'min_amount': '500', 'max_count': 2, 'buckets': 60},
+    {'name': 'large_24h', 'window_seconds': 86400, 'min_amount': '500', 'max_count': 6, 'buckets': 24},
+    {'name': 'large_7d', 'window_seconds': 604800, 'min_amount': '500', 'max_count': 20, 'buckets': 28},
+]
+FRAUD_VELOCITY_CACHE_ALIAS = os.getenv('FRAUD_VELOCITY_CACHE_ALIAS', 'default')
+
+# ============================================
+# BULK TRANSACTION INGESTION AND EXPORT
+# ============================================
+# /api/transactions/bulk/ rejects batches larger than TRANSACTION_BULK_MAX_ROWS
+# and inserts accepted ones with bulk_create, TRANSACTION_BULK_CHUNK_SIZE rows
+# per INSERT statement.
+TRANSACTION_BULK_MAX_ROWS = int(os.getenv('TRANSACTION_BULK_MAX_ROWS', '10000'))
+TRANSACTION_BULK_CHUNK_SIZE = int(os.getenv('TRANSACTION_BULK_CHUNK_SIZE', '1000'))
+
+# Rows per keyset query when streaming /api/transactions/export/
+TRANSACTION_EXPORT_CHUNK_SIZE = int(os.getenv('TRANSACTION_EXPORT_CHUNK_SIZE', '2000'))
 
 # ============================================
 # SECURITY SETTINGS
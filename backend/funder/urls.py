@@ -3,17 +3,27 @@ URL configuration for funder project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from funder.views import health_check, predict_transaction, predict_transaction_test
+from funder.views import (
+    health_check,
+    inference_metrics,
+    plaid_client_metrics,
+    predict_transaction,
+    predict_transaction_test,
+    readiness_check,
+)
 
 urlpatterns = [
     # Health check endpoints
     path('', health_check, name='health'),
     path('health/', health_check, name='health'),
     path('api/health/', health_check, name='api-health'),
+    path('ready/', readiness_check, name='ready'),
     
     # AI Prediction endpoints
     path('api/predict/', predict_transaction, name='predict-transaction'),
     path('api/predict/test/', predict_transaction_test, name='predict-test'),
+    path('api/metrics/inference/', inference_metrics, name='inference-metrics'),
+    path('api/metrics/plaid/', plaid_client_metrics, name='plaid-metrics'),
     
     # Admin and app routes
     path('admin/', admin.site.urls),
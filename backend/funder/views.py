@@ -7,131 +7,45 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 import torch
-import torch.nn as nn
-import numpy as np
-import pandas as pd
-import pickle
-import os
-from pathlib import Path
+import threading
 import logging
+from .batching import MicroBatcher
+from .model_registry import get_registry, load_model_once
+from .prediction_cache import cache_stats, get_prediction_cache
+from .networks import DeepNeuralNetwork, ResidualNeuralNetwork
+from .warmup import warmup
+from utils.plaid_service import plaid_metrics
 
 logger = logging.getLogger(__name__)
 
-# ========== MODEL DEFINITIONS (Mirror from notebook) ==========
-
-class DeepNeuralNetwork(nn.Module):
-    """DNN architecture for transaction classification"""
-    def __init__(self, input_dim, num_classes):
-        super(DeepNeuralNetwork, self).__init__()
-        self.network = nn.Sequential(
-            nn.Linear(input_dim, 256), nn.BatchNorm1d(256), nn.ReLU(), nn.Dropout(0.4),
-            nn.Linear(256, 128), nn.BatchNorm1d(128), nn.ReLU(), nn.Dropout(0.4),
-            nn.Linear(128, 64), nn.BatchNorm1d(64), nn.ReLU(), nn.Dropout(0.3),
-            nn.Linear(64, num_classes)
-        )
-    
-    def forward(self, x):
-        return self.network(x)
-
-
-class ResidualBlock(nn.Module):
-    def __init__(self, input_dim, hidden_dim):
-        super(ResidualBlock, self).__init__()
-        self.fc1 = nn.Linear(input_dim, hidden_dim)
-        self.bn1 = nn.BatchNorm1d(hidden_dim)
-        self.fc2 = nn.Linear(hidden_dim, input_dim)
-        self.bn2 = nn.BatchNorm1d(input_dim)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.2)
-
-    def forward(self, x):
-        residual = x
-        out = self.fc1(x)
-        out = self.bn1(out)
-        out = self.relu(out)
-        out = self.dropout(out)
-        out = self.fc2(out)
-        out = self.bn2(out)
-        out += residual
-        out = self.relu(out)
-        return out
-
-
-class ResidualNeuralNetwork(nn.Module):
-    """ResNet architecture for transaction classification"""
-    def __init__(self, input_dim, num_classes):
-        super(ResidualNeuralNetwork, self).__init__()
-        self.input_layer = nn.Linear(input_dim, 256)
-        self.bn_input = nn.BatchNorm1d(256)
-        self.res_block1 = ResidualBlock(256, 512)
-        self.res_block2 = ResidualBlock(256, 512)
-        self.res_block3 = ResidualBlock(256, 512)
-        self.fc_out = nn.Sequential(
-            nn.Linear(256, 128),
-            nn.BatchNorm1d(128),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(128, num_classes)
-        )
-        self.relu = nn.ReLU()
-
-    def forward(self, x):
-        x = self.input_layer(x)
-        x = self.bn_input(x)
-        x = self.relu(x)
-        x = self.res_block1(x)
-        x = self.res_block2(x)
-        x = self.res_block3(x)
-        x = self.fc_out(x)
-        return x
-
-
 # ========== MODEL LOADER UTILITIES ==========
 
-MODEL_DIR = Path(settings.BASE_DIR) / "model_store"
-_loaded_models = {}
-_preprocessors = {}
-
+_batchers = {}
+_batchers_lock = threading.Lock()
 
-def load_model_once(model_key, loader_func):
-    """Cache loaded models to avoid reloading on every request"""
-    if model_key not in _loaded_models:
-        _loaded_models[model_key] = loader_func()
-    return _loaded_models[model_key]
+TRANSACTION_MODEL_ARTIFACTS = [
+    "transaction_preprocessing.pkl",
+    "transaction_dnn_model.pth",
+    "transaction_resnet_model.pth",
+]
 
 
 def load_transaction_models():
     """Load all transaction classification models"""
     try:
-        device = torch.device('cpu')
-        
-        # Load preprocessing objects
-        with open(MODEL_DIR / "transaction_preprocessing.pkl", 'rb') as f:
-            preprocessing = pickle.load(f)
-        
-        _preprocessors['transaction'] = preprocessing
-        
-        # Load DNN model
-        dnn_checkpoint = torch.load(MODEL_DIR / "transaction_dnn_model.pth", map_location=device)
-        input_dim = dnn_checkpoint['input_dim']
-        num_classes = dnn_checkpoint['num_classes']
-        
-        dnn_model = DeepNeuralNetwork(input_dim, num_classes).to(device)
-        dnn_model.load_state_dict(dnn_checkpoint['model_state_dict'])
-        dnn_model.eval()
-        
-        # Load ResNet model
-        resnet_checkpoint = torch.load(MODEL_DIR / "transaction_resnet_model.pth", map_location=device)
-        resnet_model = ResidualNeuralNetwork(input_dim, num_classes).to(device)
-        resnet_model.load_state_dict(resnet_checkpoint['model_state_dict'])
-        resnet_model.eval()
+        registry = get_registry()
+        preprocessing = registry.load_pickle("transaction_preprocessing.pkl")
+        dnn_model = registry.load_torch("transaction_dnn_model.pth", DeepNeuralNetwork)
+        resnet_model = registry.load_torch("transaction_resnet_model.pth", ResidualNeuralNetwork)
         
         return {
             'dnn': dnn_model,
             'resnet': resnet_model,
-            'input_dim': input_dim,
-            'num_classes': num_classes,
-            'device': device,
+            'input_dim': registry.checkpoint_info("transaction_dnn_model.pth")['input_dim'],
+            'num_classes': registry.checkpoint_info("transaction_dnn_model.pth")['num_classes'],
+            'device': torch.device('cpu'),
+            'preprocessing': preprocessing,
+            'pipeline': registry.load_feature_pipeline("transaction_preprocessing.pkl"),
             'label_encoder': preprocessing['label_encoder']
         }
     except Exception as e:
@@ -139,7 +53,12 @@ def load_transaction_models():
         raise
 
 
-def preprocess_transaction_data(data, preprocessing_objs):
+def get_transaction_models():
+    """The shared transaction bundle, rebuilt when one of its model files changes"""
+    return load_model_once('transaction_models', load_transaction_models, TRANSACTION_MODEL_ARTIFACTS)
+
+
+def preprocess_transaction_data(data, pipeline):
     """Convert raw transaction data to model-ready features"""
     try:
         # Extract numeric features from transaction
@@ -154,68 +73,93 @@ def preprocess_transaction_data(data, preprocessing_objs):
         else:
             over_budget_percentage = 0
         
-        # Create numeric feature array (5 features as per preprocessing)
-        numeric_features = np.array([[
-            amount,
-            is_flagged,
-            monthly_budget,
-            spent_in_category_month,
-            over_budget_percentage
-        ]], dtype=np.float32)
-        
-        # Scale numeric features
-        scaler = preprocessing_objs['scaler']
-        features_scaled = scaler.transform(numeric_features)
-        
-        # Handle categorical features if encoder exists
-        cat_encoder = preprocessing_objs.get('cat_encoder')
-        if cat_encoder is not None:
-            category = data.get('category', 'other')
-            payment_method = data.get('payment_method', 'cash')
-            
-            cat_features = np.array([[category, payment_method]])
-            cat_encoded = cat_encoder.transform(cat_features)
-            
-            # Concatenate numeric and categorical features
-            all_features = np.concatenate([features_scaled, cat_encoded], axis=1)
-        else:
-            all_features = features_scaled
+        row = {
+            'amount': amount,
+            'is_flagged': is_flagged,
+            'monthly_budget': monthly_budget,
+            'spent_in_category_month': spent_in_category_month,
+            'over_budget_percentage': over_budget_percentage,
+            'category': data.get('category', 'other'),
+            'payment_method': data.get('payment_method', 'cash'),
+        }
         
-        return torch.FloatTensor(all_features)
+        # Scale and one-hot encode straight into a float32 matrix
+        return torch.from_numpy(pipeline.transform([row]))
     except Exception as e:
         logger.error(f"Error preprocessing transaction data: {e}")
         raise
 
 
+def ensemble_logits(models, X):
+    """Average DNN and ResNet logits for an (N, F) feature tensor"""
+    return (models['dnn'](X) + models['resnet'](X)) / 2
+
+
+def get_transaction_batcher():
+    """
+    Shared MicroBatcher for the transaction ensemble, or None when disabled.
+    
+    Controlled by AI_MICROBATCH_ENABLED, AI_MICROBATCH_WINDOW_MS and
+    AI_MICROBATCH_MAX_BATCH_SIZE.
+    """
+    if not getattr(settings, 'AI_MICROBATCH_ENABLED', True):
+        return None
+    if 'transaction' not in _batchers:
+        with _batchers_lock:
+            if 'transaction' not in _batchers:
+                # Looked up per batch so a reloaded bundle is picked up
+                _batchers['transaction'] = MicroBatcher(
+                    lambda X: ensemble_logits(get_transaction_models(), X),
+                    window_ms=getattr(settings, 'AI_MICROBATCH_WINDOW_MS', 2.0),
+                    max_batch_size=getattr(settings, 'AI_MICROBATCH_MAX_BATCH_SIZE', 64),
+                    name='transaction-batcher'
+                )
+    return _batchers['transaction']
+
+
+def classify_transaction_matrix(models, X):
+    """Ensemble (label, confidence) for each row of an (N, F) feature matrix"""
+    X = torch.from_numpy(X).to(models['device'])
+    
+    # Get averaged logits from both models, coalesced with concurrent requests
+    batcher = get_transaction_batcher()
+    if batcher is not None:
+        ensemble_output = batcher.predict(X)
+    else:
+        with torch.no_grad():
+            ensemble_output = ensemble_logits(models, X)
+    
+    # Decode predictions and their confidence
+    confidence, ensemble_pred = torch.max(torch.softmax(ensemble_output, dim=1), 1)
+    labels = models['label_encoder'].inverse_transform(ensemble_pred.tolist())
+    return [(str(label), float(conf)) for label, conf in zip(labels, confidence.tolist())]
+
+
 def predict_transaction_type(transaction_data):
-    """Predict transaction type using ensemble of models"""
+    """
+    Predict transaction type using ensemble of models
+    
+    Repeated payloads (e.g. the fixed health check probe) are served from the
+    prediction cache until the models serving them change.
+    """
     try:
-        models = load_model_once('transaction_models', load_transaction_models)
+        bundle = get_registry().bundle('transaction_models', load_transaction_models, TRANSACTION_MODEL_ARTIFACTS)
+        models = bundle.obj
         
         # Preprocess data
-        X = preprocess_transaction_data(transaction_data, _preprocessors['transaction'])
-        X = X.to(models['device'])
+        X = preprocess_transaction_data(transaction_data, models['pipeline']).numpy()
         
-        # Get predictions from both models
-        with torch.no_grad():
-            dnn_output = models['dnn'](X)
-            resnet_output = models['resnet'](X)
-            
-            # Average logits and get predictions
-            ensemble_output = (dnn_output + resnet_output) / 2
-            _, ensemble_pred = torch.max(ensemble_output, 1)
-        
-        # Decode prediction
-        pred_idx = ensemble_pred.item()
-        pred_label = models['label_encoder'].inverse_transform([pred_idx])[0]
-        
-        # Get confidence
-        probabilities = torch.softmax(ensemble_output, dim=1)
-        confidence = probabilities[0][pred_idx].item()
+        cache = get_prediction_cache('funder_transaction')
+        if cache is None:
+            [(pred_label, confidence)] = classify_transaction_matrix(models, X)
+        else:
+            [(pred_label, confidence)] = cache.get_or_compute(
+                X, lambda rows: classify_transaction_matrix(models, rows), bundle.served_version
+            )
         
         return {
-            'transaction_type': str(pred_label),
-            'confidence': float(confidence),
+            'transaction_type': pred_label,
+            'confidence': confidence,
             'model': 'Ensemble (DNN + ResNet)',
             'recommendation': get_recommendation_for_type(pred_label, confidence)
         }
@@ -293,33 +237,35 @@ def predict_transaction(request):
 def health_check(request):
     """Health check endpoint with model status - LIVE MODEL VERIFICATION"""
     try:
-        # Attempt to load and verify models are operational
-        models = load_model_once('transaction_models', load_transaction_models)
-        
-        # Test a simple prediction to ensure models work
-        test_data = {
-            'amount': 50.0,
-            'is_flagged': 0,
-            'monthly_budget': 1000,
-            'spent_in_category_month': 200,
-            'over_budget_percentage': 20,
-            'category': 'food',
-            'payment_method': 'card'
-        }
+        # Don't force a load while the boot-time warm-up is still running
+        if getattr(settings, 'AI_WARMUP_ON_BOOT', True) and not warmup.is_ready():
+            models_status = 'warming_up'
+            model_info = warmup.status()
+        else:
+            # Test a simple prediction to ensure models work
+            test_data = {
+                'amount': 50.0,
+                'is_flagged': 0,
+                'monthly_budget': 1000,
+                'spent_in_category_month': 200,
+                'over_budget_percentage': 20,
+                'category': 'food',
+                'payment_method': 'card'
+            }
         
-        test_result = predict_transaction_type(test_data)
+            test_result = predict_transaction_type(test_data)
         
-        if 'error' not in test_result:
-            models_status = 'active'
-            model_info = {
-                'transaction_model': 'Ensemble (DNN + ResNet)',
-                'dnn_accuracy': '98.10%',
-                'resnet_accuracy': '98.10%',
-                'test_prediction': test_result
-            }
-        else:
-            models_status = 'error'
-            model_info = {'error': test_result.get('error')}
+            if 'error' not in test_result:
+                models_status = 'active'
+                model_info = {
+                    'transaction_model': 'Ensemble (DNN + ResNet)',
+                    'dnn_accuracy': '98.10%',
+                    'resnet_accuracy': '98.10%',
+                    'test_prediction': test_result
+                }
+            else:
+                models_status = 'error'
+                model_info = {'error': test_result.get('error')}
     
     except Exception as e:
         logger.error(f"Model verification failed: {e}")
@@ -334,11 +280,60 @@ def health_check(request):
         'available_endpoints': [
             '/api/predict/ (POST, requires auth) - Predict transaction type with LIVE AI',
             '/api/predict/test/ (POST, no auth) - Test endpoint for model verification',
-            '/health/ (GET) - Health check with model verification'
+            '/health/ (GET) - Health check with model verification',
+            '/ready/ (GET) - Readiness probe, 503 until models are warmed up'
         ]
     })
 
 
+@api_view(['GET'])
+def readiness_check(request):
+    """
+    GET /ready/
+    
+    Readiness probe for load balancers: 503 until the boot-time model
+    warm-up has finished, 200 afterwards. A "degraded" state means some
+    model failed to load; its error is listed under "models".
+    """
+    if not getattr(settings, 'AI_WARMUP_ON_BOOT', True):
+        return Response({'ready': True, 'state': 'disabled'})
+    
+    ready = warmup.is_ready()
+    return Response(
+        {'ready': ready, **warmup.status()},
+        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@api_view(['GET'])
+def inference_metrics(request):
+    """
+    GET /api/metrics/inference/
+    
+    Micro-batching metrics (queue depth, batch-size histogram, queue wait
+    times) for tuning AI_MICROBATCH_WINDOW_MS against p99 latency,
+    prediction cache hit/miss/eviction counters, plus load time and resident
+    memory of every loaded model artifact.
+    """
+    return Response({
+        'microbatch_enabled': getattr(settings, 'AI_MICROBATCH_ENABLED', True),
+        'batchers': {name: batcher.metrics() for name, batcher in _batchers.items()},
+        'prediction_cache': cache_stats(),
+        'models': get_registry().stats()
+    })
+
+
+@api_view(['GET'])
+def plaid_client_metrics(request):
+    """
+    GET /api/metrics/plaid/
+    
+    Request count, errors and latency percentiles of this process's Plaid
+    API calls, per endpoint (link_token_create, transactions_sync, ...).
+    """
+    return Response({'endpoints': plaid_metrics()})
+
+
 @api_view(['POST'])
 def predict_transaction_test(request):
     """
@@ -0,0 +1,149 @@
+"""
+Eager model warm-up at worker boot.
+
+Serving processes start a background thread that loads every model bundle
+concurrently through the ModelRegistry and runs one dummy forward pass per
+model, so the first real request does not pay for deserialization or
+first-call kernel setup. GET /ready/ returns 503 until this has finished.
+
+Only serving processes warm up: WSGI/ASGI workers call start_on_boot() from
+funder/wsgi.py and funder/asgi.py, and AiAlertsConfig.ready() calls it in
+the runserver process that handles requests. Other manage.py commands
+(migrate, shell, process_events, run_auto_sync, ...) never load the models.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_torch(model, filename):
+    from funder.model_registry import get_registry
+
+    input_dim = get_registry().checkpoint_info(filename)['input_dim']
+    with torch.no_grad():
+        model(torch.zeros(1, input_dim))
+
+
+def _warm_tabnet(model, n_features):
+    model.predict_proba(np.zeros((1, n_features), dtype=np.float32))
+
+
+def warm_transaction_models():
+    from ai_alerts.views import TRANSACTION_ARTIFACTS, load_transaction_models as load_alert_models
+    from funder.views import TRANSACTION_MODEL_ARTIFACTS, load_transaction_models as load_funder_models
+    from funder.model_registry import get_registry, load_model_once
+
+    models = load_model_once('transaction', load_alert_models, TRANSACTION_ARTIFACTS)
+    load_model_once('transaction_models', load_funder_models, TRANSACTION_MODEL_ARTIFACTS)
+    for name in ('dnn', 'resnet', 'attention'):
+        _warm_torch(models[name], f"transaction_{name}_model.pth")
+    if models['tabnet'] is not None:
+        input_dim = get_registry().checkpoint_info("transaction_dnn_model.pth")['input_dim']
+        _warm_tabnet(models['tabnet'], input_dim)
+
+
+def warm_budget_model():
+    from ai_alerts.views import BUDGET_ARTIFACTS, load_budget_model
+    from funder.model_registry import load_model_once
+
+    budget = load_model_once('budget', load_budget_model, BUDGET_ARTIFACTS)
+    _warm_tabnet(budget['model'], len(budget['metadata']['features']))
+
+
+def warm_goal_model():
+    from ai_alerts.views import GOAL_ARTIFACTS, load_goal_model
+    from funder.model_registry import load_model_once
+
+    goal = load_model_once('goal', load_goal_model, GOAL_ARTIFACTS)
+    _warm_tabnet(goal['model'], len(goal['metadata']['features']))
+
+
+def warm_flagged_model():
+    from ai_alerts.views import FLAGGED_ARTIFACTS, load_flagged_model
+    from funder.model_registry import load_model_once
+
+    flagged = load_model_once('flagged', load_flagged_model, FLAGGED_ARTIFACTS)
+    _warm_torch(flagged['model'], "flagged_transaction_dnn_model.pth")
+
+
+WARMUP_TASKS = {
+    'transaction': warm_transaction_models,
+    'budget': warm_budget_model,
+    'goal': warm_goal_model,
+    'flagged': warm_flagged_model,
+}
+
+
+class ModelWarmup:
+    """Tracks a one-shot parallel warm-up of WARMUP_TASKS."""
+
+    def __init__(self, tasks=None, max_workers=4):
+        self.tasks = WARMUP_TASKS if tasks is None else tasks
+        self.max_workers = max_workers
+        self.state = 'pending'
+        self.results = {}
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run_task(self, name, task):
+        started = time.perf_counter()
+        try:
+            task()
+            return name, {'ok': True, 'seconds': round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            logger.error(f"Warm-up of {name} model failed: {e}")
+            return name, {'ok': False, 'seconds': round(time.perf_counter() - started, 3), 'error': str(e)}
+
+    def run(self):
+        """Load and warm every model in a thread pool; blocks until all finish."""
+        self.state = 'warming'
+        self.started_at = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='model-warmup') as pool:
+            for name, result in pool.map(lambda item: self._run_task(*item), self.tasks.items()):
+                self.results[name] = result
+        self.finished_at = time.time()
+        self.state = 'ready' if all(r['ok'] for r in self.results.values()) else 'degraded'
+        self._done.set()
+        logger.info(f"Model warm-up finished ({self.state}) in {self.finished_at - self.started_at:.2f}s")
+        return self.results
+
+    def start(self):
+        """Run the warm-up on a daemon thread (idempotent)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='model-warmup', daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def is_ready(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def status(self):
+        return {
+            'state': self.state,
+            'models': dict(self.results),
+            'seconds': round(self.finished_at - self.started_at, 3) if self.finished_at else None,
+        }
+
+
+warmup = ModelWarmup(max_workers=getattr(settings, 'AI_WARMUP_WORKERS', 4))
+
+
+def start_on_boot():
+    """Start the shared warm-up when AI_WARMUP_ON_BOOT is enabled."""
+    if getattr(settings, 'AI_WARMUP_ON_BOOT', True):
+        warmup.start()
+    return warmup
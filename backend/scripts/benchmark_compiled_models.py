@@ -0,0 +1,86 @@
+"""
+Latency/throughput benchmark of the transaction networks served eagerly versus
+as folded TorchScript and ONNX graphs.
+
+The graphs are exported to a temporary copy of model_store/, so nothing is
+written next to the real checkpoints.
+
+Usage (from backend/):
+    python scripts/benchmark_compiled_models.py --batch-sizes 1 32 512 --iterations 200
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+import torch
+
+from funder import model_export
+from funder.model_registry import MODEL_DIR
+
+MODELS = ['transaction_dnn_model.pth', 'transaction_resnet_model.pth', 'transaction_attention_model.pth']
+
+
+def time_model(model, x, iterations):
+    with torch.no_grad():
+        for _ in range(10):
+            model(x)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            model(x)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 512])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=1, help='torch intra-op threads (serving default is 1 per worker)')
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    try:
+        import onnxruntime  # noqa: F401
+        with_onnx = True
+    except ImportError:
+        with_onnx = False
+        print("onnxruntime not installed; skipping the ONNX backend")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = Path(tmp)
+        for filename in MODELS:
+            shutil.copy(MODEL_DIR / filename, model_dir / filename)
+        model_export.export_model_store(model_dir, onnx=with_onnx)
+
+        print(f"{'model':<32} {'backend':<12} {'batch':>6} {'mean ms':>9} {'p99 ms':>9} {'rows/s':>12}")
+        for filename in MODELS:
+            eager, meta = model_export.load_checkpoint(model_dir / filename, model_export.EXPORTABLE_MODELS[filename])
+            backends = {'eager': eager, 'torchscript': model_export.load_torchscript(
+                model_export.torchscript_path(model_dir, filename))[0]}
+            if with_onnx:
+                backends['onnx'] = model_export.OnnxModel(model_export.onnx_path(model_dir, filename))
+
+            for batch_size in args.batch_sizes:
+                x = torch.randn(batch_size, meta['input_dim'])
+                for backend, model in backends.items():
+                    mean, p99 = time_model(model, x, args.iterations)
+                    print(f"{filename:<32} {backend:<12} {batch_size:>6} {mean * 1000:>9.3f} "
+                          f"{p99 * 1000:>9.3f} {batch_size / mean:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
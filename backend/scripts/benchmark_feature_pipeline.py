@@ -0,0 +1,60 @@
+"""
+Preprocessing benchmark: the sklearn scaler/encoder path versus FeaturePipeline
+on lists of dicts (the request payload shape) and on a DataFrame.
+
+Usage (from backend/):
+    python scripts/benchmark_feature_pipeline.py --rows 1 1000 100000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+import pandas as pd
+
+from funder.features import FeaturePipeline, sklearn_transform
+from funder.model_registry import get_registry
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 1000, 100000])
+    parser.add_argument('--preprocessing', default='transaction_preprocessing.pkl')
+    args = parser.parse_args()
+
+    preprocessing = get_registry().load_pickle(args.preprocessing)
+    pipeline = FeaturePipeline.from_preprocessing(preprocessing)
+    source = pd.read_csv(Path(__file__).resolve().parent.parent / 'final_test_dataset.csv')
+
+    print(f"{'rows':>8} {'sklearn ms':>11} {'pipeline ms':>12} {'frame ms':>9} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = source.sample(n=n_rows, replace=n_rows > len(source), random_state=0).reset_index(drop=True)
+        rows = df.to_dict('records')
+        repeats = max(3, min(200, 20000 // n_rows))
+
+        sklearn_s = best_of(lambda: sklearn_transform(rows, preprocessing), repeats)
+        pipeline_s = best_of(lambda: pipeline.transform(rows), repeats)
+        frame_s = best_of(lambda: pipeline.transform(df), repeats)
+        print(f"{n_rows:>8} {sklearn_s * 1000:>11.3f} {pipeline_s * 1000:>12.3f} "
+              f"{frame_s * 1000:>9.3f} {sklearn_s / pipeline_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Fraud rule latency for a user with a long history: the old _is_potential_fraud
+(loads the day's expenses and filters them in Python) versus the
+VelocityTracker checks (a fixed number of cache counters), warm and after a
+cold-cache rebuild.
+
+The history is written to a throwaway test database built from the models.
+
+Usage (from backend/):
+    DJANGO_SETTINGS_MODULE=tests.settings_sqlite python scripts/benchmark_fraud_velocity.py --history 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import User
+from transactions.models import Transaction
+from utils.velocity import get_velocity_tracker
+
+
+def legacy_is_potential_fraud(transaction):
+    """_is_potential_fraud before the velocity tracker, kept for comparison."""
+    recent_transactions = Transaction.objects.filter(
+        user=transaction.user,
+        date__gte=timezone.now().date() - timedelta(hours=1),
+        type='EXPENSE'
+    ).exclude(id=transaction.id)
+    large_recent = [t for t in recent_transactions if abs(t.amount) > 500]
+    if len(large_recent) >= 2 and abs(transaction.amount) > 500:
+        return True
+    if abs(transaction.amount) > 5000:
+        return True
+    return False
+
+
+def seed_history(user, n_rows, days, seed=0):
+    rng = random.Random(seed)
+    now = timezone.now()
+    rows = []
+    for _ in range(n_rows):
+        created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        rows.append(Transaction(
+            user=user, amount=Decimal(f'{rng.uniform(5, 900):.2f}'), type='EXPENSE',
+            date=created_at.date(), created_at=created_at,
+        ))
+    # Keep the generated timestamps instead of stamping every row with now
+    field = Transaction._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        Transaction.objects.bulk_create(rows, batch_size=5000)
+    finally:
+        field.auto_now_add = True
+
+
+def per_call_ms(fn, probes):
+    start = time.perf_counter()
+    for probe in probes:
+        fn(probe)
+    return (time.perf_counter() - start) * 1000 / len(probes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history', type=int, default=100000, help='Transactions already on the account')
+    parser.add_argument('--days', type=int, default=30, help='Days the history is spread over')
+    parser.add_argument('--checks', type=int, default=200)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    user = User.objects.create(first_name='Bench', last_name='User', email='velocity@example.com', username='velocity')
+    seed_history(user, args.history, args.days)
+    probes = list(Transaction.objects.filter(user=user).select_related('user').order_by('-created_at')[:args.checks])
+    tracker = get_velocity_tracker()
+
+    legacy_ms = per_call_ms(legacy_is_potential_fraud, probes)
+
+    cache.clear()
+    start = time.perf_counter()
+    tracker.is_potential_fraud(probes[0])
+    cold_ms = (time.perf_counter() - start) * 1000
+    warm_ms = per_call_ms(tracker.is_potential_fraud, probes)
+
+    mismatches = sum(legacy_is_potential_fraud(p) != tracker.is_potential_fraud(p) for p in probes)
+
+    print(f"History: {args.history} transactions over {args.days} days, {len(probes)} checks")
+    print(f"Legacy _is_potential_fraud:  {legacy_ms:9.3f} ms/check")
+    print(f"Velocity tracker (warm):     {warm_ms:9.3f} ms/check")
+    print(f"Velocity tracker (cold):     {cold_ms:9.3f} ms for the first check ({len(tracker.rules)} ring rebuilds)")
+    print(f"Speedup (warm):              {legacy_ms / warm_ms:9.1f}x")
+    print(f"Decisions differing from the legacy rule: {mismatches} "
+          f"(legacy counts the whole day, not the last hour)")
+
+
+if __name__ == '__main__':
+    main()
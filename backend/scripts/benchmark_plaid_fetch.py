@@ -0,0 +1,58 @@
+"""
+Plaid backfill benchmark: fetch_transactions paging /transactions/get one
+offset after another (parallel=1) versus fetching the remaining offsets
+concurrently once the first page gives total_transactions.
+
+Requests go over HTTP through the shared Plaid client to a local fake Plaid
+server (tests/fake_plaid.py) that sleeps --latency seconds per request, so
+the run is bound by round trips the way a multi-year backfill is.
+
+Usage (from backend/):
+    DJANGO_SETTINGS_MODULE=tests.settings_sqlite python scripts/benchmark_plaid_fetch.py --transactions 10000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+from django.test import override_settings
+
+from tests.fake_plaid import FakePlaidServer
+from utils.plaid_service import close_plaid_client, fetch_transactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.15, help='Seconds per fake Plaid request')
+    parser.add_argument('--parallel', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pages = -(-args.transactions // args.page_size)
+    with FakePlaidServer(pages=pages, page_size=args.page_size, latency=args.latency) as server, \
+            override_settings(PLAID_HOST=server.url, PLAID_CLIENT_ID='fake', PLAID_SECRET='fake',
+                              PLAID_FETCH_PAGE_SIZE=args.page_size, PLAID_POOL_MAXSIZE=max(args.parallel)):
+        print(f"{pages * args.page_size} transactions in {pages} pages, {args.latency * 1000:.0f} ms per request")
+        baseline = None
+        for parallel in args.parallel:
+            start = time.perf_counter()
+            rows = fetch_transactions('access-bench', parallel=parallel)
+            elapsed = time.perf_counter() - start
+            assert len(rows) == pages * args.page_size
+            baseline = baseline or elapsed
+            print(f"parallel={parallel:<3} {elapsed:8.3f}s  {len(rows) / elapsed:10.0f} txn/s  "
+                  f"speedup: {baseline / elapsed:5.1f}x")
+        close_plaid_client()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Plaid sync benchmark: the per-row sync (get_or_create per category,
+update_or_create per added row, get + save per modified row, delete per
+removed id, each sending the full signal stack) versus bank_accounts.sync
+(one category query, chunked bulk upsert, IN deletes, one transactions_synced
+event).
+
+sync_transactions is replaced by a local fake that first returns N added
+transactions, then a follow-up page modifying and removing a tenth of them
+each. Observers run inline in both paths, so fraud scoring and budget checks
+are included. The rows are written to a throwaway test database built from
+the models.
+
+Usage (from backend/):
+    DJANGO_SETTINGS_MODULE=tests.settings_sqlite python scripts/benchmark_plaid_sync.py --rows 5000
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import User
+from bank_accounts.models import BankAccount
+from bank_accounts.sync import sync_bank_account
+from categories.models import Category
+from transactions.models import Transaction
+
+CATEGORIES = ['Food & Dining', 'Groceries', 'Transportation', 'Shopping', 'Travel', 'Bills & Utilities', None]
+
+
+def make_pages(prefix, n_rows, seed=0):
+    """Two sync_transactions() responses in the shape format_transaction() returns."""
+    rng = random.Random(seed)
+
+    def row(i):
+        amount = round(rng.uniform(1, 400), 2)
+        return {
+            'plaid_transaction_id': f'{prefix}-{i}',
+            'date': date.today() - timedelta(days=rng.randrange(60)),
+            'description': f'Merchant {rng.randrange(300)}',
+            'amount': amount,
+            'type': 'EXPENSE' if rng.random() < 0.9 else 'INCOME',
+            'category': rng.choice(CATEGORIES),
+            'merchant_name': None,
+            'pending': False,
+            'payment_channel': 'online',
+        }
+
+    added = [row(i) for i in range(n_rows)]
+    tenth = max(1, n_rows // 10)
+    modified = [{**row(i), 'type': added[i]['type'], 'category': added[i]['category']} for i in range(tenth)]
+    removed = [added[i]['plaid_transaction_id'] for i in range(tenth, 2 * tenth)]
+    return [
+        {'added': added, 'modified': [], 'removed': [], 'next_cursor': 'c1', 'has_more': False},
+        {'added': [], 'modified': modified, 'removed': removed, 'next_cursor': 'c2', 'has_more': False},
+    ]
+
+
+def legacy_sync(bank_account, sync_data):
+    """The per-row sync this benchmark compares against."""
+    for txn_data in sync_data['added']:
+        category = None
+        if txn_data.get('category'):
+            category, _ = Category.objects.get_or_create(
+                user=bank_account.user,
+                name=txn_data['category'],
+                defaults={'type': txn_data['type']}
+            )
+        Transaction.objects.update_or_create(
+            plaid_transaction_id=txn_data['plaid_transaction_id'],
+            defaults={
+                'user': bank_account.user,
+                'bank_account': bank_account,
+                'amount': txn_data['amount'],
+                'type': txn_data['type'],
+                'description': txn_data['description'],
+                'date': txn_data['date'],
+                'category': category,
+            }
+        )
+    for txn_data in sync_data['modified']:
+        try:
+            transaction = Transaction.objects.get(plaid_transaction_id=txn_data['plaid_transaction_id'])
+            transaction.amount = txn_data['amount']
+            transaction.description = txn_data['description']
+            transaction.date = txn_data['date']
+            transaction.save()
+        except Transaction.DoesNotExist:
+            pass
+    for txn_id in sync_data['removed']:
+        Transaction.objects.filter(plaid_transaction_id=txn_id).delete()
+    bank_account.plaid_cursor = sync_data['next_cursor']
+    bank_account.last_sync = timezone.now()
+    bank_account.save()
+
+
+def make_account(email):
+    user = User.objects.create(first_name='Bench', last_name='User', email=email, username=email)
+    account = BankAccount(user=user, institution_name='Bench Bank', token=b'')
+    account.encrypt_plaid_token('access-sandbox-bench')
+    account.save()
+    return account
+
+
+def timed(pages, run):
+    elapsed = []
+    # Notification observers print every alert; keep them out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for page in pages:
+            start = time.perf_counter()
+            run(page)
+            elapsed.append(time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+
+    account = make_account('per-row@example.com')
+    legacy = timed(make_pages('legacy', args.rows), lambda page: legacy_sync(account, page))
+    legacy_rows = Transaction.objects.filter(user=account.user).count()
+
+    account = make_account('bulk@example.com')
+
+    def run(page):
+        with mock.patch('utils.plaid_service.sync_transactions', return_value=page):
+            sync_bank_account(account)
+
+    bulk = timed(make_pages('bulk', args.rows), run)
+    assert Transaction.objects.filter(user=account.user).count() == legacy_rows
+
+    print(f"Rows: {args.rows} added, then {args.rows // 10} modified and {args.rows // 10} removed")
+    for label, index in (('initial sync', 0), ('incremental', 1)):
+        print(f"{label:<13} per-row: {legacy[index]:8.3f}s  set-based: {bulk[index]:8.3f}s  "
+              f"speedup: {legacy[index] / bulk[index]:6.1f}x")
+    print(f"{'total':<13} per-row: {sum(legacy):8.3f}s  set-based: {sum(bulk):8.3f}s  "
+          f"speedup: {sum(legacy) / sum(bulk):6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Memory footprint and per-batch latency of the transaction networks in float32
+versus dynamic int8, plus the accuracy gate result that decides whether
+AI_QUANTIZE_INT8 would actually serve them.
+
+Usage (from backend/):
+    python scripts/benchmark_quantization.py --batch-sizes 1 32 512 --iterations 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+import torch
+from django.conf import settings
+
+from funder import model_export, quantization
+from funder.model_registry import ModelRegistry
+
+
+def time_model(model, x, iterations):
+    with torch.no_grad():
+        for _ in range(10):
+            model(x)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            model(x)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 512])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=1, help='torch intra-op threads (serving default is 1 per worker)')
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    registry = ModelRegistry()
+
+    max_drop = float(getattr(settings, 'AI_QUANTIZE_MAX_ACCURACY_DROP', 0.005))
+    gate = quantization.evaluate_quantization_gate(registry, max_drop)
+    print(f"Accuracy gate: float32={gate.baseline_accuracy} int8={gate.quantized_accuracy} "
+          f"on {gate.rows} rows -> {'PASS' if gate.enabled else 'REFUSED'} ({gate.reason})")
+    print()
+
+    print(f"{'model':<10} {'dtype':<8} {'memory MB':>10} {'batch':>6} {'mean ms':>9} {'p99 ms':>9} {'rows/s':>12}")
+    for name, (filename, model_class) in quantization.QUANTIZABLE_MODELS.items():
+        model, meta = model_export.load_checkpoint(registry.model_dir / filename, model_class)
+        variants = {'float32': model, 'int8': quantization.quantize_int8(model)}
+        for batch_size in args.batch_sizes:
+            x = torch.randn(batch_size, meta['input_dim'])
+            for dtype, variant in variants.items():
+                memory_mb = quantization.serialized_nbytes(variant) / (1024 * 1024)
+                mean, p99 = time_model(variant, x, args.iterations)
+                print(f"{name:<10} {dtype:<8} {memory_mb:>10.3f} {batch_size:>6} {mean * 1000:>9.3f} "
+                      f"{p99 * 1000:>9.3f} {batch_size / mean:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput benchmark: N single-row calls to predict/transaction/ versus one
+N-row call to predict/transaction/batch/.
+
+Both paths go through the DRF views (auth forced), so serialization and
+request handling overhead is included.
+
+Usage (from backend/):
+    python scripts/benchmark_transaction_batch.py --rows 1000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+import pandas as pd
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ai_alerts.views import predict_transaction_type, predict_transaction_type_batch
+
+
+def load_rows(n_rows):
+    csv_path = Path(__file__).resolve().parent.parent / 'final_test_dataset.csv'
+    df = pd.read_csv(csv_path)
+    rows = df.to_dict('records')
+    return [rows[i % len(rows)] for i in range(n_rows)]
+
+
+def call(view, path, data):
+    factory = APIRequestFactory()
+    request = factory.post(path, data, format='json')
+    force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+    response = view(request)
+    if response.status_code != 200:
+        raise RuntimeError(f'{path} failed: {response.data}')
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = load_rows(args.rows)
+
+    # Warm up model loading so it is not counted in either path
+    call(predict_transaction_type, '/api/ai-alerts/predict/transaction/', rows[0])
+
+    start = time.perf_counter()
+    for row in rows:
+        call(predict_transaction_type, '/api/ai-alerts/predict/transaction/', row)
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    call(predict_transaction_type_batch, '/api/ai-alerts/predict/transaction/batch/', {'transactions': rows})
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"Rows: {args.rows}")
+    print(f"{args.rows} x single: {single_elapsed:8.3f}s  ({args.rows / single_elapsed:10.1f} rows/s)")
+    print(f"1 x batch:    {batch_elapsed:8.3f}s  ({args.rows / batch_elapsed:10.1f} rows/s)")
+    print(f"Speedup:      {single_elapsed / batch_elapsed:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Ingestion benchmark: N Transaction saves (one INSERT and one
+transaction_created event per row, the path every existing caller takes)
+versus one POST of the same N rows to /api/transactions/bulk/ (validation,
+chunked bulk_create and one transactions_bulk_created event).
+
+Observers run inline in both paths, so fraud scoring and budget checks are
+included. The rows are written to a throwaway test database built from the
+models.
+
+Usage (from backend/):
+    DJANGO_SETTINGS_MODULE=tests.settings_sqlite python scripts/benchmark_transaction_bulk.py --rows 10000
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'funder.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from budgets.models import Budget
+from categories.models import Category
+from transactions.models import Transaction
+from transactions.views import TransactionViewSet
+
+
+def make_rows(n_rows, seed=0):
+    rng = random.Random(seed)
+    categories = ['Groceries', 'Dining', 'Transportation', None]
+    return [
+        {
+            'amount': f'{rng.uniform(1, 800):.2f}',
+            'type': 'EXPENSE' if rng.random() < 0.9 else 'INCOME',
+            'date': str(date.today() - timedelta(days=rng.randrange(28))),
+            'merchant': f'Merchant {rng.randrange(200)}',
+            'category': rng.choice(categories),
+        }
+        for _ in range(n_rows)
+    ]
+
+
+def make_user(email):
+    user = User.objects.create(first_name='Bench', last_name='User', email=email, username=email)
+    for name in ('Groceries', 'Dining', 'Transportation'):
+        category = Category.objects.create(user=user, name=name, type='EXPENSE')
+        Budget.objects.create(user=user, category=category, period='MONTHLY', amount=5000)
+    return user
+
+
+def post(view, path, user, data):
+    request = APIRequestFactory().post(path, data, format='json')
+    force_authenticate(request, user=user)
+    response = view(request)
+    if response.status_code != 201:
+        raise RuntimeError(f'{path} failed: {response.data}')
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    rows = make_rows(args.rows)
+    bulk = TransactionViewSet.as_view({'post': 'bulk'})
+
+    user = make_user('per-row@example.com')
+    categories = {c.name: c for c in Category.objects.filter(user=user)}
+    # Notification observers print every alert; keep them out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for row in rows:
+            Transaction.objects.create(user=user, **{**row, 'category': categories.get(row['category'])})
+        single_elapsed = time.perf_counter() - start
+
+    user = make_user('bulk@example.com')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        post(bulk, '/api/transactions/bulk/', user, {'transactions': rows})
+        bulk_elapsed = time.perf_counter() - start
+
+    assert Transaction.objects.filter(user=user).count() == args.rows
+
+    print(f"Rows: {args.rows}")
+    print(f"{args.rows} x Transaction.save():  {single_elapsed:8.3f}s  ({args.rows / single_elapsed:10.1f} rows/s)")
+    print(f"1 x POST /transactions/bulk/: {bulk_elapsed:8.3f}s  ({args.rows / bulk_elapsed:10.1f} rows/s)")
+    print(f"Speedup:                      {single_elapsed / bulk_elapsed:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Local stand-in for the Plaid API, for tests, benchmarks and running the
+auto-sync daemon without Plaid credentials.
+
+Serves POST /transactions/sync and /transactions/get in Plaid's JSON format,
+so the real plaid client (utils.plaid_service) talks to it over HTTP. Every
+access token is an item with `pages` pages of `page_size` synthetic
+transactions; /transactions/sync then reports no changes, and
+/transactions/get pages through the same history by offset. Latency and failures can be injected. Connections are
+kept alive and counted, to check client connection reuse.
+
+Usage (from backend/):
+    python tests/fake_plaid.py --port 8765 --latency 0.05
+    PLAID_HOST=http://127.0.0.1:8765 PLAID_CLIENT_ID=fake PLAID_SECRET=fake python manage.py run_auto_sync
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES = [['Food and Drink', 'Restaurants'], ['Shops', 'Groceries'], ['Travel', 'Taxi'], ['Transfer', 'Payroll']]
+
+API_ERROR = {
+    'error_type': 'API_ERROR',
+    'error_code': 'INTERNAL_SERVER_ERROR',
+    'error_message': 'an unexpected error occurred',
+    'display_message': None,
+    'request_id': 'fake',
+}
+
+
+def fake_transaction(transaction_id, rng):
+    category = rng.choice(CATEGORIES)
+    amount = round(rng.uniform(-1500, -500), 2) if category[0] == 'Transfer' else round(rng.uniform(2, 300), 2)
+    return {
+        'account_id': 'fake-account',
+        'account_owner': None,
+        'amount': amount,
+        'iso_currency_code': 'USD',
+        'unofficial_currency_code': None,
+        'category': category,
+        'category_id': None,
+        'check_number': None,
+        'date': str(date.today() - timedelta(days=rng.randrange(30))),
+        'datetime': None,
+        'authorized_date': None,
+        'authorized_datetime': None,
+        'location': {key: None for key in (
+            'address', 'city', 'region', 'postal_code', 'country', 'lat', 'lon', 'store_number'
+        )},
+        'name': f'Merchant {rng.randrange(100)}',
+        'merchant_name': None,
+        'payment_meta': {key: None for key in (
+            'by_order_of', 'payee', 'payer', 'payment_method', 'payment_processor', 'ppd_id', 'reason',
+            'reference_number'
+        )},
+        'payment_channel': 'in store',
+        'pending': False,
+        'pending_transaction_id': None,
+        'transaction_code': None,
+        'transaction_id': transaction_id,
+        'transaction_type': 'place',
+    }
+
+
+class FakePlaidServer:
+    """Threaded HTTP server answering /transactions/sync and /transactions/get like Plaid."""
+
+    def __init__(self, host='127.0.0.1', port=0, pages=1, page_size=25, latency=0.0,
+                 failure_rate=0.0, failing_tokens=(), seed=0):
+        """
+        Args:
+            pages: Pages of history every item returns before it is caught up
+            page_size: Transactions per page
+            latency: Seconds each request takes
+            failure_rate: Fraction of requests answered with a Plaid API error
+            failing_tokens: Access tokens whose requests always fail
+        """
+        self.pages = pages
+        self.page_size = page_size
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failing_tokens = set(failing_tokens)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.active = 0
+        self.peak_active = 0
+        self.connections = 0
+        self.requests_by_token = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-plaid', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _fails(self, access_token):
+        with self._lock:
+            return access_token in self.failing_tokens or self._rng.random() < self.failure_rate
+
+    def sync_page(self, access_token, cursor):
+        """(status, body) for one /transactions/sync request."""
+        if self._fails(access_token):
+            return 500, API_ERROR
+        rng = random.Random(f'{access_token}:{cursor}')
+        page = int(cursor.split('-')[1]) if cursor else 0
+        added = []
+        if page < self.pages:
+            added = [fake_transaction(f'{access_token}-{page}-{i}', rng) for i in range(self.page_size)]
+        next_page = min(page + 1, self.pages)
+        return 200, {
+            'added': added,
+            'modified': [],
+            'removed': [],
+            'next_cursor': f'page-{next_page}',
+            'has_more': next_page < self.pages,
+            'request_id': 'fake',
+        }
+
+    def get_page(self, access_token, offset=0, count=100):
+        """(status, body) for one /transactions/get request."""
+        if self._fails(access_token):
+            return 500, API_ERROR
+        total = self.pages * self.page_size
+        return 200, {
+            'accounts': [],
+            'transactions': [
+                fake_transaction(f'{access_token}-{i}', random.Random(f'{access_token}:{i}'))
+                for i in range(offset, min(offset + count, total))
+            ],
+            'total_transactions': total,
+            'item': {
+                'item_id': 'fake-item',
+                'webhook': None,
+                'error': None,
+                'available_products': [],
+                'billed_products': ['transactions'],
+                'consent_expiration_time': None,
+                'update_type': 'background',
+            },
+            'request_id': 'fake',
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so pooled clients reuse their connections
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                token = body.get('access_token')
+                with server._lock:
+                    server.requests += 1
+                    server.requests_by_token[token] = server.requests_by_token.get(token, 0) + 1
+                    server.active += 1
+                    server.peak_active = max(server.peak_active, server.active)
+                status, payload = 500, {'error_type': 'API_ERROR', 'error_code': 'INTERNAL_SERVER_ERROR'}
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    if self.path == '/transactions/sync':
+                        status, payload = server.sync_page(token, body.get('cursor'))
+                    elif self.path == '/transactions/get':
+                        options = body.get('options') or {}
+                        status, payload = server.get_page(token, options.get('offset', 0), options.get('count', 100))
+                    else:
+                        status, payload = 404, {'error_type': 'INVALID_REQUEST', 'error_code': 'NOT_FOUND'}
+                finally:
+                    with server._lock:
+                        server.active -= 1
+                        server.failures += status >= 400
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakePlaidServer(port=args.port, pages=args.pages, page_size=args.page_size,
+                             latency=args.latency, failure_rate=args.failure_rate)
+    print(f"Fake Plaid listening on {server.url}; Ctrl+C to stop")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
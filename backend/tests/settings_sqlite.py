@@ -5,6 +5,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
+        # Build the test schema from the models; the checked-in migrations
+        # predate the current users/transactions/budgets tables
+        'TEST': {'MIGRATE': False},
     }
 }
 
@@ -15,3 +18,9 @@ PASSWORD_HASHERS = [
 
 # Allow all origins in tests
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Load models lazily in tests instead of warming them on boot
+AI_WARMUP_ON_BOOT = False
+
+# Tests drain the event outbox explicitly instead of using background workers
+EVENT_RUN_WORKERS_IN_PROCESS = False
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from bank_accounts.models import BankAccount
+from bank_accounts.scheduler import AutoSyncScheduler
+from tests.fake_plaid import FakePlaidServer
+from transactions.models import Transaction
+
+
+def make_user(email):
+    return User.objects.create(first_name='Sync', last_name='User', email=email, username=email)
+
+
+def make_account(user, token, institution='Bank A', last_sync=None, **extra):
+    account = BankAccount(user=user, institution_name=institution, token=b'', last_sync=last_sync, **extra)
+    account.encrypt_plaid_token(token)
+    account.save()
+    return account
+
+
+class ConcurrencyProbe:
+    """Fake sync that records how many syncs overlap, overall and per institution."""
+
+    def __init__(self, duration=0.05, fail=()):
+        self.duration = duration
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.calls = []
+
+    def __call__(self, account):
+        institution = account.institution_name
+        with self.lock:
+            self.calls.append(account.id)
+            for key in (institution, '*'):
+                self.active[key] += 1
+                self.peak[key] = max(self.peak[key], self.active[key])
+        try:
+            time.sleep(self.duration)
+            if account.id in self.fail:
+                raise RuntimeError('Plaid unavailable')
+        finally:
+            with self.lock:
+                for key in (institution, '*'):
+                    self.active[key] -= 1
+
+
+@pytest.mark.django_db
+def test_due_accounts_follow_intervals_and_recent_activity(test_user):
+    now = timezone.now()
+    idle_user = make_user('idle@example.com')
+    never_synced = make_account(idle_user, 'never')
+    make_account(idle_user, 'fresh', last_sync=now - timedelta(hours=1))
+    custom = make_account(test_user, 'custom', last_sync=now - timedelta(hours=1), auto_sync_interval_minutes=30)
+    stale = make_account(idle_user, 'stale', last_sync=now - timedelta(days=2))
+    make_account(idle_user, 'disabled', auto_sync_enabled=False)
+    BankAccount.objects.create(user=idle_user, institution_name='Manual', token=b'')
+    Transaction.objects.create(user=test_user, amount=5, type='EXPENSE', date=date.today())
+
+    scheduler = AutoSyncScheduler(interval_minutes=360, sync=lambda account: None)
+    due = scheduler.due_accounts()
+
+    # The active user's account first, then by how long each has waited
+    assert [account.id for account in due] == [custom.id, never_synced.id, stale.id]
+    assert due[0].due_at == custom.last_sync + timedelta(minutes=30)
+
+
+@pytest.mark.django_db
+def test_pool_and_institution_limits_bound_concurrency(test_user):
+    for i in range(4):
+        make_account(test_user, f'a{i}', institution='Bank A')
+        make_account(test_user, f'b{i}', institution='Bank B')
+    probe = ConcurrencyProbe()
+    scheduler = AutoSyncScheduler(workers=3, per_institution=2, sync=probe)
+
+    attempted = scheduler.drain()
+    scheduler.stop()
+
+    assert attempted == 8 and len(probe.calls) == 8
+    assert probe.peak['*'] <= 3
+    assert probe.peak['Bank A'] <= 2 and probe.peak['Bank B'] <= 2
+    assert scheduler.stats()['synced'] == 8
+
+
+@pytest.mark.django_db
+def test_failed_account_backs_off_and_is_reported(test_user):
+    healthy = make_account(test_user, 'healthy')
+    broken = make_account(test_user, 'broken', institution='Bank B')
+    probe = ConcurrencyProbe(duration=0, fail={broken.id})
+    scheduler = AutoSyncScheduler(backoff_base=60, backoff_max=600, sync=probe)
+
+    scheduler.drain()
+    scheduler.stop()
+
+    due = [account.id for account in scheduler.due_accounts()]
+    assert broken.id not in due and healthy.id in due
+    stats = scheduler.stats()
+    assert (stats['synced'], stats['failed'], stats['failure_rate']) == (1, 1, 0.5)
+    assert stats['backing_off'] == 1 and stats['synced_per_minute'] > 0
+    assert set(stats['lag_seconds']) == {'p50', 'p90', 'p99', 'max'}
+
+
+def test_backoff_is_exponential_jittered_and_capped():
+    scheduler = AutoSyncScheduler(backoff_base=10, backoff_max=100, sync=lambda account: None)
+
+    for failures, capped in ((1, 10), (2, 20), (3, 40), (4, 80), (5, 100), (9, 100)):
+        delays = {scheduler.backoff_delay(failures) for _ in range(20)}
+        assert all(capped / 2 <= delay <= capped for delay in delays)
+        assert len(delays) > 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drain_syncs_accounts_from_a_fake_plaid_server(test_user):
+    accounts = [make_account(test_user, f'token-{i}', institution=f'Bank {i % 2}') for i in range(4)]
+    failing = make_account(test_user, 'token-down')
+
+    with FakePlaidServer(pages=2, page_size=5, latency=0.02, failing_tokens={'token-down'}) as server, \
+            override_settings(PLAID_HOST=server.url, PLAID_CLIENT_ID='fake', PLAID_SECRET='fake'), \
+            mock.patch('builtins.print'):
+        scheduler = AutoSyncScheduler(workers=1)
+        attempted = scheduler.drain()
+        scheduler.stop()
+
+    assert attempted == 5
+    assert Transaction.objects.filter(user=test_user).count() == 4 * 2 * 5
+    for account in accounts:
+        account.refresh_from_db()
+        assert account.plaid_cursor == 'page-2' and account.last_sync is not None
+    failing.refresh_from_db()
+    assert failing.plaid_cursor is None
+    assert scheduler.stats()['failed'] == 1
+    assert server.peak_active == 1
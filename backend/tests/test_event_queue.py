@@ -0,0 +1,179 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from database.models import DeadLetterEvent, OutboxEvent
+from transactions.models import Transaction
+from transactions.signals import TransactionAIScoringObserver
+from utils.event_queue import EventWorkerPool
+from utils.observers import EventDispatcher, Observer
+
+EVENT = 'test_queue_event'
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.received = []
+
+    def update(self, event_type, data):
+        self.received.append(data)
+
+
+class FlakyObserver(Observer):
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def update(self, event_type, data):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError('downstream unavailable')
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = EventDispatcher()
+    subscribed = []
+
+    def subscribe(observer):
+        dispatcher.subscribe(EVENT, observer)
+        subscribed.append(observer)
+        return observer
+
+    yield dispatcher, subscribe
+    for observer in subscribed:
+        dispatcher.unsubscribe(EVENT, observer)
+
+
+def make_pool(dispatcher, **options):
+    return EventWorkerPool(dispatcher, retry_backoff=0, **options)
+
+
+@pytest.mark.django_db
+def test_async_dispatch_defers_observers_until_drained(dispatcher):
+    dispatcher, subscribe = dispatcher
+    observer = subscribe(RecordingObserver())
+
+    dispatcher.dispatch(EVENT, {'amount': 12.5}, mode='async')
+
+    assert observer.received == []
+    assert OutboxEvent.objects.count() == 1
+
+    assert make_pool(dispatcher).drain() == 1
+    assert observer.received == [{'amount': 12.5}]
+    assert OutboxEvent.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_sync_dispatch_is_unchanged(dispatcher):
+    dispatcher, subscribe = dispatcher
+    observer = subscribe(RecordingObserver())
+
+    dispatcher.dispatch(EVENT, {'amount': 1}, mode='sync')
+
+    assert observer.received == [{'amount': 1}]
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_observer_is_retried_without_redelivering_others(dispatcher):
+    dispatcher, subscribe = dispatcher
+    recorder = subscribe(RecordingObserver())
+    flaky = subscribe(FlakyObserver(failures=1))
+    pool = make_pool(dispatcher)
+
+    dispatcher.dispatch(EVENT, {'n': 1}, mode='async')
+    pool.process_batch()
+
+    event = OutboxEvent.objects.get()
+    assert event.status == OutboxEvent.PENDING
+    assert event.attempts == 1
+    assert 'downstream unavailable' in event.last_error
+
+    pool.process_batch()
+
+    assert flaky.calls == 2
+    assert len(recorder.received) == 1
+    assert not OutboxEvent.objects.exists()
+    assert (pool.retried, pool.delivered) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_event_is_dead_lettered_after_max_attempts(dispatcher):
+    dispatcher, subscribe = dispatcher
+    flaky = subscribe(FlakyObserver(failures=10))
+    pool = make_pool(dispatcher, max_attempts=3)
+
+    dispatcher.dispatch(EVENT, {'n': 2}, mode='async')
+    pool.drain()
+
+    assert flaky.calls == 3
+    assert not OutboxEvent.objects.exists()
+    dead = DeadLetterEvent.objects.get()
+    assert (dead.event_type, dead.payload, dead.attempts) == (EVENT, {'n': 2}, 3)
+
+
+@pytest.mark.django_db
+def test_abandoned_claims_are_reclaimed(dispatcher):
+    dispatcher, subscribe = dispatcher
+    observer = subscribe(RecordingObserver())
+    pool = make_pool(dispatcher, visibility_timeout=60)
+
+    OutboxEvent.objects.create(
+        event_type=EVENT, payload={'n': 3}, status=OutboxEvent.PROCESSING,
+        locked_at=timezone.now() - timedelta(seconds=30)
+    )
+    assert pool.process_batch() == 0
+
+    OutboxEvent.objects.update(locked_at=timezone.now() - timedelta(seconds=120))
+    assert pool.process_batch() == 1
+    assert observer.received == [{'n': 3}]
+
+
+@pytest.mark.django_db
+def test_retry_waits_for_backoff(dispatcher):
+    dispatcher, subscribe = dispatcher
+    subscribe(FlakyObserver(failures=1))
+    pool = EventWorkerPool(dispatcher, retry_backoff=60)
+
+    dispatcher.dispatch(EVENT, {'n': 4}, mode='async')
+    pool.process_batch()
+
+    assert OutboxEvent.objects.get().available_at > timezone.now() + timedelta(seconds=30)
+    assert pool.process_batch() == 0
+
+
+@pytest.mark.django_db
+def test_failed_ai_scoring_is_retried_then_dead_lettered(dispatcher, test_user, monkeypatch):
+    dispatcher, _ = dispatcher
+    assert any(isinstance(o, TransactionAIScoringObserver) for o in dispatcher.observers_for('transaction_created'))
+    calls = []
+
+    def unavailable():
+        calls.append(1)
+        raise RuntimeError('model store unavailable')
+
+    monkeypatch.setattr('transactions.signals.get_service', unavailable)
+    with mock.patch('builtins.print'):
+        transaction = Transaction.objects.create(
+            user=test_user, amount=Decimal('42.00'), type='EXPENSE', date=date.today()
+        )
+    calls.clear()
+    pool = make_pool(dispatcher, max_attempts=2)
+
+    dispatcher.dispatch('transaction_created', {'transaction_id': transaction.get_uuid_string()}, mode='async')
+    pool.process_batch()
+
+    event = OutboxEvent.objects.get()
+    assert (event.status, event.attempts) == (OutboxEvent.PENDING, 1)
+    assert 'model store unavailable' in event.last_error
+
+    pool.drain()
+
+    assert len(calls) == 2
+    assert not OutboxEvent.objects.exists()
+    dead = DeadLetterEvent.objects.get()
+    assert (dead.event_type, dead.attempts) == ('transaction_created', 2)
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from funder.features import FeaturePipeline, sklearn_transform
+from funder.model_registry import get_registry
+
+TEST_CSV = Path(__file__).resolve().parent.parent / 'final_test_dataset.csv'
+PREPROCESSING_FILES = ['transaction_preprocessing.pkl', 'flagged_transaction_preprocessing.pkl']
+
+
+@pytest.fixture(scope='module')
+def test_frame():
+    return pd.read_csv(TEST_CSV)
+
+
+@pytest.mark.parametrize('filename', PREPROCESSING_FILES)
+def test_rows_match_sklearn(filename, test_frame):
+    preprocessing = get_registry().load_pickle(filename)
+    rows = test_frame.to_dict('records')
+
+    actual = FeaturePipeline.from_preprocessing(preprocessing).transform(rows)
+
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(actual, sklearn_transform(rows, preprocessing), rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize('filename', PREPROCESSING_FILES)
+def test_dataframe_matches_rows(filename, test_frame):
+    pipeline = get_registry().load_feature_pipeline(filename)
+    np.testing.assert_array_equal(
+        pipeline.transform(test_frame), pipeline.transform(test_frame.to_dict('records'))
+    )
+
+
+def test_missing_and_unknown_values_match_sklearn():
+    preprocessing = get_registry().load_pickle('transaction_preprocessing.pkl')
+    rows = [
+        {},
+        {'amount': '12.5', 'category': 'Groceries', 'payment_method': 'card'},
+        {'amount': 40, 'is_flagged': True, 'category': 'Food'},
+    ]
+    pipeline = FeaturePipeline.from_preprocessing(preprocessing)
+
+    expected = sklearn_transform(rows, preprocessing)
+    np.testing.assert_allclose(pipeline.transform(rows), expected, rtol=1e-6, atol=1e-6)
+    # Absent keys become NaN in a frame and must still fall back to the defaults
+    np.testing.assert_allclose(pipeline.transform(pd.DataFrame(rows)), expected, rtol=1e-6, atol=1e-6)
+
+
+def test_missing_categorical_encodes_the_same_for_frames_and_dicts():
+    pipeline = FeaturePipeline(['amount'], [0.0], [1.0], ['category'], [['food', 'missing']])
+    rows = [{'amount': 1.0}, {'amount': 2.0, 'category': 'food'}, {'amount': 3.0, 'category': 'other'}]
+
+    expected = np.array([[1, 0, 1], [2, 1, 0], [3, 0, 0]], dtype=np.float32)
+    np.testing.assert_array_equal(pipeline.transform(rows), expected)
+    # The first row's category is NaN in the frame and must encode as 'missing'
+    np.testing.assert_array_equal(pipeline.transform(pd.DataFrame(rows)), expected)
+
+
+def test_pipeline_is_compiled_once_per_artifact():
+    registry = get_registry()
+    assert (
+        registry.load_feature_pipeline('transaction_preprocessing.pkl')
+        is registry.load_feature_pipeline('transaction_preprocessing.pkl')
+    )
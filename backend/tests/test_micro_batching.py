@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+import torch
+
+from funder.batching import MicroBatcher
+
+
+def _double(X):
+    return X * 2
+
+
+def test_concurrent_rows_are_coalesced_and_resolved_in_order():
+    calls = []
+
+    def predict(X):
+        calls.append(X.shape[0])
+        return _double(X)
+
+    batcher = MicroBatcher(predict, window_ms=50, max_batch_size=16)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.predict(torch.full((1, 3), float(i)), timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.shutdown()
+
+    for i in range(16):
+        assert torch.equal(results[i], torch.full((1, 3), float(i * 2)))
+    assert sum(calls) == 16
+    assert len(calls) < 16
+
+
+def test_max_batch_size_caps_each_forward_pass():
+    calls = []
+
+    def predict(X):
+        calls.append(X.shape[0])
+        return _double(X)
+
+    batcher = MicroBatcher(predict, window_ms=200, max_batch_size=4)
+    futures = [batcher.submit(torch.ones(1, 2)) for _ in range(10)]
+    for future in futures:
+        future.result(timeout=5)
+    batcher.shutdown()
+
+    assert max(calls) <= 4
+    assert sum(calls) == 10
+
+
+def test_prediction_errors_reach_every_caller():
+    def predict(X):
+        raise ValueError('boom')
+
+    batcher = MicroBatcher(predict, window_ms=1, max_batch_size=8)
+    future = batcher.submit(torch.ones(1, 2))
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    batcher.shutdown()
+
+
+def test_metrics_report_histogram_and_wait_times():
+    batcher = MicroBatcher(_double, window_ms=1, max_batch_size=8)
+    for _ in range(3):
+        batcher.predict(torch.ones(1, 2), timeout=5)
+    metrics = batcher.metrics()
+    batcher.shutdown()
+
+    assert metrics['rows'] == 3
+    assert metrics['queue_depth'] == 0
+    assert sum(metrics['batch_size_histogram'].values()) == metrics['batches']
+    assert metrics['wait_ms']['max'] >= metrics['wait_ms']['p50'] >= 0
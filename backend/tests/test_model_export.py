@@ -0,0 +1,129 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import torch
+import torch.nn as nn
+
+from funder import model_export
+from funder.model_registry import ModelRegistry, file_sha256, get_registry
+
+TEST_CSV = Path(__file__).resolve().parent.parent / 'final_test_dataset.csv'
+TRANSACTION_MODELS = [
+    'transaction_dnn_model.pth',
+    'transaction_resnet_model.pth',
+    'transaction_attention_model.pth',
+]
+ATOL = 1e-4
+
+
+@pytest.fixture(scope='module')
+def test_features():
+    pipeline = get_registry().load_feature_pipeline('transaction_preprocessing.pkl')
+    return torch.from_numpy(pipeline.transform(pd.read_csv(TEST_CSV)))
+
+
+@pytest.fixture(scope='module')
+def exported_store(tmp_path_factory):
+    model_dir = tmp_path_factory.mktemp('model_store')
+    for filename in model_export.EXPORTABLE_MODELS:
+        shutil.copy(get_registry().model_dir / filename, model_dir / filename)
+    model_export.export_model_store(model_dir, onnx=_onnx_available())
+    return model_dir
+
+
+def _onnx_available():
+    try:
+        import onnx  # noqa: F401
+        import onnxruntime  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _eager(filename):
+    source = get_registry().model_dir / filename
+    model, _ = model_export.load_checkpoint(source, model_export.EXPORTABLE_MODELS[filename])
+    return model
+
+
+@pytest.mark.parametrize('filename', TRANSACTION_MODELS)
+def test_folding_removes_batchnorm_and_dropout(filename):
+    folded = model_export.fold_batchnorm(_eager(filename))
+    assert not any(isinstance(m, (nn.BatchNorm1d, nn.Dropout)) for m in folded.modules())
+
+
+@pytest.mark.parametrize('filename', TRANSACTION_MODELS)
+def test_torchscript_logits_match_eager(filename, exported_store, test_features):
+    traced, meta = model_export.load_torchscript(model_export.torchscript_path(exported_store, filename))
+    with torch.no_grad():
+        expected = _eager(filename)(test_features)
+        actual = traced(test_features)
+
+    assert meta['input_dim'] == test_features.shape[1]
+    torch.testing.assert_close(actual, expected, atol=ATOL, rtol=0)
+
+
+@pytest.mark.parametrize('filename', TRANSACTION_MODELS)
+def test_onnx_logits_match_eager(filename, exported_store, test_features):
+    if not _onnx_available():
+        pytest.skip('onnx/onnxruntime not installed')
+    model = model_export.OnnxModel(model_export.onnx_path(exported_store, filename))
+    with torch.no_grad():
+        expected = _eager(filename)(test_features)
+    torch.testing.assert_close(model(test_features), expected, atol=ATOL, rtol=0)
+
+
+def test_registry_serves_torchscript_backend(settings, exported_store, test_features):
+    settings.AI_INFERENCE_BACKEND = 'torchscript'
+    registry = ModelRegistry(exported_store)
+
+    model = registry.load_torch('transaction_dnn_model.pth', model_export.DeepNeuralNetwork)
+
+    assert isinstance(model, torch.jit.ScriptModule)
+    assert registry.checkpoint_info('transaction_dnn_model.pth')['input_dim'] == test_features.shape[1]
+    assert registry.stats()['artifacts'][0]['kind'] == 'torchscript'
+
+
+def test_registry_falls_back_to_eager_without_export(settings, tmp_path):
+    settings.AI_INFERENCE_BACKEND = 'torchscript'
+    shutil.copy(get_registry().model_dir / 'transaction_dnn_model.pth', tmp_path)
+    registry = ModelRegistry(tmp_path)
+
+    model = registry.load_torch('transaction_dnn_model.pth', model_export.DeepNeuralNetwork)
+
+    assert isinstance(model, model_export.DeepNeuralNetwork)
+
+
+def test_export_records_checkpoint_hash(exported_store):
+    filename = 'transaction_dnn_model.pth'
+    _, meta = model_export.load_torchscript(model_export.torchscript_path(exported_store, filename))
+    assert meta['source_sha256'] == file_sha256(exported_store / filename)
+
+
+@pytest.mark.parametrize('backend', ['torchscript', 'onnx'])
+def test_registry_refuses_export_of_retrained_checkpoint(settings, tmp_path, exported_store, test_features,
+                                                         backend):
+    if backend == 'onnx' and not _onnx_available():
+        pytest.skip('onnx/onnxruntime not installed')
+    settings.AI_INFERENCE_BACKEND = backend
+    filename = 'transaction_dnn_model.pth'
+    model_dir = tmp_path / 'model_store'
+    shutil.copytree(exported_store, model_dir)
+    registry = ModelRegistry(model_dir)
+    compiled = registry.load_torch(filename, model_export.DeepNeuralNetwork)
+    assert not isinstance(compiled, model_export.DeepNeuralNetwork)
+
+    # "Retrain" the checkpoint without rerunning export_models
+    checkpoint = torch.load(model_dir / filename, map_location='cpu')
+    for tensor in checkpoint['model_state_dict'].values():
+        if tensor.is_floating_point():
+            tensor.add_(0.5)
+    torch.save(checkpoint, model_dir / filename)
+
+    model = registry.load_torch(filename, model_export.DeepNeuralNetwork)
+    assert isinstance(model, model_export.DeepNeuralNetwork)
+    retrained, _ = model_export.load_checkpoint(model_dir / filename, model_export.DeepNeuralNetwork)
+    with torch.no_grad():
+        torch.testing.assert_close(model(test_features), retrained(test_features))
@@ -0,0 +1,71 @@
+import shutil
+import threading
+
+from funder.model_registry import ModelRegistry, get_registry
+from funder.networks import DeepNeuralNetwork, ResidualNeuralNetwork
+
+
+def test_both_view_modules_share_model_objects():
+    from ai_alerts.views import load_transaction_models as load_alert_models
+    from funder.views import load_transaction_models as load_funder_models
+
+    alert_models = load_alert_models()
+    funder_models = load_funder_models()
+
+    assert alert_models['dnn'] is funder_models['dnn']
+    assert alert_models['resnet'] is funder_models['resnet']
+    assert alert_models['preprocessing'] is funder_models['preprocessing']
+
+
+def test_identical_artifacts_are_loaded_once(tmp_path):
+    source = get_registry().model_dir / 'transaction_dnn_model.pth'
+    shutil.copy(source, tmp_path / 'a.pth')
+    shutil.copy(source, tmp_path / 'b.pth')
+
+    registry = ModelRegistry(tmp_path)
+    first = registry.load_torch('a.pth', DeepNeuralNetwork)
+    second = registry.load_torch('b.pth', DeepNeuralNetwork)
+
+    assert first is second
+    assert len(registry.stats()['artifacts']) == 1
+
+
+def test_handles_are_read_only_eval_modules():
+    model = get_registry().load_torch('transaction_dnn_model.pth', DeepNeuralNetwork)
+    assert not model.training
+    assert not any(p.requires_grad for p in model.parameters())
+
+
+def test_concurrent_bundle_requests_build_once():
+    registry = ModelRegistry()
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def factory():
+        calls.append(1)
+        return {'dnn': registry.load_torch('transaction_dnn_model.pth', DeepNeuralNetwork)}
+
+    def worker():
+        barrier.wait()
+        registry.get_or_create('transaction', factory)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+
+
+def test_stats_report_load_time_and_memory():
+    registry = ModelRegistry()
+    registry.load_pickle('transaction_preprocessing.pkl')
+    registry.load_torch('transaction_resnet_model.pth', ResidualNeuralNetwork)
+
+    stats = registry.stats()
+    names = {a['name'] for a in stats['artifacts']}
+    assert names == {'transaction_preprocessing.pkl', 'transaction_resnet_model.pth'}
+    resnet = next(a for a in stats['artifacts'] if a['name'] == 'transaction_resnet_model.pth')
+    assert resnet['resident_mb'] > 1
+    assert resnet['load_seconds'] >= 0
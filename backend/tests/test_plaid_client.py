@@ -0,0 +1,118 @@
+import threading
+from datetime import date
+
+import pytest
+import urllib3
+from django.test import override_settings
+
+from tests.fake_plaid import FakePlaidServer
+from utils import plaid_service
+from utils.plaid_service import (
+    close_plaid_client, fetch_transactions, get_plaid_client, iter_transaction_pages, plaid_metrics, sync_transactions,
+)
+
+
+@pytest.fixture
+def fake_plaid():
+    """A local Plaid stub the shared client points at, with fresh client and metrics."""
+    close_plaid_client()
+    plaid_service.metrics.reset()
+    with FakePlaidServer(pages=3, page_size=2) as server, \
+            override_settings(PLAID_HOST=server.url, PLAID_CLIENT_ID='fake', PLAID_SECRET='fake'):
+        yield server
+        close_plaid_client()
+
+
+def test_calls_reuse_one_client_and_connection(fake_plaid):
+    client = get_plaid_client()
+    cursor = None
+    for _ in range(5):
+        cursor = sync_transactions('token-a', cursor)['next_cursor']
+
+    assert get_plaid_client() is client
+    assert fake_plaid.requests == 5
+    assert fake_plaid.connections == 1
+
+
+def test_threads_share_the_pool(fake_plaid):
+    with override_settings(PLAID_POOL_MAXSIZE=2):
+        errors = []
+
+        def worker(token):
+            try:
+                for _ in range(3):
+                    sync_transactions(token)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(f'token-{i}',)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert not errors
+    assert fake_plaid.requests == 12
+    # Connections beyond the pool size are opened but not kept
+    assert fake_plaid.connections < 12
+
+
+def test_settings_change_rebuilds_and_close_releases(fake_plaid):
+    client = get_plaid_client()
+    with override_settings(PLAID_POOL_MAXSIZE=3):
+        rebuilt = get_plaid_client()
+        assert rebuilt is not client
+        assert rebuilt.api_client.configuration.connection_pool_maxsize == 3
+
+    close_plaid_client()
+    assert plaid_service._client is None
+    assert get_plaid_client() is not rebuilt
+
+
+def test_metrics_record_latency_and_errors_per_endpoint(fake_plaid):
+    fake_plaid.latency = 0.02
+    sync_transactions('token-a')
+    sync_transactions('token-a', 'page-1')
+    fake_plaid.failing_tokens.add('token-down')
+    with pytest.raises(Exception, match='INTERNAL_SERVER_ERROR'):
+        sync_transactions('token-down')
+
+    stats = plaid_metrics()['transactions_sync']
+    assert (stats['count'], stats['errors']) == (3, 1)
+    assert stats['p50_ms'] >= 20 and stats['max_ms'] >= stats['p95_ms'] >= stats['p50_ms']
+
+
+def test_read_timeout_fails_fast(fake_plaid):
+    fake_plaid.latency = 0.5
+    with override_settings(PLAID_READ_TIMEOUT_SECONDS=0.1):
+        with pytest.raises(urllib3.exceptions.ReadTimeoutError):
+            sync_transactions('token-a')
+
+    assert plaid_metrics()['transactions_sync']['errors'] == 1
+
+
+@pytest.mark.parametrize('parallel', [1, 4])
+def test_fetch_transactions_pages_in_order(fake_plaid, parallel):
+    fake_plaid.pages, fake_plaid.page_size = 7, 30
+    with override_settings(PLAID_FETCH_PAGE_SIZE=50):
+        rows = fetch_transactions('token-a', parallel=parallel)
+
+    assert [row['plaid_transaction_id'] for row in rows] == [f'token-a-{i}' for i in range(210)]
+    assert all(isinstance(row['date'], date) for row in rows)
+    # One request for the total, then ceil(160 / 50) more
+    assert fake_plaid.requests == 5
+
+
+def test_parallel_fetch_bounds_requests_in_flight(fake_plaid):
+    fake_plaid.pages, fake_plaid.page_size, fake_plaid.latency = 10, 10, 0.05
+    pages = list(iter_transaction_pages('token-a', page_size=10, parallel=3))
+
+    assert [len(page) for page in pages] == [10] * 10
+    assert fake_plaid.peak_active == 3
+
+
+def test_fetch_error_stops_paging(fake_plaid):
+    fake_plaid.failure_rate = 1.0
+    with pytest.raises(Exception, match='Failed to fetch transactions'):
+        fetch_transactions('token-a', parallel=4)
+    assert fake_plaid.requests == 1
@@ -0,0 +1,238 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import plaid
+import pytest
+
+from bank_accounts.models import BankAccount
+from bank_accounts.sync import MUTATION_DURING_PAGINATION, SYNCED_EVENT, apply_sync, prefetch, sync_bank_account
+from budgets.aggregates import find_spending_drift, spent_amount
+from categories.models import Category
+from transactions.models import Transaction
+from utils.observers import Observer
+from utils.signals import dispatcher
+from utils.strategies import NotificationContext
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.received = []
+
+    def update(self, event_type, data):
+        self.received.append((event_type, data))
+
+
+@pytest.fixture
+def events():
+    observer = RecordingObserver()
+    event_types = ['transaction_created', SYNCED_EVENT]
+    for event_type in event_types:
+        dispatcher.subscribe(event_type, observer)
+    yield observer.received
+    for event_type in event_types:
+        dispatcher.unsubscribe(event_type, observer)
+
+
+@pytest.fixture
+def bank_account(test_user):
+    account = BankAccount(user=test_user, institution_name='Test Bank', token=b'')
+    account.encrypt_plaid_token('access-sandbox-token')
+    account.save()
+    return account
+
+
+def plaid_row(plaid_id, amount, category='Groceries', type='EXPENSE', day=None, description=None):
+    return {
+        'plaid_transaction_id': plaid_id,
+        'date': day or date.today(),
+        'description': description or f'Purchase {plaid_id}',
+        'amount': amount,
+        'type': type,
+        'category': category,
+    }
+
+
+def sync_response(added=(), modified=(), removed=(), cursor='cursor-1'):
+    return {'added': list(added), 'modified': list(modified), 'removed': list(removed),
+            'next_cursor': cursor, 'has_more': False}
+
+
+@pytest.mark.django_db
+def test_added_rows_are_inserted_with_one_event(bank_account, test_user, test_category, events):
+    rows = [plaid_row(f'p{i}', 10.5 + i, category='Groceries' if i % 2 else 'Travel') for i in range(6)]
+
+    result = apply_sync(bank_account, sync_response(added=rows))
+
+    assert len(result.created) == 6 and result.updated == [] and result.synced_count == 6
+    stored = {t.plaid_transaction_id: t for t in Transaction.objects.filter(user=test_user)}
+    assert stored['p1'].amount == Decimal('11.50')
+    assert bytes(stored['p1'].category_id) == bytes(test_category.id)
+    assert stored['p0'].bank_account_id == bank_account.id
+    # Missing categories are created once, not once per row
+    assert Category.objects.filter(user=test_user, name='Travel').count() == 1
+    assert [event_type for event_type, _ in events] == [SYNCED_EVENT]
+    assert sorted(events[0][1]['transaction_ids']) == sorted(result.created)
+
+
+@pytest.mark.django_db
+def test_resync_upserts_modifies_and_removes(bank_account, test_user, test_category):
+    apply_sync(bank_account, sync_response(added=[plaid_row('a', 20), plaid_row('b', 30), plaid_row('c', 40)]))
+
+    result = apply_sync(bank_account, sync_response(
+        added=[plaid_row('a', 25), plaid_row('d', 5)],
+        modified=[plaid_row('b', 35, description='Corrected'), plaid_row('unknown', 1)],
+        removed=['c', 'never-synced'],
+    ))
+
+    stored = {t.plaid_transaction_id: t for t in Transaction.objects.filter(user=test_user)}
+    assert set(stored) == {'a', 'b', 'd'}
+    assert stored['a'].amount == Decimal('25.00')
+    assert (stored['b'].amount, stored['b'].description) == (Decimal('35.00'), 'Corrected')
+    assert len(result.created) == 1 and len(result.updated) == 2 and len(result.removed) == 1
+    assert spent_amount(test_user.id, test_category.id, 'MONTHLY') == Decimal('65.00')
+    assert find_spending_drift(test_user.id) == []
+
+
+@pytest.mark.django_db
+def test_synced_rows_are_categorized_and_large_ones_notified(bank_account, test_user, monkeypatch):
+    notifications = []
+    monkeypatch.setattr(NotificationContext, 'notify',
+                        lambda self, recipient, subject, message, **kwargs: notifications.append((recipient, subject)))
+    rows = [plaid_row('k', 20, category=None, description='Kroger weekly'),
+            plaid_row('big', 750, category=None, description='Laptop')]
+
+    apply_sync(bank_account, sync_response(added=rows))
+
+    stored = {t.plaid_transaction_id: t for t in Transaction.objects.select_related('category').filter(user=test_user)}
+    assert stored['k'].category.name == 'Groceries'
+    assert stored['big'].category_id is None
+    assert notifications == [(str(test_user.id), 'Large Expense Detected')]
+    assert find_spending_drift(test_user.id) == []
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_rows(bank_account, test_category, django_assert_max_num_queries):
+    apply_sync(bank_account, sync_response(added=[plaid_row('warm', 1)]))
+    rows = [plaid_row(f'q{i}', 1 + i % 50) for i in range(300)]
+
+    with mock.patch('builtins.print'), django_assert_max_num_queries(25):
+        apply_sync(bank_account, sync_response(added=rows, removed=['warm']))
+
+
+NEVER = object()
+
+
+class StubPlaidClient:
+    """Replays recorded /transactions/sync responses, keyed by the request cursor."""
+
+    def __init__(self, pages, fail_at=NEVER, error_body=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.error_body = error_body
+        self.cursors = []
+
+    def transactions_sync(self, request, **kwargs):
+        cursor = request.get('cursor')
+        self.cursors.append(cursor)
+        if cursor == self.fail_at:
+            error = plaid.ApiException(status=400, reason='Bad Request')
+            error.body = self.error_body
+            raise error
+        return self.pages[cursor]
+
+
+def recorded(transaction_id, amount, name='Coffee', category=('Food and Drink',)):
+    return {'transaction_id': transaction_id, 'amount': amount, 'date': date.today(),
+            'name': name, 'category': list(category)}
+
+
+RECORDED_PAGES = {
+    None: {'added': [recorded('t1', 4.5), recorded('t2', 12)], 'modified': [], 'removed': [],
+           'next_cursor': 'c1', 'has_more': True},
+    'c1': {'added': [recorded('t3', 80, category=('Travel',))], 'modified': [recorded('t1', 5, name='Coffee+')],
+           'removed': [], 'next_cursor': 'c2', 'has_more': True},
+    'c2': {'added': [recorded('t4', -1500, name='Payroll', category=())], 'modified': [],
+           'removed': [{'transaction_id': 't2'}], 'next_cursor': 'c3', 'has_more': False},
+}
+
+
+def plaid_ids(user):
+    return set(Transaction.objects.filter(user=user).values_list('plaid_transaction_id', flat=True))
+
+
+@pytest.mark.django_db
+def test_sync_follows_has_more_to_the_last_page(bank_account, test_user, events):
+    client = StubPlaidClient(RECORDED_PAGES)
+
+    with mock.patch('utils.plaid_service.get_plaid_client', return_value=client):
+        result = sync_bank_account(bank_account)
+
+    assert client.cursors == [None, 'c1', 'c2']
+    assert plaid_ids(test_user) == {'t1', 't3', 't4'}
+    assert Transaction.objects.get(plaid_transaction_id='t1').description == 'Coffee+'
+    assert Transaction.objects.get(plaid_transaction_id='t4').type == 'INCOME'
+    bank_account.refresh_from_db()
+    assert bank_account.plaid_cursor == 'c3' and bank_account.last_sync is not None
+    assert len(result.created) == 4 and len(result.removed) == 1
+    assert [event_type for event_type, _ in events] == [SYNCED_EVENT] * 3
+
+
+@pytest.mark.django_db
+def test_failed_page_resumes_after_the_last_committed_page(bank_account, test_user):
+    failing = StubPlaidClient(RECORDED_PAGES, fail_at='c2')
+    with mock.patch('utils.plaid_service.get_plaid_client', return_value=failing):
+        with pytest.raises(Exception, match='Failed to sync transactions'):
+            sync_bank_account(bank_account)
+
+    bank_account.refresh_from_db()
+    assert bank_account.plaid_cursor == 'c2'
+    assert plaid_ids(test_user) == {'t1', 't2', 't3'}
+
+    healthy = StubPlaidClient(RECORDED_PAGES)
+    with mock.patch('utils.plaid_service.get_plaid_client', return_value=healthy):
+        sync_bank_account(bank_account)
+
+    assert healthy.cursors == ['c2']
+    bank_account.refresh_from_db()
+    assert bank_account.plaid_cursor == 'c3'
+    assert plaid_ids(test_user) == {'t1', 't3', 't4'}
+    assert find_spending_drift(test_user.id) == []
+
+
+@pytest.mark.django_db
+def test_mutation_during_pagination_restarts_the_update(bank_account, test_user):
+    client = StubPlaidClient(RECORDED_PAGES, fail_at='c1', error_body='{"error_code": "%s"}' % MUTATION_DURING_PAGINATION)
+
+    with mock.patch('utils.plaid_service.get_plaid_client', return_value=client):
+        with pytest.raises(Exception):
+            sync_bank_account(bank_account)
+
+    bank_account.refresh_from_db()
+    assert bank_account.plaid_cursor is None
+    assert plaid_ids(test_user) == {'t1', 't2'}
+
+
+def test_prefetch_is_bounded_and_stops_with_the_consumer():
+    produced = []
+
+    def pages():
+        for number in range(100):
+            produced.append(number)
+            yield number
+
+    iterator = prefetch(pages(), depth=2)
+    assert next(iterator) == 0
+    iterator.close()
+
+    # One item handed out, two buffered, one waiting to be put
+    assert len(produced) <= 4
+
+
+def test_prefetch_reraises_producer_errors():
+    def pages():
+        yield 1
+        raise ValueError('page 2 failed')
+
+    with pytest.raises(ValueError, match='page 2 failed'):
+        list(prefetch(pages(), depth=1))
@@ -0,0 +1,169 @@
+import pickle
+import shutil
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from funder import model_registry, prediction_cache
+from funder.model_registry import ModelRegistry, get_registry
+from funder.prediction_cache import DjangoCacheBackend, LocalLRUCache, PredictionCache
+
+
+@pytest.fixture
+def artifact_registry(tmp_path):
+    (tmp_path / 'model.pkl').write_bytes(pickle.dumps({'weights': 'v1'}))
+    return ModelRegistry(tmp_path)
+
+
+@pytest.fixture
+def fresh_caches():
+    prediction_cache._caches.clear()
+    yield
+    prediction_cache._caches.clear()
+
+
+def counting_compute(calls):
+    def compute(X):
+        calls.append(len(X))
+        return [float(row.sum()) for row in X]
+    return compute
+
+
+def test_only_uncached_rows_are_computed():
+    cache = PredictionCache('test', LocalLRUCache())
+    calls = []
+    X = np.arange(12, dtype=np.float32).reshape(4, 3)
+
+    first = cache.get_or_compute(X[:2], counting_compute(calls), 'v1')
+    second = cache.get_or_compute(X, counting_compute(calls), 'v1')
+
+    assert second[:2] == first
+    assert second == [float(row.sum()) for row in X]
+    assert calls == [2, 2]
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_negative_zero_shares_a_key():
+    cache = PredictionCache('test', LocalLRUCache())
+    assert cache.keys(np.array([[0.0, 1.0]]), 'v1') == cache.keys(np.array([[-0.0, 1.0]]), 'v1')
+
+
+def test_lru_evicts_least_recently_used():
+    backend = LocalLRUCache(max_entries=2)
+    backend.set_many({'a': 1, 'b': 2})
+    backend.get_many(['a'])
+    backend.set_many({'c': 3})
+
+    assert backend.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+    assert backend.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl():
+    backend = LocalLRUCache(ttl_seconds=0)
+    backend.set_many({'a': 1})
+
+    assert backend.get_many(['a']) == {}
+    assert backend.stats()['expirations'] == 1
+
+
+def test_new_model_version_invalidates_entries():
+    cache = PredictionCache('test', LocalLRUCache())
+    calls = []
+    X = np.ones((1, 3), dtype=np.float32)
+
+    cache.get_or_compute(X, counting_compute(calls), 'v1')
+    cache.get_or_compute(X, counting_compute(calls), 'v2')
+
+    assert calls == [1, 1]
+    assert cache.invalidations == 1
+
+
+def test_changed_model_file_rebuilds_bundle(artifact_registry):
+    def factory():
+        return artifact_registry.load_pickle('model.pkl')
+
+    first = artifact_registry.bundle('model', factory, ['model.pkl'])
+    assert artifact_registry.bundle('model', factory, ['model.pkl']) is first
+    (artifact_registry.model_dir / 'model.pkl').write_bytes(pickle.dumps({'weights': 'v2, retrained'}))
+    second = artifact_registry.bundle('model', factory, ['model.pkl'])
+
+    assert second.obj == {'weights': 'v2, retrained'}
+    assert second.served_version != first.served_version
+
+
+def test_django_backend_shares_hits_between_caches():
+    X = np.ones((2, 3), dtype=np.float32)
+    calls = []
+    worker_a = PredictionCache('shared', DjangoCacheBackend())
+    worker_b = PredictionCache('shared', DjangoCacheBackend())
+
+    worker_a.get_or_compute(X, counting_compute(calls), 'v1')
+    worker_b.get_or_compute(X, counting_compute(calls), 'v1')
+
+    assert calls == [2]
+    assert worker_b.hits == 2
+
+
+def test_repeated_transaction_payloads_hit_the_cache(fresh_caches):
+    from ai_alerts.views import predict_transaction_rows
+
+    row = {'amount': 42.0, 'category': 'Food', 'payment_method': 'card', 'monthly_budget': 500}
+    first = predict_transaction_rows([row])
+    second = predict_transaction_rows([dict(row), dict(row, amount=43.0)])
+
+    assert second[0] == first[0]
+    stats = prediction_cache.cache_stats()['transaction']
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_repeated_health_checks_hit_the_cache(settings, fresh_caches):
+    from funder import views
+    settings.AI_WARMUP_ON_BOOT = False
+
+    first = views.health_check(APIRequestFactory().get('/health/'))
+    second = views.health_check(APIRequestFactory().get('/health/'))
+
+    assert first.data['models_status'] == 'active', first.data
+    assert second.data['model_info']['test_prediction'] == first.data['model_info']['test_prediction']
+    stats = prediction_cache.cache_stats()['funder_transaction']
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_cache_can_be_disabled(settings, fresh_caches):
+    settings.AI_PREDICTION_CACHE_ENABLED = False
+    assert prediction_cache.get_prediction_cache('transaction') is None
+
+
+def test_swapped_model_file_changes_cached_predictions(settings, tmp_path, monkeypatch, fresh_caches):
+    from ai_alerts import views
+    settings.AI_PREDICTION_CACHE_BACKEND = 'django'
+    for filename in views.FLAGGED_ARTIFACTS:
+        shutil.copy(get_registry().model_dir / filename, tmp_path / filename)
+    monkeypatch.setattr(model_registry, '_registry', ModelRegistry(tmp_path))
+
+    def predict():
+        request = APIRequestFactory().post('/api/ai/predict-flagged/', {'amount': 420.0, 'category': 'Food'},
+                                           format='json')
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        response = views.predict_flagged_transaction(request)
+        assert response.data['success'], response.data
+        return response.data['risk_score']
+
+    before = predict()
+    assert predict() == before
+
+    # Retrain: same architecture, different weights
+    path = tmp_path / 'flagged_transaction_dnn_model.pth'
+    checkpoint = torch.load(path, map_location='cpu')
+    for tensor in checkpoint['model_state_dict'].values():
+        if tensor.is_floating_point():
+            tensor.mul_(-1.5)
+    torch.save(checkpoint, path)
+
+    after = predict()
+    assert after != before
+    stats = prediction_cache.cache_stats()['flagged']
+    assert (stats['hits'], stats['misses']) == (1, 2)
@@ -0,0 +1,66 @@
+import torch
+import torch.nn as nn
+from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+
+from funder import model_export, quantization
+from funder.model_registry import ModelRegistry, get_registry
+from funder.networks import DeepNeuralNetwork, ResidualNeuralNetwork
+
+
+def test_quantize_int8_replaces_every_linear():
+    model, _ = model_export.load_checkpoint(
+        get_registry().model_dir / 'transaction_resnet_model.pth', ResidualNeuralNetwork
+    )
+    quantized = quantization.quantize_int8(model)
+
+    assert not any(type(m) is nn.Linear for m in quantized.modules())
+    assert any(isinstance(m, DynamicQuantizedLinear) for m in quantized.modules())
+    assert quantization.serialized_nbytes(quantized) < quantization.serialized_nbytes(model)
+
+
+def test_quantized_predictions_track_float32():
+    model, meta = model_export.load_checkpoint(
+        get_registry().model_dir / 'transaction_dnn_model.pth', DeepNeuralNetwork
+    )
+    x = torch.randn(256, meta['input_dim'])
+    with torch.no_grad():
+        expected = model(x).argmax(dim=1)
+        actual = quantization.quantize_int8(model)(x).argmax(dim=1)
+    assert (expected == actual).float().mean() > 0.95
+
+
+def test_registry_serves_int8_when_gate_passes(settings):
+    settings.AI_QUANTIZE_INT8 = True
+    settings.AI_QUANTIZE_MAX_ACCURACY_DROP = 0.01
+    registry = ModelRegistry()
+
+    model = registry.load_torch('transaction_dnn_model.pth', DeepNeuralNetwork)
+
+    gate = registry.quantization_gate()
+    assert gate.enabled
+    assert gate.rows > 0
+    assert any(isinstance(m, DynamicQuantizedLinear) for m in model.modules())
+    assert registry.checkpoint_info('transaction_dnn_model.pth')['input_dim'] == 19
+    assert registry.stats()['quantization']['enabled']
+
+
+def test_registry_refuses_int8_when_accuracy_drops_too_far(settings):
+    settings.AI_QUANTIZE_INT8 = True
+    # A negative budget cannot be met, so the gate must fall back to float32
+    settings.AI_QUANTIZE_MAX_ACCURACY_DROP = -1.0
+    registry = ModelRegistry()
+
+    model = registry.load_torch('transaction_dnn_model.pth', DeepNeuralNetwork)
+
+    assert not registry.quantization_gate().enabled
+    assert isinstance(model, DeepNeuralNetwork)
+
+
+def test_flagged_model_is_never_quantized(settings):
+    settings.AI_QUANTIZE_INT8 = True
+    registry = ModelRegistry()
+    registry._quantization_gate = quantization.QuantizationGate(True, 'forced', 0.0)
+
+    model = registry.load_torch('flagged_transaction_dnn_model.pth', DeepNeuralNetwork)
+
+    assert isinstance(model, DeepNeuralNetwork)
@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from budgets.aggregates import find_spending_drift, period_start, spent_amount
+from budgets.models import SpendingAggregate
+from categories.models import Category
+from transactions.bulk import bulk_insert_transactions
+from transactions.models import Transaction
+
+
+def expense(user, category, amount, day=None):
+    return Transaction.objects.create(
+        user=user, category=category, amount=Decimal(amount), type='EXPENSE', date=day or date.today()
+    )
+
+
+def monthly(user, category, day=None):
+    return spent_amount(user.id, category.id, 'MONTHLY', day)
+
+
+@pytest.mark.django_db
+def test_inserts_updates_and_deletes_keep_totals_exact(test_user, test_category):
+    other = Category.objects.create(user=test_user, name='Dining', type='EXPENSE')
+    last_month = period_start(date.today(), 'MONTHLY') - timedelta(days=1)
+
+    first = expense(test_user, test_category, '40.00')
+    second = expense(test_user, test_category, '60.00')
+    assert monthly(test_user, test_category) == Decimal('100.00')
+
+    second.amount = Decimal('75.50')
+    second.save()
+    first.category = other
+    first.save()
+    second.date = last_month
+    second.save()
+
+    assert monthly(test_user, test_category) == Decimal('0.00')
+    assert monthly(test_user, test_category, last_month) == Decimal('75.50')
+    assert monthly(test_user, other) == Decimal('40.00')
+
+    first.delete()
+    Transaction.objects.filter(id=second.id).delete()
+
+    assert monthly(test_user, other) == Decimal('0.00')
+    assert find_spending_drift() == []
+
+
+@pytest.mark.django_db
+def test_income_and_uncategorised_rows_are_ignored(test_user, test_category):
+    Transaction.objects.create(user=test_user, category=test_category, amount=Decimal('900'), type='INCOME', date=date.today())
+    Transaction.objects.create(user=test_user, amount=Decimal('900'), type='EXPENSE', date=date.today())
+
+    assert not SpendingAggregate.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_insert_updates_aggregates(test_user, test_category):
+    rows = [
+        Transaction(user=test_user, category=test_category, amount=Decimal('12.25'), type='EXPENSE', date=date.today())
+        for _ in range(8)
+    ]
+
+    bulk_insert_transactions(rows, chunk_size=3)
+
+    row = SpendingAggregate.objects.get(period_type='MONTHLY')
+    assert (row.total, row.transaction_count) == (Decimal('98.00'), 8)
+    assert find_spending_drift() == []
+
+
+@pytest.mark.django_db
+def test_budget_status_is_a_single_lookup(test_budget, test_transaction, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        status = test_budget.get_spending_status()
+
+    assert status['spent_amount'] == Decimal('100.00')
+    assert status['remaining_amount'] == Decimal('900.00')
+
+
+@pytest.mark.django_db
+def test_reconcile_command_detects_and_repairs_drift(test_user, test_category):
+    expense(test_user, test_category, '30.00')
+    SpendingAggregate.objects.filter(period_type='WEEKLY').update(total=Decimal('1.00'))
+    SpendingAggregate.objects.filter(period_type='MONTHLY').delete()
+
+    with pytest.raises(CommandError):
+        call_command('reconcile_spending_aggregates', '--check')
+
+    call_command('reconcile_spending_aggregates')
+    assert find_spending_drift() == []
+    assert monthly(test_user, test_category) == Decimal('30.00')
+
+    call_command('reconcile_spending_aggregates', '--rebuild')
+    call_command('reconcile_spending_aggregates', '--check')
+    assert SpendingAggregate.objects.count() == 2
@@ -0,0 +1,164 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from rest_framework.test import APIClient
+from sklearn.ensemble import IsolationForest
+
+from ai_alerts.models import AIAlert
+from budgets.aggregates import find_spending_drift
+from funder.ai_model_service import AIModelService
+from transactions.models import Transaction
+from utils.jwt_auth import generate_token
+from utils.observers import Observer
+from utils.signals import dispatcher
+from utils.strategies import NotificationContext
+
+URL = '/api/transactions/bulk/'
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.received = []
+
+    def update(self, event_type, data):
+        self.received.append((event_type, data))
+
+
+@pytest.fixture
+def events():
+    observer = RecordingObserver()
+    event_types = ['transaction_created', 'transactions_bulk_created', 'budget_exceeded', 'potential_fraud']
+    for event_type in event_types:
+        dispatcher.subscribe(event_type, observer)
+    yield observer.received
+    for event_type in event_types:
+        dispatcher.unsubscribe(event_type, observer)
+
+
+@pytest.fixture
+def client(test_user):
+    client = APIClient()
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {generate_token(test_user)}'
+    return client
+
+
+def expense(amount, **extra):
+    return {'amount': str(amount), 'type': 'EXPENSE', 'date': str(date.today()), **extra}
+
+
+@pytest.mark.django_db
+def test_json_batch_is_inserted_with_one_event(client, test_user, events):
+    rows = [expense(10 + i, merchant=f'Shop {i}') for i in range(25)]
+
+    response = client.post(URL, {'transactions': rows}, format='json')
+
+    assert response.status_code == 201
+    assert response.json()['created'] == 25
+    assert Transaction.objects.filter(user=test_user).count() == 25
+    assert [event_type for event_type, _ in events] == ['transactions_bulk_created']
+    assert sorted(events[0][1]['transaction_ids']) == sorted(response.json()['transaction_ids'])
+
+
+@pytest.mark.django_db
+def test_csv_stream_resolves_categories_by_name(client, test_user, test_category):
+    body = (
+        'amount,type,date,merchant,category\n'
+        f'12.50,EXPENSE,{date.today()},Market,groceries\n'
+        f'2000,INCOME,{date.today()},Employer,\n'
+    )
+
+    response = client.post(URL, body, content_type='text/csv')
+
+    assert response.status_code == 201
+    rows = {t.merchant: t for t in Transaction.objects.filter(user=test_user)}
+    assert bytes(rows['Market'].category_id) == bytes(test_category.id)
+    assert rows['Employer'].category_id is None
+    assert rows['Employer'].amount == Decimal('2000.00')
+
+
+@pytest.mark.django_db
+def test_invalid_rows_reject_the_whole_batch(client, test_user):
+    rows = [expense(10), {'amount': 'abc', 'type': 'EXPENSE', 'date': str(date.today())}, expense(5, category='nope')]
+
+    response = client.post(URL, rows, format='json')
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.json()['errors']] == [2, 3]
+    assert not Transaction.objects.filter(user=test_user).exists()
+
+
+@pytest.mark.django_db
+def test_batch_size_is_capped(client, settings):
+    settings.TRANSACTION_BULK_MAX_ROWS = 2
+
+    response = client.post(URL, [expense(1)] * 3, format='json')
+
+    assert response.status_code == 400
+    assert 'At most 2' in response.json()['error']
+
+
+@pytest.mark.django_db
+def test_rules_run_once_per_user_category(client, test_user, test_category, test_budget, events):
+    rows = [expense(300, category='Groceries') for _ in range(5)] + [expense(6000)]
+
+    response = client.post(URL, rows, format='json')
+
+    assert response.status_code == 201
+    exceeded = [data for event_type, data in events if event_type == 'budget_exceeded']
+    assert exceeded == [{
+        'user_id': str(test_user.id),
+        'category': 'Groceries',
+        'budget_amount': 1000.0,
+        'spent_amount': 1500.0,
+    }]
+    fraud = [data for event_type, data in events if event_type == 'potential_fraud']
+    assert [data['amount'] for data in fraud] == [6000.0]
+
+
+@pytest.mark.django_db
+def test_bulk_rows_are_categorized_and_large_ones_notified(client, test_user, monkeypatch):
+    notifications = []
+    monkeypatch.setattr(NotificationContext, 'notify',
+                        lambda self, recipient, subject, message, **kwargs: notifications.append((recipient, subject)))
+    rows = [expense(20, description='Kroger weekly'), expense(750, description='Laptop'), expense(30)]
+
+    response = client.post(URL, rows, format='json')
+
+    assert response.status_code == 201
+    stored = {t.description: t for t in Transaction.objects.select_related('category').filter(user=test_user)}
+    assert stored['Kroger weekly'].category.name == 'Groceries'
+    assert stored['Laptop'].category_id is None
+    assert notifications == [(str(test_user.id), 'Large Expense Detected')]
+    assert find_spending_drift(test_user.id) == []
+
+
+@pytest.mark.django_db
+def test_ai_scoring_runs_once_for_the_batch(client, test_user, monkeypatch):
+    calls = []
+
+    class StubService:
+        def predict_transactions(self, txs):
+            calls.append(len(txs))
+            return [{'is_fraud_flagged': tx['amount'] > 100, 'reason': 'stub'} for tx in txs]
+
+    monkeypatch.setattr('transactions.signals.get_service', lambda: StubService())
+
+    response = client.post(URL, [expense(50), expense(150), expense(250)], format='json')
+
+    assert response.status_code == 201
+    assert calls == [3]
+    flagged = Transaction.objects.filter(user=test_user, flagged_fraud=True)
+    assert sorted(t.amount for t in flagged) == [Decimal('150.00'), Decimal('250.00')]
+    assert AIAlert.objects.filter(user=test_user, message__startswith='txn:').count() == 2
+
+
+def test_vectorized_scoring_matches_single_rows():
+    rng = np.random.default_rng(0)
+    svc = AIModelService()
+    svc.iso_forest = IsolationForest(random_state=0).fit(rng.normal(50, 10, size=(200, 2)))
+    txs = [{'amount': float(a), 'over_budget_percentage': float(p)} for a, p in rng.normal(50, 40, size=(20, 2))]
+    txs.append({'amount': 10, 'over_budget_percentage': 150})
+
+    assert svc.predict_transactions(txs) == [svc.predict_transaction(tx) for tx in txs]
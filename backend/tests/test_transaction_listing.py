@@ -0,0 +1,99 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import Sum
+from rest_framework.test import APIClient
+
+from transactions.export import iter_transaction_rows
+from transactions.models import Transaction
+from transactions.pagination import keyset_after, keyset_ordering, row_key
+from utils.jwt_auth import generate_token
+
+URL = '/api/transactions/'
+
+
+@pytest.fixture
+def client(test_user):
+    client = APIClient()
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {generate_token(test_user)}'
+    return client
+
+
+@pytest.fixture
+def history(test_user):
+    # Several rows share each date so ties are broken by created_at and id
+    Transaction.objects.bulk_create([
+        Transaction(user=test_user, amount=Decimal(i + 1), type='EXPENSE', date=date.today() - timedelta(days=i // 4))
+        for i in range(45)
+    ])
+    return [str(pk) for pk in Transaction.objects.filter(user=test_user).order_by(*keyset_ordering()).values_list('id', flat=True)]
+
+
+@pytest.mark.django_db
+def test_cursor_pages_walk_the_whole_history_once(client, history):
+    seen = []
+    url = f'{URL}?page_size=10'
+    pages = []
+    while url:
+        body = client.get(url).json()
+        pages.append(body)
+        seen.extend(row['id'] for row in body['results'])
+        url = body['next']
+
+    assert seen == history
+    assert [len(page['results']) for page in pages] == [10, 10, 10, 10, 5]
+    assert pages[0]['previous'] is None
+
+    previous = client.get(pages[2]['previous']).json()
+    assert [row['id'] for row in previous['results']] == history[10:20]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected(client):
+    assert client.get(f'{URL}?cursor=not-a-cursor').status_code == 404
+
+
+@pytest.mark.django_db
+def test_ndjson_export_streams_every_row(client, history, settings):
+    settings.TRANSACTION_EXPORT_CHUNK_SIZE = 7
+
+    response = client.get(f'{URL}export/')
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)['id'] for line in lines] == history
+
+
+@pytest.mark.django_db
+def test_export_reads_one_query_per_chunk(test_user, history, django_assert_num_queries):
+    with django_assert_num_queries(5):
+        rows = list(iter_transaction_rows(Transaction.objects.filter(user=test_user), chunk_size=10))
+    assert len(rows) == 45
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN output is backend specific')
+@pytest.mark.django_db
+def test_deep_list_page_seeks_the_user_date_index(test_user, history):
+    key = row_key(Transaction.objects.get(id=history[30]))
+    queryset = Transaction.objects.filter(user=test_user).filter(keyset_after(key)).order_by(*keyset_ordering())[:20]
+
+    plan = queryset.explain()
+
+    assert 'transactions_user_date_idx (user_id=? AND date<?)' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN output is backend specific')
+@pytest.mark.django_db
+def test_budget_aggregation_uses_the_category_index(test_user, test_category):
+    queryset = Transaction.objects.filter(
+        user_id__in=[test_user.id], category_id__in=[test_category.id], type='EXPENSE', date__gte=date.today()
+    ).values('user_id', 'category_id').annotate(total=Sum('amount'))
+
+    plan = queryset.explain()
+
+    assert 'transactions_user_cat_date_idx (user_id=? AND category_id=? AND type=? AND date>?)' in plan
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from transactions.models import Transaction
+from utils.signals import _is_potential_fraud
+from utils.velocity import VelocityRule, VelocityTracker, get_velocity_tracker
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def expense(user, amount, day=None):
+    return Transaction.objects.create(user=user, amount=Decimal(amount), type='EXPENSE', date=day or date.today())
+
+
+@pytest.mark.django_db
+def test_third_large_expense_in_an_hour_is_flagged(test_user):
+    expense(test_user, '600')
+    expense(test_user, '20')
+    second = expense(test_user, '700')
+    assert not _is_potential_fraud(second)
+
+    third = expense(test_user, '800')
+    assert _is_potential_fraud(third)
+    assert not _is_potential_fraud(expense(test_user, '300'))
+    assert _is_potential_fraud(expense(test_user, '5000.01'))
+
+
+@pytest.mark.django_db
+def test_checks_do_not_query_the_database_once_warm(test_user, django_assert_num_queries):
+    transactions = [expense(test_user, '900') for _ in range(3)]
+
+    with django_assert_num_queries(0):
+        assert get_velocity_tracker().flag(transactions) == transactions
+
+
+@pytest.mark.django_db
+def test_cold_cache_is_rebuilt_from_the_window(test_user):
+    tracker = get_velocity_tracker()
+    old = [expense(test_user, '900') for _ in range(2)]
+    Transaction.objects.filter(id__in=[t.id for t in old]).update(created_at=timezone.now() - timedelta(hours=2))
+    expense(test_user, '900')
+    latest = expense(test_user, '900')
+    cache.clear()
+
+    rule = tracker.rules[0]
+    assert rule.window_seconds == 3600
+    assert tracker.window_count(rule, test_user.id) == 2
+    assert tracker.triggered_rules(latest) == []
+
+
+@pytest.mark.django_db
+def test_database_fallback_when_cache_fails(test_user, monkeypatch):
+    tracker = VelocityTracker([VelocityRule('burst', 600, Decimal('100'), max_count=1)])
+    first, second = expense(test_user, '150'), expense(test_user, '150')
+
+    class BrokenCache:
+        def __getattr__(self, name):
+            raise ConnectionError('cache down')
+
+    monkeypatch.setattr(VelocityTracker, 'cache', property(lambda self: BrokenCache()))
+
+    assert tracker.triggered_rules(second) == ['burst']
+    assert tracker.db_fallbacks == 1
+
+
+@pytest.mark.django_db
+def test_backfilled_history_is_not_counted(test_user):
+    long_ago = date.today() - timedelta(days=30)
+    for _ in range(3):
+        expense(test_user, '900', day=long_ago)
+
+    assert not _is_potential_fraud(expense(test_user, '900'))
+
+
+def test_rules_come_from_settings(settings):
+    from utils.velocity import build_velocity_tracker
+
+    settings.FRAUD_VELOCITY_RULES = [{'name': 'tiny', 'window_seconds': 60, 'min_amount': 1, 'max_count': 3}]
+    settings.FRAUD_LARGE_TRANSACTION_AMOUNT = Decimal('100')
+
+    tracker = build_velocity_tracker()
+
+    assert tracker.rules == [VelocityRule('tiny', 60, Decimal('1'), 3)]
+    assert tracker.rules[0].bucket_seconds == 1
+    assert tracker.large_amount == Decimal('100')
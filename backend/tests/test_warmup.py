@@ -0,0 +1,101 @@
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from rest_framework.test import APIRequestFactory
+
+from funder import views
+from funder.model_registry import get_registry
+from funder import warmup as warmup_module
+from funder.warmup import ModelWarmup, WARMUP_TASKS
+
+
+def test_warmup_loads_every_model_bundle():
+    warmup = ModelWarmup(max_workers=4)
+    results = warmup.run()
+
+    assert warmup.is_ready()
+    assert set(results) == set(WARMUP_TASKS)
+    assert results['transaction']['ok']
+    assert results['flagged']['ok']
+    bundles = get_registry().stats()['bundles']
+    assert {'transaction', 'transaction_models', 'flagged'} <= set(bundles)
+
+
+def test_failed_model_marks_warmup_degraded():
+    def broken():
+        raise RuntimeError('missing artifact')
+
+    warmup = ModelWarmup(tasks={'ok': lambda: None, 'broken': broken})
+    warmup.run()
+
+    assert warmup.is_ready()
+    assert warmup.status()['state'] == 'degraded'
+    assert warmup.status()['models']['broken']['error'] == 'missing artifact'
+
+
+def test_ready_endpoint_returns_503_until_warmup_finishes(settings, monkeypatch):
+    settings.AI_WARMUP_ON_BOOT = True
+    release = threading.Event()
+    warmup = ModelWarmup(tasks={'slow': release.wait})
+    monkeypatch.setattr(views, 'warmup', warmup)
+    factory = APIRequestFactory()
+
+    warmup.start()
+    response = views.readiness_check(factory.get('/ready/'))
+    assert response.status_code == 503
+    assert response.data['ready'] is False
+
+    release.set()
+    warmup.wait(timeout=5)
+    response = views.readiness_check(factory.get('/ready/'))
+    assert response.status_code == 200
+    assert response.data['state'] == 'ready'
+
+
+def test_health_check_does_not_load_models_while_warming(settings, monkeypatch):
+    settings.AI_WARMUP_ON_BOOT = True
+    monkeypatch.setattr(views, 'warmup', ModelWarmup(tasks={}))
+    monkeypatch.setattr(views, 'predict_transaction_type', lambda data: 1 / 0)
+
+    response = views.health_check(APIRequestFactory().get('/health/'))
+    assert response.data['models_status'] == 'warming_up'
+
+
+def test_explicit_empty_task_list_is_kept():
+    assert ModelWarmup(tasks={}).tasks == {}
+    assert ModelWarmup().tasks is WARMUP_TASKS
+
+
+@pytest.mark.parametrize('argv, run_main, serving', [
+    (['manage.py', 'migrate'], None, False),
+    (['manage.py', 'process_events'], None, False),
+    (['manage.py', 'runserver'], None, False),
+    (['manage.py', 'runserver'], 'true', True),
+    (['manage.py', 'runserver', '--noreload'], None, True),
+])
+def test_only_serving_processes_warm_up_on_boot(settings, monkeypatch, argv, run_main, serving):
+    settings.AI_WARMUP_ON_BOOT = True
+    started = []
+    monkeypatch.setattr(warmup_module, 'warmup', SimpleNamespace(start=lambda: started.append(True)))
+    monkeypatch.setattr(sys, 'argv', argv)
+    if run_main is None:
+        monkeypatch.delenv('RUN_MAIN', raising=False)
+    else:
+        monkeypatch.setenv('RUN_MAIN', run_main)
+
+    apps.get_app_config('ai_alerts').ready()
+    assert started == ([True] if serving else [])
+
+
+def test_start_on_boot_respects_setting(settings, monkeypatch):
+    started = []
+    monkeypatch.setattr(warmup_module, 'warmup', SimpleNamespace(start=lambda: started.append(True)))
+    settings.AI_WARMUP_ON_BOOT = False
+    warmup_module.start_on_boot()
+    assert started == []
+    settings.AI_WARMUP_ON_BOOT = True
+    warmup_module.start_on_boot()
+    assert started == [True]
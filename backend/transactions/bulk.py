@@ -0,0 +1,175 @@
+"""
+Bulk ingestion for /api/transactions/bulk/.
+
+Rows arrive as a JSON list (or {"transactions": [...]}) or as a CSV body that
+is read line by line. Every row is validated before anything is written; the
+batch is then inserted with bulk_create in TRANSACTION_BULK_CHUNK_SIZE chunks
+inside one database transaction.
+
+bulk_create does not send post_save, so instead of one transaction_created
+event per row a single transactions_bulk_created event carries the new ids.
+Its observers score fraud with one model call for the whole batch and
+evaluate the budget and fraud rules once per affected (user, category, period).
+"""
+import codecs
+import csv
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+from rest_framework import serializers
+
+from budgets.aggregates import apply_spending_deltas, spending_deltas, spending_state
+from utils.velocity import get_velocity_tracker
+from .models import Transaction
+
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+BULK_CREATED_EVENT = 'transactions_bulk_created'
+MAX_REPORTED_ERRORS = 50
+
+
+class BulkIngestError(ValueError):
+    """The request body could not be read as a batch of transactions."""
+
+
+class BulkTransactionRowSerializer(serializers.Serializer):
+    """
+    Per-row validation without related-field lookups; category and bank
+    account references are resolved for the whole batch in one query each.
+    """
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    type = serializers.ChoiceField(choices=['INCOME', 'EXPENSE'])
+    date = serializers.DateField()
+    description = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    merchant = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    category = serializers.CharField(required=False, allow_null=True)
+    bank_account = serializers.UUIDField(required=False, allow_null=True)
+    source = serializers.ChoiceField(choices=['MANUAL', 'SYNCED'], required=False, default='MANUAL')
+
+
+def iter_bulk_rows(request) -> Iterator[Dict[str, Any]]:
+    """Yield raw row dicts from a JSON or CSV request body."""
+    content_type = (request.content_type or '').split(';')[0].strip().lower()
+
+    if content_type in CSV_CONTENT_TYPES:
+        stream = request.stream
+        if stream is None:
+            raise BulkIngestError('Request body is empty')
+        for row in csv.DictReader(codecs.iterdecode(stream, 'utf-8')):
+            # Empty CSV cells mean "not provided", not an empty value
+            yield {key: value for key, value in row.items() if key and value not in ('', None)}
+        return
+
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get('transactions')
+    if not isinstance(data, list):
+        raise BulkIngestError('Expected a list of transactions or {"transactions": [...]}')
+    for row in data:
+        if not isinstance(row, dict):
+            raise BulkIngestError('Each transaction must be an object')
+        yield row
+
+
+def _category_lookup(user) -> Dict[str, bytes]:
+    """Map category UUID strings and lower-cased names to the user's category ids."""
+    from categories.models import Category
+
+    lookup = {}
+    for category_id, name in Category.objects.filter(user=user).values_list('id', 'name'):
+        category_id = bytes(category_id)
+        lookup[name.lower()] = category_id
+        lookup[str(uuid.UUID(bytes=category_id))] = category_id
+    return lookup
+
+
+def build_transactions(rows: Iterable[Dict[str, Any]], user, max_rows: int = None) -> Tuple[List[Transaction], List[Dict[str, Any]]]:
+    """
+    Validate rows and build unsaved Transaction objects for user.
+
+    Returns (transactions, errors); errors holds {'row': n, 'errors': {...}}
+    entries (row numbers start at 1) and is empty when every row is valid.
+
+    Raises:
+        BulkIngestError: If the batch is larger than max_rows
+    """
+    from bank_accounts.models import BankAccount
+
+    if max_rows is None:
+        max_rows = getattr(settings, 'TRANSACTION_BULK_MAX_ROWS', 10000)
+
+    # One serializer instance for every row, as ListSerializer does; building
+    # the field set per row costs more than validating it
+    row_serializer = BulkTransactionRowSerializer()
+    validated = []
+    errors = []
+    for number, row in enumerate(rows, start=1):
+        if number > max_rows:
+            raise BulkIngestError(f'At most {max_rows} transactions can be created per request')
+        try:
+            validated.append((number, row_serializer.run_validation(row)))
+        except serializers.ValidationError as e:
+            errors.append({'row': number, 'errors': e.detail})
+
+    categories = _category_lookup(user) if any(data.get('category') for _, data in validated) else {}
+    account_ids = {data['bank_account'] for _, data in validated if data.get('bank_account')}
+    owned_accounts = set(
+        BankAccount.objects.filter(user=user, id__in=account_ids).values_list('id', flat=True)
+    ) if account_ids else set()
+
+    transactions = []
+    for number, data in validated:
+        category_ref = data.get('category')
+        category_id = None
+        if category_ref:
+            category_id = categories.get(category_ref.strip().lower())
+            if category_id is None:
+                errors.append({'row': number, 'errors': {'category': [f'Unknown category "{category_ref}"']}})
+                continue
+        account_id = data.get('bank_account')
+        if account_id and account_id not in owned_accounts:
+            errors.append({'row': number, 'errors': {'bank_account': ['Unknown bank account']}})
+            continue
+        transactions.append(Transaction(
+            id=uuid.uuid4(),
+            user=user,
+            category_id=category_id,
+            bank_account_id=account_id,
+            amount=data['amount'],
+            type=data['type'],
+            description=data.get('description'),
+            merchant=data.get('merchant'),
+            date=data['date'],
+            source=data.get('source') or 'MANUAL',
+        ))
+
+    errors.sort(key=lambda error: error['row'])
+    return transactions, errors
+
+
+def bulk_insert_transactions(transactions: List[Transaction], chunk_size: int = None, dispatcher=None) -> List[str]:
+    """
+    Insert transactions in chunks and raise one transactions_bulk_created event.
+
+    The insert and the event share a database transaction, so with
+    EVENT_DISPATCH_ASYNC the event is queued only if every chunk was written.
+    """
+    if dispatcher is None:
+        from utils.signals import dispatcher
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'TRANSACTION_BULK_CHUNK_SIZE', 1000)
+    if not transactions:
+        return []
+
+    transaction_ids = [str(tx.id) for tx in transactions]
+    with db_transaction.atomic():
+        Transaction.objects.bulk_create(transactions, batch_size=chunk_size)
+        # bulk_create skips post_save, so update spending_aggregate here
+        apply_spending_deltas(spending_deltas(new_states=[spending_state(tx) for tx in transactions]))
+        get_velocity_tracker().record(transactions)
+        dispatcher.dispatch(BULK_CREATED_EVENT, {
+            'user_ids': sorted({str(tx.user_id) for tx in transactions}),
+            'transaction_ids': transaction_ids,
+        })
+    return transaction_ids
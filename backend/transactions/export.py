@@ -0,0 +1,60 @@
+"""
+NDJSON export of a user's full transaction history.
+
+Rows are read in keyset batches of TRANSACTION_EXPORT_CHUNK_SIZE along the
+transactions_user_date_idx index and written one JSON object per line, so
+memory stays flat however long the history is. A plain .iterator() would not
+do that on MySQL, where mysqlclient buffers the whole result set client-side.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .pagination import keyset_after, keyset_ordering, row_key
+
+EXPORT_FIELDS = (
+    'id', 'user_id', 'category_id', 'bank_account_id', 'amount', 'type',
+    'description', 'merchant', 'date', 'source', 'flagged_fraud', 'created_at',
+)
+
+
+def export_row(row):
+    """Shape a values() row like TransactionSerializer output."""
+    category_id = row['category_id']
+    return {
+        'id': str(row['id']),
+        'user': str(row['user_id']),
+        'category': str(uuid.UUID(bytes=bytes(category_id))) if category_id else None,
+        'bank_account': str(row['bank_account_id']) if row['bank_account_id'] else None,
+        'amount': row['amount'],
+        'type': row['type'],
+        'description': row['description'],
+        'merchant': row['merchant'],
+        'date': row['date'],
+        'source': row['source'],
+        'flagged_fraud': row['flagged_fraud'],
+        'created_at': row['created_at'],
+    }
+
+
+def iter_transaction_rows(queryset, chunk_size=None):
+    """Yield values() rows newest first, one keyset query per chunk."""
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'TRANSACTION_EXPORT_CHUNK_SIZE', 2000)
+    queryset = queryset.order_by(*keyset_ordering()).values(*EXPORT_FIELDS)
+    key = None
+    while True:
+        batch = queryset.filter(keyset_after(key)) if key else queryset
+        rows = list(batch[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        key = row_key(rows[-1])
+
+
+def iter_ndjson(queryset, chunk_size=None):
+    """Yield the export as NDJSON lines."""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in iter_transaction_rows(queryset, chunk_size):
+        yield encoder.encode(export_row(row)) + '\n'
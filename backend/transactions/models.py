@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 import uuid
 from accounts.models import User
 
@@ -30,11 +30,24 @@ class Transaction(models.Model):
     class Meta:
         db_table = 'transactions'
         ordering = ['-date', '-created_at']
+        indexes = [
+            # Keyset pagination and export walk (date, created_at, id) per user
+            models.Index(fields=['user', 'date', 'created_at', 'id'], name='transactions_user_date_idx'),
+            # Budget, fraud and goal aggregations filter on these, in this order
+            models.Index(fields=['user', 'category', 'type', 'date'], name='transactions_user_cat_date_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.id:
             self.id = uuid.uuid4()
-        super().save(*args, **kwargs)
+        # post_save/post_delete update spending_aggregate; keep that in the
+        # same database transaction as the row itself
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def get_uuid_string(self):
         return str(self.id)
@@ -2,11 +2,35 @@
 Transaction-specific observers for monitoring transaction events.
 """
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from utils.observers import Observer
 from utils.strategies import NotificationContext, MultiChannelNotificationStrategy
 
 
+# Events raised once for a batch of new transactions (bulk ingestion and
+# Plaid syncs), listing the created ids under 'transaction_ids'
+BATCH_CREATED_EVENTS = ('transactions_bulk_created', 'transactions_synced')
+
+# Simple categorization logic
+CATEGORY_KEYWORDS = {
+    'groceries': ['grocery', 'supermarket', 'food', 'walmart', 'kroger'],
+    'dining': ['restaurant', 'cafe', 'coffee', 'starbucks', 'mcdonald'],
+    'transportation': ['gas', 'uber', 'lyft', 'taxi', 'parking'],
+    'utilities': ['electric', 'water', 'internet', 'phone', 'utility'],
+    'entertainment': ['movie', 'netflix', 'spotify', 'game', 'concert'],
+    'shopping': ['amazon', 'store', 'mall', 'shop'],
+}
+
+
+def detect_category(description: str) -> Optional[str]:
+    """First CATEGORY_KEYWORDS category with a keyword in description."""
+    description = (description or '').lower()
+    for category_name, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in description for keyword in keywords):
+            return category_name
+    return None
+
+
 class FraudDetectionObserver(Observer):
     """
     Observer that monitors transactions for potential fraud.
@@ -83,25 +107,9 @@ class TransactionCategorizationObserver(Observer):
         from categories.models import Category
         
         transaction_id = data.get('transaction_id')
-        description = data.get('description', '').lower()
         user_id = data.get('user_id')
         
-        # Simple categorization logic
-        category_keywords = {
-            'groceries': ['grocery', 'supermarket', 'food', 'walmart', 'kroger'],
-            'dining': ['restaurant', 'cafe', 'coffee', 'starbucks', 'mcdonald'],
-            'transportation': ['gas', 'uber', 'lyft', 'taxi', 'parking'],
-            'utilities': ['electric', 'water', 'internet', 'phone', 'utility'],
-            'entertainment': ['movie', 'netflix', 'spotify', 'game', 'concert'],
-            'shopping': ['amazon', 'store', 'mall', 'shop'],
-        }
-        
-        detected_category = None
-        for category_name, keywords in category_keywords.items():
-            if any(keyword in description for keyword in keywords):
-                detected_category = category_name
-                break
-        
+        detected_category = detect_category(data.get('description', ''))
         if detected_category:
             try:
                 transaction = Transaction.objects.get(id=transaction_id)
@@ -116,6 +124,55 @@ class TransactionCategorizationObserver(Observer):
                 print(f"Error auto-categorizing transaction: {e}")
 
 
+class TransactionBatchCategorizationObserver(TransactionCategorizationObserver):
+    """
+    TransactionCategorizationObserver for BATCH_CREATED_EVENTS.
+
+    Categorizes every transaction the batch created with one category lookup
+    per (user, detected category) and one bulk update, moving their spending
+    aggregates like a per-row save would.
+    """
+    
+    def update(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Handle BATCH_CREATED_EVENTS."""
+        if event_type in BATCH_CREATED_EVENTS:
+            self._auto_categorize_batch(data.get('transaction_ids') or [])
+    
+    def _auto_categorize_batch(self, transaction_ids) -> None:
+        from django.db import transaction as db_transaction
+        from budgets.aggregates import apply_spending_deltas, spending_deltas, spending_state
+        from categories.models import Category
+        from transactions.models import Transaction
+        
+        try:
+            matches = [
+                (instance, detected)
+                for instance in Transaction.objects.filter(id__in=transaction_ids)
+                for detected in [detect_category(instance.description)] if detected
+            ]
+            if not matches:
+                return
+            
+            categories = {}
+            for user_id, detected in sorted({(instance.user_id, detected) for instance, detected in matches}):
+                categories[(user_id, detected)], _ = Category.objects.get_or_create(
+                    user_id=user_id,
+                    name=detected.title(),
+                    type='EXPENSE'
+                )
+            
+            old_states = [spending_state(instance) for instance, _ in matches]
+            for instance, detected in matches:
+                instance.category = categories[(instance.user_id, detected)]
+            with db_transaction.atomic():
+                Transaction.objects.bulk_update([instance for instance, _ in matches], ['category'])
+                # bulk_update skips post_save, so move the spending aggregates here
+                new_states = [spending_state(instance) for instance, _ in matches]
+                apply_spending_deltas(spending_deltas(old_states, new_states))
+        except Exception as e:
+            print(f"Error auto-categorizing transactions: {e}")
+
+
 class LargeTransactionObserver(Observer):
     """
     Observer that monitors large transactions.
@@ -152,6 +209,35 @@ class LargeTransactionObserver(Observer):
             )
 
 
+class LargeTransactionBatchObserver(LargeTransactionObserver):
+    """
+    LargeTransactionObserver for BATCH_CREATED_EVENTS: one query for the
+    batch's transactions at or above the threshold, then the same
+    notification per transaction.
+    """
+    
+    def update(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Handle BATCH_CREATED_EVENTS."""
+        if event_type in BATCH_CREATED_EVENTS:
+            self._check_large_transactions(data.get('transaction_ids') or [])
+    
+    def _check_large_transactions(self, transaction_ids) -> None:
+        from django.db.models import Q
+        from transactions.models import Transaction
+        
+        large = Transaction.objects.filter(
+            Q(amount__gte=self.threshold) | Q(amount__lte=-self.threshold),
+            id__in=transaction_ids
+        ).only('user_id', 'amount', 'description', 'type')
+        for instance in large:
+            self._check_large_transaction({
+                'user_id': str(instance.user_id),
+                'amount': float(instance.amount),
+                'type': instance.type,
+                'description': instance.description or '',
+            })
+
+
 class RecurringTransactionObserver(Observer):
     """
     Observer that detects recurring transactions.
@@ -0,0 +1,137 @@
+"""
+Keyset pagination for the transaction list.
+
+PageNumberPagination turns page N into OFFSET (N - 1) * size, so deep pages
+re-read every earlier row. Here the cursor carries the (date, created_at, id)
+of the last row served and the next page starts strictly after it, which the
+transactions_user_date_idx index answers with a range scan whatever the depth.
+DRF's CursorPagination keys on the first ordering field only and falls back to
+an offset among ties, which degrades for bulk imports sharing one date.
+"""
+import base64
+import json
+import uuid
+from collections import OrderedDict
+from datetime import date
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KEY_FIELDS = ('date', 'created_at', 'id')
+
+
+def keyset_ordering(reverse=False):
+    """Newest first; reverse walks back toward newer rows."""
+    return [field if reverse else f'-{field}' for field in KEY_FIELDS]
+
+
+def keyset_after(key, reverse=False):
+    """Q for rows strictly after key in keyset_ordering(reverse)."""
+    op = 'gt' if reverse else 'lt'
+    condition = Q()
+    equal = {}
+    for field, value in zip(KEY_FIELDS, key):
+        condition |= Q(**equal, **{f'{field}__{op}': value})
+        equal[field] = value
+    # The redundant bound on the leading column lets the index seek to the
+    # key instead of scanning and filtering every newer row
+    return Q(**{f'{KEY_FIELDS[0]}__{op}e': key[0]}) & condition
+
+
+def row_key(row):
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    return tuple(get(field) for field in KEY_FIELDS)
+
+
+class TransactionCursorPagination(BasePagination):
+    """Opaque ?cursor= pagination over (date, created_at, id), newest first."""
+
+    page_size = 20
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = False
+        if cursor is not None:
+            reverse, key = cursor
+            queryset = queryset.filter(keyset_after(key, reverse))
+
+        rows = list(queryset.order_by(*keyset_ordering(reverse))[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Arriving through a cursor means there is a page on the side we came from
+        self.has_next = has_more if not reverse else cursor is not None
+        self.has_previous = has_more if reverse else cursor is not None
+        self.first_key = row_key(rows[0]) if rows else None
+        self.last_key = row_key(rows[-1]) if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ---- cursor encoding -------------------------------------------------
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            key = (date.fromisoformat(data['d']), parse_datetime(data['c']), uuid.UUID(data['i']))
+            if key[1] is None:
+                raise ValueError('created_at')
+            return bool(data.get('r')), key
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, key, reverse):
+        data = {'d': key[0].isoformat(), 'c': key[1].isoformat(), 'i': str(key[2])}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        return self.encode_cursor(self.last_key, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_key is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.first_key, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
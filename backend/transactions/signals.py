@@ -1,18 +1,29 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.utils import timezone
+import uuid
+from typing import Any, Dict
 
 from .models import Transaction
 from ai_alerts.models import AIAlert
 from funder.ai_model_service import get_service
+from utils.observers import Observer
+from utils.signals import dispatcher
 
 
-@receiver(post_save, sender=Transaction)
-def run_ai_on_transaction(sender, instance: Transaction, created: bool, **kwargs):
-    # Trigger on create only
-    if not created:
-        return
-    try:
+class TransactionAIScoringObserver(Observer):
+    """
+    Score new transactions with the AI model service and raise a FRAUD alert.
+
+    Subscribed to transaction_created, so with EVENT_DISPATCH_ASYNC it runs on
+    the event workers instead of inside the request that saved the transaction.
+    Errors propagate so the workers retry and dead-letter the event; inline
+    dispatch logs them without failing the save.
+    """
+
+    def update(self, event_type: str, data: Dict[str, Any]) -> None:
+        if event_type != 'transaction_created':
+            return
+        instance = Transaction.objects.select_related('category').filter(id=data.get('transaction_id')).first()
+        if instance is None:
+            return
         svc = get_service()
         tx_dict = {
             'amount': float(instance.amount),
@@ -32,6 +43,58 @@ def run_ai_on_transaction(sender, instance: Transaction, created: bool, **kwargs
                 message=msg,
                 type='FRAUD',
             )
-    except Exception:
-        # Non-blocking: do not break persistence if AI pipeline fails
-        pass
+
+
+class TransactionBatchAIScoringObserver(Observer):
+    """
+    Score a transactions_bulk_created or transactions_synced batch with one
+    model call.
+
+    Flags and alerts are written with one UPDATE and one bulk INSERT;
+    fraud_confirmed is still dispatched for each flagged transaction because
+    the UPDATE does not send post_save. Errors propagate like in
+    TransactionAIScoringObserver.
+    """
+
+    def update(self, event_type: str, data: Dict[str, Any]) -> None:
+        if event_type not in ('transactions_bulk_created', 'transactions_synced'):
+            return
+        instances = list(
+            Transaction.objects.select_related('category').filter(id__in=data.get('transaction_ids') or [])
+        )
+        if not instances:
+            return
+        svc = get_service()
+        results = svc.predict_transactions([
+            {
+                'amount': float(instance.amount),
+                'category_name': getattr(instance.category, 'name', None),
+                'type': instance.type,
+                'merchant': instance.merchant,
+            }
+            for instance in instances
+        ])
+        flagged = [(instance, result) for instance, result in zip(instances, results) if result.get('is_fraud_flagged')]
+        if not flagged:
+            return
+        Transaction.objects.filter(id__in=[instance.id for instance, _ in flagged]).update(flagged_fraud=True)
+        AIAlert.objects.bulk_create([
+            AIAlert(
+                id=uuid.uuid4().bytes,
+                user_id=instance.user_id,
+                message=f"txn:{instance.get_uuid_string()} | {result.get('reason')}",
+                type='FRAUD',
+            )
+            for instance, result in flagged
+        ])
+        for instance, _ in flagged:
+            dispatcher.dispatch('fraud_confirmed', {
+                'transaction_id': instance.get_uuid_string(),
+                'user_id': str(instance.user_id)
+            })
+
+
+dispatcher.subscribe('transaction_created', TransactionAIScoringObserver())
+transaction_batch_ai_scoring_observer = TransactionBatchAIScoringObserver()
+dispatcher.subscribe('transactions_bulk_created', transaction_batch_ai_scoring_observer)
+dispatcher.subscribe('transactions_synced', transaction_batch_ai_scoring_observer)
@@ -1,19 +1,24 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from .bulk import BulkIngestError, MAX_REPORTED_ERRORS, build_transactions, bulk_insert_transactions, iter_bulk_rows
+from .export import iter_ndjson
 from .models import Transaction
+from .pagination import TransactionCursorPagination
 from .serializers import TransactionSerializer
 
 
 class TransactionViewSet(viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
         user = getattr(self.request, 'user', None)
         if user and getattr(user, 'is_authenticated', False):
-            return Transaction.objects.filter(user=user).order_by('-date', '-created_at')
+            return Transaction.objects.filter(user=user).order_by('-date', '-created_at', '-id')
         return Transaction.objects.none()
 
     def perform_create(self, serializer):
@@ -32,3 +37,38 @@ class TransactionViewSet(viewsets.ModelViewSet):
         transaction.save()
         return Response({'message': 'Transaction flagged as fraud'})
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create many transactions in one request.
+
+        Accepts a JSON list (or {"transactions": [...]}) or a text/csv body
+        with a header row. The batch is all-or-nothing: if any row is invalid
+        nothing is written and the row errors are returned.
+        """
+        try:
+            transactions, errors = build_transactions(iter_bulk_rows(request), request.user)
+        except BulkIngestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if errors:
+            return Response({
+                'error': f'{len(errors)} invalid transaction(s); nothing was created',
+                'errors': errors[:MAX_REPORTED_ERRORS],
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        transaction_ids = bulk_insert_transactions(transactions)
+        return Response({
+            'created': len(transaction_ids),
+            'transaction_ids': transaction_ids,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream the user's full transaction history as NDJSON, newest first."""
+        response = StreamingHttpResponse(
+            iter_ndjson(self.get_queryset()),
+            content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = 'attachment; filename="transactions.ndjson"'
+        return response
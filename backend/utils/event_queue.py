@@ -0,0 +1,235 @@
+"""
+Durable, asynchronous delivery of EventDispatcher events.
+
+With EVENT_DISPATCH_ASYNC enabled, EventDispatcher.dispatch() writes each event
+to the event_outbox table inside the caller's database transaction, so an
+event exists if and only if the change that raised it was committed. A pool
+of worker threads (started lazily in the web process, or in a dedicated
+process with `python manage.py process_events`) claims ready rows and runs
+the subscribed observers.
+
+Delivery is at-least-once: an observer that raises is retried with
+exponential backoff, observers that already succeeded are not re-run, and an
+event that still fails after EVENT_MAX_ATTEMPTS is moved to the
+event_dead_letters table. Rows claimed by a worker that died are re-claimed
+after EVENT_VISIBILITY_TIMEOUT_SECONDS.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_event(event_type, data):
+    """Persist an event in the outbox and wake the in-process workers after commit."""
+    from database.models import OutboxEvent
+
+    # Savepoint so a failed insert cannot poison the caller's transaction
+    with transaction.atomic():
+        event = OutboxEvent.objects.create(event_type=event_type, payload=data)
+
+    if getattr(settings, 'EVENT_RUN_WORKERS_IN_PROCESS', True):
+        transaction.on_commit(lambda: get_worker_pool().wake())
+    return event
+
+
+class EventWorkerPool:
+    """Worker threads that drain event_outbox through an EventDispatcher."""
+
+    def __init__(self, dispatcher, workers=2, batch_size=20, poll_interval=1.0,
+                 max_attempts=5, retry_backoff=2.0, visibility_timeout=300.0):
+        """
+        Args:
+            dispatcher: EventDispatcher whose observers receive the events
+            workers: Number of worker threads started by start()
+            batch_size: Rows claimed per database round trip
+            poll_interval: Seconds an idle worker sleeps before polling again
+            max_attempts: Deliveries before an event is dead-lettered
+            retry_backoff: Retry n waits retry_backoff ** n seconds
+            visibility_timeout: Seconds after which a claimed row is considered abandoned
+        """
+        self.dispatcher = dispatcher
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.visibility_timeout = visibility_timeout
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Start the worker threads (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopped.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'event-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        """Start the pool if needed and nudge an idle worker to poll now."""
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception as e:
+                logger.error(f"Event worker error: {e}")
+                processed = 0
+            finally:
+                close_old_connections()
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # ---- delivery --------------------------------------------------------
+
+    def _claim(self, limit):
+        """Atomically move up to limit ready rows to PROCESSING; returns the claimed events."""
+        from database.models import OutboxEvent
+
+        now = timezone.now()
+        ready = Q(status=OutboxEvent.PENDING, available_at__lte=now) | Q(
+            status=OutboxEvent.PROCESSING, locked_at__lt=now - timedelta(seconds=self.visibility_timeout)
+        )
+        candidates = OutboxEvent.objects.filter(ready).order_by('id').values_list('id', 'status', 'locked_at')[:limit]
+
+        claimed = []
+        for pk, status, locked_at in candidates:
+            # Conditional update: only one worker (in any process) wins each row
+            won = OutboxEvent.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+                status=OutboxEvent.PROCESSING, locked_at=now
+            )
+            if won:
+                claimed.append(pk)
+        return list(OutboxEvent.objects.filter(pk__in=claimed).order_by('id'))
+
+    def process_batch(self, limit=None):
+        """Claim and deliver one batch of ready events; returns how many were handled."""
+        events = self._claim(limit or self.batch_size)
+        for event in events:
+            self._process(event)
+        return len(events)
+
+    def _process(self, event):
+        from database.models import DeadLetterEvent, OutboxEvent
+
+        failures = self.dispatcher.deliver(event.event_type, event.payload, skip=event.delivered_to)
+        if not failures:
+            event.delete()
+            with self._lock:
+                self.delivered += 1
+            return
+
+        subscribed = {self.dispatcher.observer_key(o) for o in self.dispatcher.observers_for(event.event_type)}
+        delivered_to = sorted(set(event.delivered_to) | (subscribed - set(failures)))
+        attempts = event.attempts + 1
+        last_error = '; '.join(f"{key}: {error}" for key, error in failures.items())
+
+        if attempts >= self.max_attempts:
+            with transaction.atomic():
+                DeadLetterEvent.objects.create(
+                    event_type=event.event_type,
+                    payload=event.payload,
+                    attempts=attempts,
+                    delivered_to=delivered_to,
+                    last_error=last_error,
+                    enqueued_at=event.created_at,
+                )
+                event.delete()
+            logger.error(f"Event {event.event_type} dead-lettered after {attempts} attempts: {last_error}")
+            with self._lock:
+                self.dead_lettered += 1
+            return
+
+        OutboxEvent.objects.filter(pk=event.pk).update(
+            status=OutboxEvent.PENDING,
+            attempts=attempts,
+            delivered_to=delivered_to,
+            last_error=last_error,
+            locked_at=None,
+            available_at=timezone.now() + timedelta(seconds=self.retry_backoff ** attempts),
+        )
+        with self._lock:
+            self.retried += 1
+
+    def drain(self, max_batches=None):
+        """Process batches until nothing is ready (used by process_events --once and tests)."""
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            processed = self.process_batch()
+            if not processed:
+                break
+            total += processed
+            batches += 1
+        return total
+
+    def stats(self):
+        from database.models import DeadLetterEvent, OutboxEvent
+
+        return {
+            'workers': len(self._threads),
+            'pending': OutboxEvent.objects.filter(status=OutboxEvent.PENDING).count(),
+            'processing': OutboxEvent.objects.filter(status=OutboxEvent.PROCESSING).count(),
+            'dead_letters': DeadLetterEvent.objects.count(),
+            'delivered': self.delivered,
+            'retried': self.retried,
+            'dead_lettered': self.dead_lettered,
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def build_worker_pool(dispatcher=None, **overrides):
+    """EventWorkerPool configured from the EVENT_* settings."""
+    from utils.observers import EventDispatcher
+
+    options = {
+        'workers': getattr(settings, 'EVENT_WORKERS', 2),
+        'batch_size': getattr(settings, 'EVENT_BATCH_SIZE', 20),
+        'poll_interval': getattr(settings, 'EVENT_POLL_INTERVAL_SECONDS', 1.0),
+        'max_attempts': getattr(settings, 'EVENT_MAX_ATTEMPTS', 5),
+        'retry_backoff': getattr(settings, 'EVENT_RETRY_BACKOFF_SECONDS', 2.0),
+        'visibility_timeout': getattr(settings, 'EVENT_VISIBILITY_TIMEOUT_SECONDS', 300.0),
+    }
+    options.update(overrides)
+    return EventWorkerPool(dispatcher or EventDispatcher(), **options)
+
+
+def get_worker_pool():
+    """Process-wide pool used by enqueue_event() (threads start on first wake)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = build_worker_pool()
+    return _pool
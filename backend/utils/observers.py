@@ -3,7 +3,7 @@ Observer Pattern Implementation for Funder Application
 This module provides base classes for the Observer pattern.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 
 
 class Subject(ABC):
@@ -83,15 +83,60 @@ class EventDispatcher:
             except ValueError:
                 pass
     
-    def dispatch(self, event_type: str, data: Dict[str, Any]) -> None:
-        """Dispatch an event to all subscribed observers."""
-        if event_type in self._observers:
-            for observer in self._observers[event_type]:
-                try:
-                    observer.update(event_type, data)
-                except Exception as e:
-                    # Log error but don't stop other observers
-                    print(f"Error notifying observer for {event_type}: {str(e)}")
+    def observers_for(self, event_type: str) -> List[Observer]:
+        """Observers currently subscribed to an event type."""
+        return list(self._observers.get(event_type, []))
+    
+    @staticmethod
+    def observer_key(observer: Observer) -> str:
+        """Stable name used to record which observers already handled a queued event."""
+        return f"{type(observer).__module__}.{type(observer).__qualname__}"
+    
+    def dispatch(self, event_type: str, data: Dict[str, Any], mode: Optional[str] = None) -> None:
+        """
+        Dispatch an event to all subscribed observers.
+        
+        In 'sync' mode observers run inline. In 'async' mode (the default when
+        EVENT_DISPATCH_ASYNC is set) the event is written to the outbox table
+        within the caller's database transaction and delivered by the event
+        workers once it commits. See utils.event_queue.
+        """
+        if event_type not in self._observers:
+            return
+        if mode is None:
+            from django.conf import settings
+            mode = 'async' if getattr(settings, 'EVENT_DISPATCH_ASYNC', False) else 'sync'
+        
+        if mode == 'async':
+            from utils.event_queue import enqueue_event
+            try:
+                enqueue_event(event_type, data)
+                return
+            except Exception as e:
+                # Never lose the event: fall back to inline delivery
+                print(f"Error queueing {event_type}, delivering inline: {str(e)}")
+        
+        for key, error in self.deliver(event_type, data).items():
+            # Log error but don't stop other observers
+            print(f"Error notifying observer for {event_type}: {error}")
+    
+    def deliver(self, event_type: str, data: Dict[str, Any], skip: Iterable[str] = ()) -> Dict[str, str]:
+        """
+        Run every subscribed observer not listed in skip.
+        
+        Returns {observer_key: error message} for the observers that raised.
+        """
+        skip = set(skip)
+        failures = {}
+        for observer in self.observers_for(event_type):
+            key = self.observer_key(observer)
+            if key in skip:
+                continue
+            try:
+                observer.update(event_type, data)
+            except Exception as e:
+                failures[key] = f"{type(e).__name__}: {e}"
+        return failures
     
     def clear_all(self) -> None:
         """Clear all observers (useful for testing)."""
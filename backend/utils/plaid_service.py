@@ -8,31 +8,172 @@ from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
 from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
 from plaid.model.transactions_get_request import TransactionsGetRequest
+from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
 from plaid.model.transactions_sync_request import TransactionsSyncRequest
 from plaid.model.products import Products
 from plaid.model.country_code import CountryCode
 from django.conf import settings
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+import atexit
+import json
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
-def get_plaid_client():
-    """Initialize and return Plaid API client."""
-    configuration = plaid.Configuration(
-        host=plaid.Environment.Sandbox if settings.PLAID_ENV == 'sandbox' else (
+class PlaidLatencyMetrics:
+    """Per-endpoint request counts, errors and latency percentiles."""
+
+    def __init__(self, samples=1024):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0, 'recent': deque(maxlen=self.samples),
+                }
+            entry['count'] += 1
+            entry['errors'] += int(error)
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['recent'].append(seconds)
+
+    def snapshot(self):
+        """{endpoint: {count, errors, avg_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            snapshot = {}
+            for endpoint, entry in self._endpoints.items():
+                recent = sorted(entry['recent'])
+
+                def percentile(p):
+                    return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000 if recent else 0.0
+
+                snapshot[endpoint] = {
+                    'count': entry['count'],
+                    'errors': entry['errors'],
+                    'avg_ms': round(entry['total'] / entry['count'] * 1000, 2),
+                    'p50_ms': round(percentile(0.50), 2),
+                    'p95_ms': round(percentile(0.95), 2),
+                    'p99_ms': round(percentile(0.99), 2),
+                    'max_ms': round(entry['max'] * 1000, 2),
+                }
+            return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+metrics = PlaidLatencyMetrics()
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def _client_settings():
+    """Settings the shared client is built from; a change rebuilds it."""
+    host = getattr(settings, 'PLAID_HOST', '') or (
+        plaid.Environment.Sandbox if settings.PLAID_ENV == 'sandbox' else (
             plaid.Environment.Development if settings.PLAID_ENV == 'development' else plaid.Environment.Production
-        ),
+        )
+    )
+    return (
+        host,
+        settings.PLAID_CLIENT_ID,
+        settings.PLAID_SECRET,
+        int(getattr(settings, 'PLAID_POOL_MAXSIZE', 10)),
+    )
+
+
+def _build_client(host, client_id, secret, pool_maxsize):
+    configuration = plaid.Configuration(
+        host=host,
         api_key={
-            'clientId': settings.PLAID_CLIENT_ID,
-            'secret': settings.PLAID_SECRET,
+            'clientId': client_id,
+            'secret': secret,
         }
     )
+    # Connections kept alive per host; also the most requests in flight at once
+    configuration.connection_pool_maxsize = pool_maxsize
     api_client = plaid.ApiClient(configuration)
     return plaid_api.PlaidApi(api_client)
 
 
+def _close(client):
+    client.api_client.close()
+    client.api_client.rest_client.pool_manager.clear()
+
+
+def get_plaid_client():
+    """
+    Return the process-wide Plaid API client.
+    
+    The client and its keep-alive connection pool are shared by every thread
+    (urllib3 pools are thread-safe), so repeated calls reuse open TLS
+    connections. It is rebuilt if the PLAID_* settings it was built from
+    change, and closed by close_plaid_client() or at interpreter exit.
+    """
+    global _client, _client_key
+    key = _client_settings()
+    if _client is None or _client_key != key:
+        with _client_lock:
+            if _client is None or _client_key != key:
+                previous = _client
+                _client, _client_key = _build_client(*key), key
+                if previous is not None:
+                    _close(previous)
+    return _client
+
+
+def close_plaid_client():
+    """Close the shared client's connections; the next call builds a new one."""
+    global _client, _client_key
+    with _client_lock:
+        if _client is not None:
+            _close(_client)
+        _client, _client_key = None, None
+
+
+atexit.register(close_plaid_client)
+
+
+def _call(endpoint, request, **options):
+    """
+    Call a PlaidApi endpoint on the shared client with the configured
+    timeouts, recording its latency under the endpoint name. Extra options
+    (e.g. _preload_content=False) are passed to the endpoint.
+    """
+    timeout = (
+        float(getattr(settings, 'PLAID_CONNECT_TIMEOUT_SECONDS', 5)),
+        float(getattr(settings, 'PLAID_READ_TIMEOUT_SECONDS', 30)),
+    )
+    client = get_plaid_client()
+    start = time.perf_counter()
+    error = False
+    try:
+        return getattr(client, endpoint)(request, _request_timeout=timeout, **options)
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.record(endpoint, time.perf_counter() - start, error)
+
+
+def plaid_metrics():
+    """Latency and error counts of Plaid requests made by this process, per endpoint."""
+    return metrics.snapshot()
+
+
 def create_link_token(user_id, client_name='Funder Budget App'):
     """
     Create a Plaid Link token for initiating the Link flow in frontend.
@@ -45,7 +186,6 @@ def create_link_token(user_id, client_name='Funder Budget App'):
         dict with link_token and expiration
     """
     try:
-        client = get_plaid_client()
         request = LinkTokenCreateRequest(
             user=LinkTokenCreateRequestUser(client_user_id=str(user_id)),
             client_name=client_name,
@@ -53,7 +193,7 @@ def create_link_token(user_id, client_name='Funder Budget App'):
             country_codes=[CountryCode('US')],
             language='en',
         )
-        response = client.link_token_create(request)
+        response = _call('link_token_create', request)
         return {
             'link_token': response['link_token'],
             'expiration': response['expiration']
@@ -75,9 +215,8 @@ def exchange_public_token(public_token):
         dict with access_token and item_id
     """
     try:
-        client = get_plaid_client()
         request = ItemPublicTokenExchangeRequest(public_token=public_token)
-        response = client.item_public_token_exchange(request)
+        response = _call('item_public_token_exchange', request)
         return {
             'access_token': response['access_token'],
             'item_id': response['item_id']
@@ -87,49 +226,100 @@ def exchange_public_token(public_token):
         raise Exception(f"Failed to exchange token: {e.body}")
 
 
-def fetch_transactions(access_token, start_date=None, end_date=None):
+def iter_transaction_pages(access_token, start_date=None, end_date=None, page_size=None, parallel=None):
     """
-    Fetch transactions from Plaid for a given access token.
+    Yield /transactions/get pages for a date range, formatted, in offset order.
+    
+    The first request reports total_transactions; the remaining offsets are
+    then fetched concurrently, at most `parallel` requests in flight, and
+    each page is formatted as it arrives and yielded in order. Pages are
+    parsed from the raw JSON: building the generated response models costs
+    more CPU than the round trip and, holding the GIL, would serialize the
+    concurrent requests. Completed pages wait for earlier ones only while
+    the window is full, so memory stays bounded by `parallel` pages. If the
+    total grows while paging (new transactions posted), the tail is fetched
+    sequentially as before.
     
     Args:
         access_token: Plaid access token for the account
         start_date: Start date for transactions (defaults to 30 days ago)
         end_date: End date for transactions (defaults to today)
+        page_size: Transactions per request, up to 500 (PLAID_FETCH_PAGE_SIZE)
+        parallel: Requests in flight at once (PLAID_FETCH_PARALLELISM); 1 pages sequentially
         
-    Returns:
-        list of transaction dictionaries
+    Yields:
+        list of transaction dictionaries per page
     """
-    try:
-        client = get_plaid_client()
-        
-        if not end_date:
-            end_date = datetime.now().date()
-        if not start_date:
-            start_date = end_date - timedelta(days=30)
-        
+    if not end_date:
+        end_date = datetime.now().date()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    page_size = page_size or int(getattr(settings, 'PLAID_FETCH_PAGE_SIZE', 500))
+    parallel = max(1, parallel or int(getattr(settings, 'PLAID_FETCH_PARALLELISM', 4)))
+
+    def fetch_page(offset):
         request = TransactionsGetRequest(
             access_token=access_token,
             start_date=start_date,
             end_date=end_date,
+            options=TransactionsGetRequestOptions(count=page_size, offset=offset),
         )
+        response = _call('transactions_get', request, _preload_content=False)
+        try:
+            body = json.loads(response.data)
+        finally:
+            response.release_conn()
+        return body['total_transactions'], [format_transaction(txn) for txn in body['transactions']]
+
+    total, page = fetch_page(0)
+    fetched = len(page)
+    yield page
+
+    if parallel > 1 and fetched < total:
+        offsets = iter(range(fetched, total, page_size))
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix='plaid-fetch') as executor:
+            window = deque(executor.submit(fetch_page, offset) for offset in islice(offsets, parallel))
+            try:
+                while window:
+                    latest_total, page = window.popleft().result()
+                    for offset in islice(offsets, 1):
+                        window.append(executor.submit(fetch_page, offset))
+                    fetched += len(page)
+                    total = max(total, latest_total)
+                    yield page
+                    if not page:
+                        break
+            finally:
+                for future in window:
+                    future.cancel()
+
+    # Sequential paging, and whatever was added after the first response
+    while fetched < total:
+        total, page = fetch_page(fetched)
+        if not page:
+            break
+        fetched += len(page)
+        yield page
+
+
+def fetch_transactions(access_token, start_date=None, end_date=None, parallel=None):
+    """
+    Fetch transactions from Plaid for a given access token.
+    
+    Args:
+        access_token: Plaid access token for the account
+        start_date: Start date for transactions (defaults to 30 days ago)
+        end_date: End date for transactions (defaults to today)
+        parallel: Pages fetched concurrently (defaults to PLAID_FETCH_PARALLELISM)
         
-        response = client.transactions_get(request)
-        transactions = response['transactions']
-        
-        # Handle pagination if there are more transactions
-        while len(transactions) < response['total_transactions']:
-            request = TransactionsGetRequest(
-                access_token=access_token,
-                start_date=start_date,
-                end_date=end_date,
-                options={
-                    'offset': len(transactions)
-                }
-            )
-            response = client.transactions_get(request)
-            transactions.extend(response['transactions'])
-        
-        return [format_transaction(txn) for txn in transactions]
+    Returns:
+        list of transaction dictionaries
+    """
+    try:
+        transactions = []
+        for page in iter_transaction_pages(access_token, start_date, end_date, parallel=parallel):
+            transactions.extend(page)
+        return transactions
     except plaid.ApiException as e:
         logger.error(f"Plaid fetch transactions failed: {e}")
         raise Exception(f"Failed to fetch transactions: {e.body}")
@@ -147,12 +337,10 @@ def sync_transactions(access_token, cursor=None):
         dict with transactions, added, modified, removed lists and next_cursor
     """
     try:
-        client = get_plaid_client()
-        request = TransactionsSyncRequest(
-            access_token=access_token,
-            cursor=cursor
-        )
-        response = client.transactions_sync(request)
+        # The first sync has no cursor; the request model rejects cursor=None
+        request = TransactionsSyncRequest(access_token=access_token, cursor=cursor) if cursor else \
+            TransactionsSyncRequest(access_token=access_token)
+        response = _call('transactions_sync', request)
         
         return {
             'added': [format_transaction(txn) for txn in response.get('added', [])],
@@ -166,6 +354,31 @@ def sync_transactions(access_token, cursor=None):
         raise Exception(f"Failed to sync transactions: {e.body}")
 
 
+def iter_sync_pages(access_token, cursor=None):
+    """
+    Follow /transactions/sync from cursor until Plaid reports has_more false.
+    
+    Pages are fetched lazily: the next request is sent only when the caller
+    asks for the next page, so a consumer that stops (or fails) part way
+    through can resume from the last next_cursor it stored.
+    
+    Args:
+        access_token: Plaid access token
+        cursor: Optional cursor from a previous sync
+        
+    Yields:
+        sync_transactions() dicts, one per page
+    """
+    while True:
+        page = sync_transactions(access_token, cursor=cursor)
+        yield page
+        if not page['has_more']:
+            return
+        if not page['next_cursor'] or page['next_cursor'] == cursor:
+            raise Exception("Plaid sync reported more pages without advancing the cursor")
+        cursor = page['next_cursor']
+
+
 def format_transaction(plaid_txn):
     """
     Format a Plaid transaction into our database structure.
@@ -176,9 +389,13 @@ def format_transaction(plaid_txn):
     Returns:
         dict with formatted transaction data
     """
+    txn_date = plaid_txn.get('date')
+    if isinstance(txn_date, str):
+        # Raw JSON responses carry ISO dates
+        txn_date = date.fromisoformat(txn_date)
     return {
         'plaid_transaction_id': plaid_txn.get('transaction_id'),
-        'date': plaid_txn.get('date'),
+        'date': txn_date,
         'description': plaid_txn.get('name', ''),
         'amount': abs(float(plaid_txn.get('amount', 0))),
         'type': 'EXPENSE' if plaid_txn.get('amount', 0) > 0 else 'INCOME',
@@ -241,11 +458,10 @@ def get_account_info(access_token):
         list of account dictionaries
     """
     try:
-        client = get_plaid_client()
         from plaid.model.accounts_get_request import AccountsGetRequest
         
         request = AccountsGetRequest(access_token=access_token)
-        response = client.accounts_get(request)
+        response = _call('accounts_get', request)
         
         return [{
             'account_id': acc.get('account_id'),
@@ -5,12 +5,14 @@ This module connects Django's signal system with our custom observers.
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from decimal import Decimal
-from utils.observers import EventDispatcher
+from utils.observers import EventDispatcher, Observer
 from budgets.observers import BudgetExceededObserver, SpendingPatternObserver, GoalProgressObserver
 from transactions.observers import (
     FraudDetectionObserver, 
     TransactionCategorizationObserver,
+    TransactionBatchCategorizationObserver,
     LargeTransactionObserver,
+    LargeTransactionBatchObserver,
     RecurringTransactionObserver
 )
 
@@ -25,6 +27,8 @@ goal_progress_observer = GoalProgressObserver()
 fraud_detection_observer = FraudDetectionObserver()
 transaction_categorization_observer = TransactionCategorizationObserver()
 large_transaction_observer = LargeTransactionObserver(threshold=Decimal('500.00'))
+transaction_batch_categorization_observer = TransactionBatchCategorizationObserver()
+large_transaction_batch_observer = LargeTransactionBatchObserver(threshold=Decimal('500.00'))
 recurring_transaction_observer = RecurringTransactionObserver()
 
 # Subscribe observers to events
@@ -39,9 +43,70 @@ dispatcher.subscribe('potential_fraud', fraud_detection_observer)
 dispatcher.subscribe('fraud_confirmed', fraud_detection_observer)
 dispatcher.subscribe('transaction_created', transaction_categorization_observer)
 dispatcher.subscribe('transaction_created', large_transaction_observer)
+# Rows inserted in bulk or by a Plaid sync skip post_save; categorized before
+# the batch budget checks below
+dispatcher.subscribe('transactions_bulk_created', transaction_batch_categorization_observer)
+dispatcher.subscribe('transactions_bulk_created', large_transaction_batch_observer)
+dispatcher.subscribe('transactions_synced', transaction_batch_categorization_observer)
+dispatcher.subscribe('transactions_synced', large_transaction_batch_observer)
 dispatcher.subscribe('recurring_detected', recurring_transaction_observer)
 
 
+# ============================================================================
+# SPENDING AGGREGATE AND VELOCITY SIGNALS
+# ============================================================================
+# Connected before transaction_post_save so budget and fraud checks run by
+# its observers already see the new totals and velocity counts.
+
+SPENDING_FIELDS = {'user', 'user_id', 'category', 'category_id', 'type', 'date', 'amount'}
+
+
+@receiver(pre_save, sender='transactions.Transaction')
+def transaction_pre_save_spending(sender, instance, update_fields=None, **kwargs):
+    """Remember what an existing transaction contributed before it is overwritten."""
+    from budgets.aggregates import spending_state
+    
+    instance._spending_before = None
+    instance._spending_skip = False
+    if instance._state.adding:
+        return
+    if update_fields is not None and not SPENDING_FIELDS.intersection(update_fields):
+        instance._spending_skip = True
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(
+        'user_id', 'category_id', 'type', 'date', 'amount'
+    ).first()
+    instance._spending_before = spending_state(previous) if previous else None
+
+
+@receiver(post_save, sender='transactions.Transaction')
+def transaction_post_save_spending(sender, instance, created, **kwargs):
+    """Move the transaction's contribution between spending aggregates."""
+    from budgets.aggregates import record_transaction_change, spending_state
+    
+    if getattr(instance, '_spending_skip', False):
+        return
+    before = None if created else getattr(instance, '_spending_before', None)
+    record_transaction_change(before, spending_state(instance))
+
+
+@receiver(post_delete, sender='transactions.Transaction')
+def transaction_post_delete_spending(sender, instance, **kwargs):
+    """Remove a deleted transaction's contribution."""
+    from budgets.aggregates import record_transaction_change, spending_state
+    
+    record_transaction_change(spending_state(instance), None)
+
+
+@receiver(post_save, sender='transactions.Transaction')
+def transaction_post_save_velocity(sender, instance, created, **kwargs):
+    """Count a new transaction in the fraud velocity windows."""
+    from utils.velocity import get_velocity_tracker
+    
+    if created:
+        get_velocity_tracker().record([instance])
+
+
 # ============================================================================
 # TRANSACTION SIGNALS
 # ============================================================================
@@ -50,7 +115,8 @@ dispatcher.subscribe('recurring_detected', recurring_transaction_observer)
 def transaction_post_save(sender, instance, created, **kwargs):
     """Handle transaction creation and updates."""
     if created:
-        # Dispatch transaction created event
+        # Dispatch transaction created event; fraud and budget checks run in
+        # TransactionChecksObserver so they leave the request path in async mode
         dispatcher.dispatch('transaction_created', {
             'transaction_id': instance.get_uuid_string(),
             'user_id': str(instance.user_id),
@@ -60,6 +126,20 @@ def transaction_post_save(sender, instance, created, **kwargs):
             'category': instance.category.name if instance.category else None,
             'date': str(instance.date)
         })
+
+
+class TransactionChecksObserver(Observer):
+    """
+    Observer that runs the fraud and budget checks for a new transaction.
+    """
+    
+    def update(self, event_type: str, data) -> None:
+        """Handle transaction_created events."""
+        from transactions.models import Transaction
+        
+        instance = Transaction.objects.select_related('category').filter(id=data.get('transaction_id')).first()
+        if instance is None:
+            return
         
         # Check for potential fraud
         if _is_potential_fraud(instance):
@@ -76,65 +156,108 @@ def transaction_post_save(sender, instance, created, **kwargs):
             _check_budget_status(instance)
 
 
-def _is_potential_fraud(transaction) -> bool:
-    """Simple fraud detection logic."""
-    from transactions.models import Transaction
-    from datetime import timedelta
-    from django.utils import timezone
-    
-    # Check for multiple large transactions in short time
-    recent_transactions = Transaction.objects.filter(
-        user=transaction.user,
-        date__gte=timezone.now().date() - timedelta(hours=1),
-        type='EXPENSE'
-    ).exclude(id=transaction.id)
+transaction_checks_observer = TransactionChecksObserver()
+dispatcher.subscribe('transaction_created', transaction_checks_observer)
+
+
+class TransactionBatchChecksObserver(Observer):
+    """
+    Set-based fraud and budget checks for transactions_bulk_created and
+    transactions_synced (checking the transactions they created).
+
+    The fraud rule reads the affected users' recent large expenses once and
+    budgets are evaluated once per affected (user, category) instead of once
+    per inserted row.
+    """
     
-    # Flag if multiple large transactions (>$500) in last hour
-    large_recent = [t for t in recent_transactions if abs(t.amount) > 500]
-    if len(large_recent) >= 2 and abs(transaction.amount) > 500:
-        return True
+    def update(self, event_type: str, data) -> None:
+        """Handle transactions_bulk_created and transactions_synced events."""
+        from transactions.models import Transaction
+        
+        transactions = list(Transaction.objects.filter(id__in=data.get('transaction_ids') or []))
+        if not transactions:
+            return
+        
+        for instance in _potential_fraud_transactions(transactions):
+            dispatcher.dispatch('potential_fraud', {
+                'transaction_id': instance.get_uuid_string(),
+                'user_id': str(instance.user_id),
+                'amount': float(instance.amount),
+                'description': instance.description or '',
+                'reason': 'Unusual transaction pattern'
+            })
+        
+        _check_budget_statuses({
+            (instance.user_id, instance.category_id)
+            for instance in transactions
+            if instance.category_id and instance.type == 'EXPENSE'
+        })
+
+
+transaction_batch_checks_observer = TransactionBatchChecksObserver()
+dispatcher.subscribe('transactions_bulk_created', transaction_batch_checks_observer)
+dispatcher.subscribe('transactions_synced', transaction_batch_checks_observer)
+
+
+def _is_potential_fraud(transaction) -> bool:
+    """
+    Flag unusually large expenses and bursts of large expenses.
+
+    The thresholds and windows are the FRAUD_* settings; see utils.velocity.
+    """
+    from utils.velocity import get_velocity_tracker
     
-    # Flag if transaction is unusually large (>$5000)
-    if abs(transaction.amount) > 5000:
-        return True
+    return get_velocity_tracker().is_potential_fraud(transaction)
+
+
+def _potential_fraud_transactions(transactions):
+    """_is_potential_fraud for a whole batch, reading each affected user's velocity counters once."""
+    from utils.velocity import get_velocity_tracker
     
-    return False
+    return get_velocity_tracker().flag(transactions)
 
 
 def _check_budget_status(transaction):
     """Check if transaction causes budget to be exceeded."""
+    _check_budget_statuses({(transaction.user_id, transaction.category_id)})
+
+
+def _check_budget_statuses(pairs):
+    """Check the budgets of each affected (user_id, category_id) once for their current period."""
+    from budgets.aggregates import spent_amounts
     from budgets.models import Budget
-    from transactions.models import Transaction
-    from django.db.models import Sum
+    
+    # BinaryField ids may come back as memoryview; compare them as bytes
+    pairs = {(user_id, bytes(category_id)) for user_id, category_id in pairs if category_id}
+    if not pairs:
+        return
     
     try:
+        user_ids = {user_id for user_id, _ in pairs}
+        category_ids = {category_id for _, category_id in pairs}
+        
         # Find applicable budgets
-        budgets = Budget.objects.filter(
-            user=transaction.user,
-            category=transaction.category
-        )
+        budgets = [
+            budget for budget in Budget.objects.filter(
+                user_id__in=user_ids,
+                category_id__in=category_ids
+            ).select_related('category')
+            if (budget.user_id, bytes(budget.category_id)) in pairs
+        ]
+        if not budgets:
+            return
+        
+        # Current period totals from the spending_aggregate table, one query
+        # per period type
+        spent = {period: spent_amounts(pairs, period) for period in {budget.period for budget in budgets}}
         
         for budget in budgets:
-            # Calculate total spending for this budget period
-            # For simplicity, using current month
-            from datetime import date
-            today = date.today()
-            start_of_month = date(today.year, today.month, 1)
-            
-            total_spent = Transaction.objects.filter(
-                user=transaction.user,
-                category=transaction.category,
-                type='EXPENSE',
-                date__gte=start_of_month,
-                date__lte=today
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            
-            total_spent = abs(total_spent)
+            total_spent = spent[budget.period].get((budget.user_id, bytes(budget.category_id)), Decimal('0.00'))
             
             # Check if budget exceeded
             if total_spent > budget.amount:
                 dispatcher.dispatch('budget_exceeded', {
-                    'user_id': str(transaction.user_id),
+                    'user_id': str(budget.user_id),
                     'category': budget.category.name,
                     'budget_amount': float(budget.amount),
                     'spent_amount': float(total_spent)
@@ -142,7 +265,7 @@ def _check_budget_status(transaction):
             # Check if warning threshold (80%)
             elif total_spent >= budget.amount * Decimal('0.80'):
                 dispatcher.dispatch('budget_warning', {
-                    'user_id': str(transaction.user_id),
+                    'user_id': str(budget.user_id),
                     'category': budget.category.name,
                     'budget_amount': float(budget.amount),
                     'spent_amount': float(total_spent)
@@ -0,0 +1,284 @@
+"""
+Sliding-window velocity tracking for the fraud rules.
+
+Each VelocityRule counts a user's large expenses (abs(amount) > min_amount)
+over a time window. The window is a ring of `buckets` fixed-width time
+buckets; every bucket is a pair of cache counters (count and total in cents)
+that expire with the window. Recording a transaction is one cache increment
+per matching rule, and checking a rule reads a fixed number of counters, so
+neither depends on how many transactions the user has.
+
+The counters live in the FRAUD_VELOCITY_CACHE_ALIAS Django cache, which must
+be shared (Redis/Memcached) for the counts to span workers. When a user's ring
+is missing (cold or flushed cache) it is rebuilt with one query over that
+rule's window, and when the cache is unavailable the window is counted in the
+database directly.
+
+Transactions are bucketed by created_at, the time they reached Funder. Rows
+dated before the longest window are history being backfilled (e.g. a first
+Plaid sync) and are not counted. Counts are not decremented when a
+transaction is deleted or its insert is rolled back; such a row ages out of
+the window instead.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _amount(value) -> Decimal:
+    return abs(Decimal(str(value)))
+
+
+@dataclass(frozen=True)
+class VelocityRule:
+    """Flag a large expense when the user already had max_count others in the window."""
+    name: str
+    window_seconds: int
+    min_amount: Decimal
+    max_count: int
+    buckets: int = 60
+
+    @property
+    def bucket_seconds(self) -> int:
+        return max(1, -(-self.window_seconds // self.buckets))
+
+    def matches(self, amount) -> bool:
+        return _amount(amount) > self.min_amount
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'VelocityRule':
+        return cls(
+            name=config['name'],
+            window_seconds=int(config['window_seconds']),
+            min_amount=Decimal(str(config['min_amount'])),
+            max_count=int(config['max_count']),
+            buckets=int(config.get('buckets', 60)),
+        )
+
+
+class VelocityTracker:
+    """Per-user ring-buffer counters for a set of VelocityRules."""
+
+    key_prefix = 'velocity'
+
+    def __init__(self, rules: Iterable[VelocityRule], large_amount=Decimal('5000'), cache_alias='default'):
+        """
+        Args:
+            rules: Velocity rules to maintain and evaluate
+            large_amount: A single expense above this is flagged on its own
+            cache_alias: Django cache holding the bucket counters
+        """
+        self.rules = list(rules)
+        self.large_amount = Decimal(large_amount)
+        self.cache_alias = cache_alias
+        self.db_fallbacks = 0
+        self.rebuilds = 0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.cache_alias]
+
+    # ---- keys ------------------------------------------------------------
+
+    def _bucket(self, rule, moment) -> int:
+        return int(moment.timestamp()) // rule.bucket_seconds
+
+    def _prefix(self, rule, user_id) -> str:
+        return f'{self.key_prefix}:{rule.name}:{rule.window_seconds}:{user_id}'
+
+    def _window_start(self, rule, now):
+        """Start of the oldest bucket in the ring that ends at now."""
+        start = (self._bucket(rule, now) - rule.buckets + 1) * rule.bucket_seconds
+        return datetime.fromtimestamp(start, tz=dt_timezone.utc)
+
+    def _window_keys(self, rule, user_id, now):
+        prefix = self._prefix(rule, user_id)
+        current = self._bucket(rule, now)
+        buckets = range(current - rule.buckets + 1, current + 1)
+        return [f'{prefix}:{b}:n' for b in buckets], [f'{prefix}:{b}:c' for b in buckets]
+
+    def _timeout(self, rule) -> int:
+        return rule.window_seconds + rule.bucket_seconds
+
+    # ---- recording -------------------------------------------------------
+
+    def _counts(self, transaction):
+        """Whether and when a transaction counts toward the velocity windows."""
+        if transaction.type != 'EXPENSE':
+            return None
+        created_at = getattr(transaction, 'created_at', None) or timezone.now()
+        longest = max((rule.window_seconds for rule in self.rules), default=0)
+        day = getattr(transaction, 'date', None)
+        if day is not None and not isinstance(day, str) and day < (created_at - timedelta(seconds=longest)).date():
+            return None
+        return created_at
+
+    def record(self, transactions: Iterable) -> None:
+        """Add new transactions to their users' rings (one increment per rule and bucket)."""
+        increments = {}
+        for transaction in transactions:
+            created_at = self._counts(transaction)
+            if created_at is None:
+                continue
+            for rule in self.rules:
+                if not rule.matches(transaction.amount):
+                    continue
+                key = (rule, transaction.user_id, self._bucket(rule, created_at))
+                count, cents = increments.get(key, (0, 0))
+                increments[key] = (count + 1, cents + int(_amount(transaction.amount) * 100))
+        if not increments:
+            return
+
+        try:
+            cache = self.cache
+            for (rule, user_id, bucket), (count, cents) in increments.items():
+                if not self._ensure_warm(rule, user_id):
+                    # Rebuilt from the database, which already holds these rows
+                    continue
+                prefix = f'{self._prefix(rule, user_id)}:{bucket}'
+                self._incr(cache, f'{prefix}:n', count, self._timeout(rule))
+                self._incr(cache, f'{prefix}:c', cents, self._timeout(rule))
+        except Exception as e:
+            logger.warning(f"Velocity counters not updated: {e}")
+
+    @staticmethod
+    def _incr(cache, key, delta, timeout):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            if not cache.add(key, delta, timeout):
+                # Another writer created the counter first
+                cache.incr(key, delta)
+
+    def _ensure_warm(self, rule, user_id) -> bool:
+        """True if the user's ring for rule is cached; otherwise rebuild it and return False."""
+        cache = self.cache
+        marker = f'{self._prefix(rule, user_id)}:warm'
+        if cache.get(marker):
+            return True
+        self._rebuild(rule, user_id)
+        cache.set(marker, 1, self._timeout(rule))
+        return False
+
+    def _rebuild(self, rule, user_id) -> None:
+        """Refill one ring from the database; reads only the rule's window."""
+        now = timezone.now()
+        counters = {}
+        prefix = self._prefix(rule, user_id)
+        for created_at, amount in self._window_queryset(rule, user_id, now).values_list('created_at', 'amount'):
+            bucket = self._bucket(rule, created_at)
+            counters[f'{prefix}:{bucket}:n'] = counters.get(f'{prefix}:{bucket}:n', 0) + 1
+            counters[f'{prefix}:{bucket}:c'] = counters.get(f'{prefix}:{bucket}:c', 0) + int(abs(amount) * 100)
+        count_keys, cents_keys = self._window_keys(rule, user_id, now)
+        self.cache.delete_many([key for key in count_keys + cents_keys if key not in counters])
+        if counters:
+            self.cache.set_many(counters, timeout=self._timeout(rule))
+        self.rebuilds += 1
+
+    def _window_queryset(self, rule, user_id, now):
+        from django.db.models import Q
+        from transactions.models import Transaction
+
+        longest = max(r.window_seconds for r in self.rules)
+        return Transaction.objects.filter(
+            user_id=user_id,
+            type='EXPENSE',
+            created_at__gte=self._window_start(rule, now),
+            date__gte=(now - timedelta(seconds=longest)).date(),
+        ).filter(Q(amount__gt=rule.min_amount) | Q(amount__lt=-rule.min_amount))
+
+    # ---- checks ----------------------------------------------------------
+
+    def window_count(self, rule, user_id, now=None) -> int:
+        """Large expenses of user_id in rule's window, read from the ring."""
+        now = now or timezone.now()
+        try:
+            self._ensure_warm(rule, user_id)
+            count_keys, _ = self._window_keys(rule, user_id, now)
+            return sum(self.cache.get_many(count_keys).values())
+        except Exception as e:
+            logger.warning(f"Velocity cache unavailable, counting in the database: {e}")
+            self.db_fallbacks += 1
+            return self._window_queryset(rule, user_id, now).count()
+
+    def window_counts(self, user_ids, now=None) -> Dict:
+        """{(rule.name, user_id): count} for every rule and user, read once."""
+        now = now or timezone.now()
+        return {
+            (rule.name, user_id): self.window_count(rule, user_id, now)
+            for rule in self.rules for user_id in set(user_ids)
+        }
+
+    def triggered_rules(self, transaction, counts=None) -> List[str]:
+        """
+        Names of the rules a recorded transaction trips.
+
+        The window count includes the transaction itself once it is recorded,
+        so it is discounted while it is still inside the window.
+        """
+        if transaction.type != 'EXPENSE':
+            return []
+        now = timezone.now()
+        created_at = self._counts(transaction)
+        triggered = []
+        for rule in self.rules:
+            if not rule.matches(transaction.amount):
+                continue
+            if counts is None:
+                count = self.window_count(rule, transaction.user_id, now)
+            else:
+                count = counts[(rule.name, transaction.user_id)]
+            if created_at is not None and self._bucket(rule, created_at) > self._bucket(rule, now) - rule.buckets:
+                count -= 1
+            if count >= rule.max_count:
+                triggered.append(rule.name)
+        return triggered
+
+    def is_potential_fraud(self, transaction, counts=None) -> bool:
+        if _amount(transaction.amount) > self.large_amount:
+            return True
+        return bool(self.triggered_rules(transaction, counts))
+
+    def flag(self, transactions) -> List:
+        """Subset of transactions that look fraudulent, reading each ring once."""
+        transactions = list(transactions)
+        counts = self.window_counts({t.user_id for t in transactions})
+        return [t for t in transactions if self.is_potential_fraud(t, counts)]
+
+    def stats(self) -> Dict:
+        return {
+            'rules': [rule.name for rule in self.rules],
+            'rebuilds': self.rebuilds,
+            'db_fallbacks': self.db_fallbacks,
+        }
+
+
+_tracker: Optional[VelocityTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def build_velocity_tracker() -> VelocityTracker:
+    """VelocityTracker configured from the FRAUD_* settings."""
+    return VelocityTracker(
+        rules=[VelocityRule.from_dict(config) for config in getattr(settings, 'FRAUD_VELOCITY_RULES', [])],
+        large_amount=getattr(settings, 'FRAUD_LARGE_TRANSACTION_AMOUNT', Decimal('5000')),
+        cache_alias=getattr(settings, 'FRAUD_VELOCITY_CACHE_ALIAS', 'default'),
+    )
+
+
+def get_velocity_tracker() -> VelocityTracker:
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = build_velocity_tracker()
+    return _tracker
@@ -56,6 +56,13 @@ CREATE TABLE bank_accounts (
     institution_name VARCHAR(100),
     account_type VARCHAR(50),
     token VARBINARY(500) NOT NULL,
+    plaid_access_token VARBINARY(500),
+    plaid_item_id VARCHAR(100),
+    plaid_account_id VARCHAR(100),
+    plaid_cursor TEXT,
+    last_sync DATETIME,
+    auto_sync_enabled BOOLEAN NOT NULL DEFAULT TRUE,
+    auto_sync_interval_minutes INT UNSIGNED,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
 
     CONSTRAINT fk_bank_user
@@ -89,7 +96,13 @@ CREATE TABLE transactions (
 
     CONSTRAINT fk_transaction_bank
         FOREIGN KEY (bank_account_id) REFERENCES bank_accounts(id)
-        ON DELETE SET NULL
+        ON DELETE SET NULL,
+
+    -- Keyset pagination / export, newest first per user. Databases created
+    -- before these indexes: run `python manage.py sync_indexes transactions`
+    INDEX transactions_user_date_idx (user_id, date, created_at, id),
+    -- Budget, fraud and goal aggregations
+    INDEX transactions_user_cat_date_idx (user_id, category_id, type, date)
 );
 
 -- ======================================================
@@ -112,6 +125,29 @@ CREATE TABLE budgets (
         ON DELETE CASCADE
 );
 
+-- Running EXPENSE totals per (user, category, period); see budgets/aggregates.py
+CREATE TABLE spending_aggregate (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id CHAR(36) NOT NULL,
+    category_id CHAR(36) NOT NULL,
+    period_type ENUM('WEEKLY', 'MONTHLY') NOT NULL,
+    period_start DATE NOT NULL,
+    total DECIMAL(14,2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    updated_at DATETIME(6) NOT NULL,
+
+    CONSTRAINT spending_aggregate_period_uniq
+        UNIQUE (user_id, category_id, period_type, period_start),
+
+    CONSTRAINT fk_spending_aggregate_user
+        FOREIGN KEY (user_id) REFERENCES users(id)
+        ON DELETE CASCADE,
+
+    CONSTRAINT fk_spending_aggregate_category
+        FOREIGN KEY (category_id) REFERENCES categories(id)
+        ON DELETE CASCADE
+);
+
 -- ======================================================
 -- GOALS TABLE
 -- ======================================================
@@ -175,6 +211,35 @@ CREATE TABLE admin_actions (
     CONSTRAINT fk_admin_action_transaction FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE SET NULL
 );
 
+-- ======================================================
+-- EVENT OUTBOX (ASYNC OBSERVER DELIVERY)
+-- ======================================================
+CREATE TABLE event_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(100) NOT NULL,
+    payload JSON NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    attempts INT UNSIGNED NOT NULL DEFAULT 0,
+    delivered_to JSON NOT NULL,
+    available_at DATETIME(6) NOT NULL,
+    locked_at DATETIME(6),
+    last_error TEXT,
+    created_at DATETIME(6) NOT NULL,
+
+    INDEX event_outbox_ready_idx (status, available_at)
+);
+
+CREATE TABLE event_dead_letters (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(100) NOT NULL,
+    payload JSON NOT NULL,
+    attempts INT UNSIGNED NOT NULL,
+    delivered_to JSON NOT NULL,
+    last_error TEXT,
+    enqueued_at DATETIME(6) NOT NULL,
+    failed_at DATETIME(6) NOT NULL
+);
+
 -- Notes:
 -- This schema uses CHAR(36) for UUID string storage (e.g. 'xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx').
 -- To connect the project, set your MySQL DATABASE_URL or Django DATABASES in `backend/.env` or environment: